@@ -21,7 +21,8 @@ from resto_client.cli.resto_client_parameters import ALLOWED_VERBOSITY, RestoCli
 from resto_client.cli.resto_server_persisted import RestoServerPersisted
 
 from .parser_settings import (SERVER_ARGNAME, ACCOUNT_ARGNAME, PASSWORD_ARGNAME, COLLECTION_ARGNAME,
-                              VERBOSITY_ARGNAME, FEATURES_IDS_ARGNAME, DIRECTORY_ARGNAME)
+                              VERBOSITY_ARGNAME, FEATURES_IDS_ARGNAME, DIRECTORY_ARGNAME,
+                              DOWNLOAD_WORKERS_ARGNAME)
 
 # Return type of all functions activated by argparse for resto_client CLI.
 CliFunctionReturnType = Tuple[Optional[RestoClientParameters], Optional[RestoServerPersisted]]
@@ -87,6 +88,16 @@ def download_dir_option_parser() -> ArgumentParser:
     return parser
 
 
+def download_workers_option_parser() -> ArgumentParser:
+    """
+    Creates a parser suitable to parse the number of simultaneous downloads in different subparsers
+    """
+    parser = ArgumentParser(add_help=False)
+    parser.add_argument('--workers', dest=DOWNLOAD_WORKERS_ARGNAME, type=int,
+                        help='number of files downloaded simultaneously (default: 1)')
+    return parser
+
+
 def features_ids_argument_parser() -> ArgumentParser:
     """
     Creates a parser suitable to parse the argument describing features ids in different subparsers
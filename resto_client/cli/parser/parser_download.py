@@ -17,14 +17,17 @@
 import argparse
 from pathlib import Path
 
+from resto_client.cli.cli_utils import get_from_args
 from resto_client.cli.resto_client_parameters import RestoClientParameters
 from resto_client.cli.resto_server_persisted import RestoServerPersisted
+from resto_client.settings.resto_client_config import resto_client_print
 
 from .parser_common import (credentials_options_parser, features_ids_argument_parser,
-                            download_dir_option_parser, CliFunctionReturnType,
-                            EPILOG_DOWNLOAD_DIR, EPILOG_FEATURES)
+                            download_dir_option_parser, download_workers_option_parser,
+                            CliFunctionReturnType, EPILOG_DOWNLOAD_DIR, EPILOG_FEATURES)
 
-from .parser_settings import FEATURES_IDS_ARGNAME, DOWNLOAD_TYPE_ARGNAME
+from .parser_settings import (FEATURES_IDS_ARGNAME, DOWNLOAD_TYPE_ARGNAME,
+                              DOWNLOAD_WORKERS_ARGNAME, DOWNLOAD_SEGMENTS_ARGNAME)
 
 
 def cli_download_files(args: argparse.Namespace) -> CliFunctionReturnType:
@@ -38,9 +41,18 @@ def cli_download_files(args: argparse.Namespace) -> CliFunctionReturnType:
     client_params = RestoClientParameters.build_from_argparse(args)
     resto_server = RestoServerPersisted.build_from_argparse(
         args, debug_server=RestoClientParameters.is_debug())
-    resto_server.download_features_file_from_ids(getattr(args, FEATURES_IDS_ARGNAME),
-                                                 getattr(args, DOWNLOAD_TYPE_ARGNAME),
-                                                 Path(client_params.download_dir))
+    download_workers = get_from_args(DOWNLOAD_WORKERS_ARGNAME, args)
+    if download_workers is not None:
+        resto_server.download_workers = download_workers
+    download_segments = get_from_args(DOWNLOAD_SEGMENTS_ARGNAME, args)
+    if download_segments is not None:
+        resto_server.download_segments = download_segments
+    download_report = resto_server.download_features_file_from_ids(
+        getattr(args, FEATURES_IDS_ARGNAME), getattr(args, DOWNLOAD_TYPE_ARGNAME),
+        Path(client_params.download_dir))
+    if len(download_report) > 1:
+        resto_client_print(download_report)
+    download_report.raise_first_error()
     return client_params, resto_server
 
 
@@ -74,7 +86,11 @@ def add_download_product_parser(sub_parsers_download: argparse._SubParsersAction
                                                 epilog=EPILOG_FEATURES + EPILOG_DOWNLOAD_DIR,
                                                 parents=[features_ids_argument_parser(),
                                                          credentials_options_parser(),
-                                                         download_dir_option_parser()])
+                                                         download_dir_option_parser(),
+                                                         download_workers_option_parser()])
+    subparser.add_argument('--segments', dest=DOWNLOAD_SEGMENTS_ARGNAME, type=int,
+                           help='number of parts of a large product downloaded in parallel, '
+                           'when the server supports it (default: 1)')
     subparser.set_defaults(func=cli_download_files)
 
 
@@ -90,7 +106,8 @@ def add_download_quicklook_parser(sub_parsers_download: argparse._SubParsersActi
                                                 epilog=EPILOG_FEATURES + EPILOG_DOWNLOAD_DIR,
                                                 parents=[features_ids_argument_parser(),
                                                          credentials_options_parser(),
-                                                         download_dir_option_parser()])
+                                                         download_dir_option_parser(),
+                                                         download_workers_option_parser()])
     subparser.set_defaults(func=cli_download_files)
 
 
@@ -106,7 +123,8 @@ def add_download_thumbnail_parser(sub_parsers_download: argparse._SubParsersActi
                                                 epilog=EPILOG_FEATURES + EPILOG_DOWNLOAD_DIR,
                                                 parents=[features_ids_argument_parser(),
                                                          credentials_options_parser(),
-                                                         download_dir_option_parser()])
+                                                         download_dir_option_parser(),
+                                                         download_workers_option_parser()])
     subparser.set_defaults(func=cli_download_files)
 
 
@@ -121,5 +139,6 @@ def add_download_annexes_parser(sub_parsers_download: argparse._SubParsersAction
                                                 epilog=EPILOG_FEATURES + EPILOG_DOWNLOAD_DIR,
                                                 parents=[features_ids_argument_parser(),
                                                          credentials_options_parser(),
-                                                         download_dir_option_parser()])
+                                                         download_dir_option_parser(),
+                                                         download_workers_option_parser()])
     subparser.set_defaults(func=cli_download_files)
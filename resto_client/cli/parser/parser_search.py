@@ -36,9 +36,11 @@ from resto_client.settings.servers_database import DB_SERVERS
 
 from .parser_common import (credentials_options_parser, EPILOG_CREDENTIALS,
                             download_dir_option_parser, EPILOG_DOWNLOAD_DIR,
-                            collection_option_parser, CliFunctionReturnType)
+                            collection_option_parser, download_workers_option_parser,
+                            CliFunctionReturnType)
 from .parser_settings import (REGION_ARGNAME, CRITERIA_ARGNAME, MAXRECORDS_ARGNAME,
-                              PAGE_ARGNAME, DOWNLOAD_ARGNAME, JSON_ARGNAME)
+                              PAGE_ARGNAME, DOWNLOAD_ARGNAME, JSON_ARGNAME,
+                              DOWNLOAD_WORKERS_ARGNAME, PRECISE_REGION_ARGNAME)
 
 
 def display_features_on_lines(features_to_display: RestoFeatureCollection) -> str:
@@ -147,7 +149,8 @@ def cli_search_collection(args: Namespace) -> CliFunctionReturnType:
     criteria_dict.update({REGION_ARGNAME: region})
 
     # Do search
-    features_collection = resto_server.search_by_criteria(criteria_dict)
+    features_collection = resto_server.search_by_criteria(
+        criteria_dict, precise_region=bool(get_from_args(PRECISE_REGION_ARGNAME, args)))
 
     msg_no_result = Fore.MAGENTA + Style.BRIGHT + 'No result '
     with colorama_text():
@@ -172,6 +175,10 @@ def cli_search_collection(args: Namespace) -> CliFunctionReturnType:
             msg_search += Style.BRIGHT + f' {features_collection.total_results} results '
             msg_search += Style.NORMAL + f'beginning at index {features_collection.start_index}'
             resto_client_print(msg_search)
+        if features_collection.nb_discarded:
+            msg_discarded = f'{features_collection.nb_discarded} results discarded as they do '
+            msg_discarded += 'not intersect the region'
+            resto_client_print(Fore.BLUE + msg_discarded)
         resto_client_print(Style.RESET_ALL)
 
     download_dir = Path(client_params.download_dir)
@@ -183,8 +190,14 @@ def cli_search_collection(args: Namespace) -> CliFunctionReturnType:
 
     download = get_from_args(DOWNLOAD_ARGNAME, args)
     if download and search_feature_id is not None:
-        resto_server.download_features_file_from_ids(search_feature_id, download,
-                                                     download_dir)
+        download_workers = get_from_args(DOWNLOAD_WORKERS_ARGNAME, args)
+        if download_workers is not None:
+            resto_server.download_workers = download_workers
+        download_report = resto_server.download_features_file_from_ids(search_feature_id,
+                                                                       download, download_dir)
+        if len(download_report) > 1:
+            resto_client_print(download_report)
+        download_report.raise_first_error()
     return client_params, resto_server
 
 
@@ -203,10 +216,15 @@ def add_search_subparser(sub_parsers: argparse._SubParsersAction) -> None:
                                            epilog=epilog_total,
                                            parents=[collection_option_parser(),
                                                     credentials_options_parser(),
-                                                    download_dir_option_parser()])
+                                                    download_dir_option_parser(),
+                                                    download_workers_option_parser()])
     parser_search.add_argument('--criteria', dest=CRITERIA_ARGNAME, nargs='+',
                                help='search criteria (format --criteria=key:value)')
     parser_search.add_argument('--region', dest=REGION_ARGNAME, help=str_region_choice())
+    parser_search.add_argument('--precise_region', dest=PRECISE_REGION_ARGNAME,
+                               action='store_true',
+                               help='discard the results which do not intersect the region '
+                               'itself, the server being only given its convex hull')
     parser_search.add_argument('--maxrecords', dest=MAXRECORDS_ARGNAME, type=int,
                                help='maximum records to show')
     parser_search.add_argument('--page', dest=PAGE_ARGNAME, type=int,
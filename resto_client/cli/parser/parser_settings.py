@@ -46,6 +46,9 @@ MAXRECORDS_ARGNAME = 'maxrecords'
 PAGE_ARGNAME = 'page'
 DOWNLOAD_ARGNAME = 'download'
 JSON_ARGNAME = 'save_json'
+PRECISE_REGION_ARGNAME = 'precise_region'
 
 # Arguments for download
 DOWNLOAD_TYPE_ARGNAME = 'download_type'
+DOWNLOAD_WORKERS_ARGNAME = 'download_workers'
+DOWNLOAD_SEGMENTS_ARGNAME = 'download_segments'
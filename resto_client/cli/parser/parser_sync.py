@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""
+.. admonition:: License
+
+   Copyright 2019 CNES
+
+   Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+   in compliance with the License. You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software distributed under the License
+   is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+   or implied. See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+import argparse
+from argparse import RawDescriptionHelpFormatter
+from pathlib import Path
+
+from colorama import Style, colorama_text
+
+from resto_client.cli.cli_utils import get_from_args
+from resto_client.cli.resto_client_parameters import RestoClientParameters
+from resto_client.cli.resto_server_persisted import RestoServerPersisted
+from resto_client.entities.resto_feature import KNOWN_FILES_TYPES
+from resto_client.functions.aoi_utils import str_region_choice
+from resto_client.settings.resto_client_config import resto_client_print
+
+from .parser_common import (credentials_options_parser, EPILOG_CREDENTIALS,
+                            download_dir_option_parser, EPILOG_DOWNLOAD_DIR,
+                            collection_option_parser, download_workers_option_parser,
+                            CliFunctionReturnType)
+from .parser_search import criteria_args_fitter
+from .parser_settings import (REGION_ARGNAME, CRITERIA_ARGNAME, MAXRECORDS_ARGNAME,
+                              DOWNLOAD_ARGNAME, DOWNLOAD_WORKERS_ARGNAME)
+
+
+EPILOG_SYNC = '''
+The first synchronization with some criteria retrieves all the features found. Subsequent ones
+with the same collection and criteria only retrieve the features published or updated since.
+An interrupted synchronization resumes where it stopped.
+'''
+
+
+def cli_sync_collection(args: argparse.Namespace) -> CliFunctionReturnType:
+    """
+    CLI adapter to sync function
+
+    :param args: arguments parsed by the CLI parser
+    :returns: the resto client parameters and the resto server possibly built by this command.
+    """
+    client_params = RestoClientParameters.build_from_argparse(args)
+    resto_server = RestoServerPersisted.build_from_argparse(
+        args, debug_server=RestoClientParameters.is_debug())
+
+    criteria_dict = criteria_args_fitter(get_from_args(CRITERIA_ARGNAME, args),
+                                         get_from_args(MAXRECORDS_ARGNAME, args))
+    region = get_from_args(REGION_ARGNAME, args)
+    if region is None:
+        region = client_params.region
+    if region is not None:
+        criteria_dict[REGION_ARGNAME] = region
+
+    features = []
+    for feature in resto_server.sync(criteria_dict):
+        resto_client_print(f'{feature.product_identifier} : {feature.title}')
+        features.append(feature)
+    with colorama_text():
+        resto_client_print(Style.BRIGHT + f'{len(features)} features published or updated '
+                           'since last synchronization' + Style.RESET_ALL)
+
+    download = get_from_args(DOWNLOAD_ARGNAME, args)
+    if download and features:
+        download_workers = get_from_args(DOWNLOAD_WORKERS_ARGNAME, args)
+        if download_workers is not None:
+            resto_server.download_workers = download_workers
+        download_report = resto_server.download_features_files(
+            features, download, Path(client_params.download_dir))
+        if len(download_report) > 1:
+            resto_client_print(download_report)
+        download_report.raise_first_error()
+    return client_params, resto_server
+
+
+# We need to specify argparse._SubParsersAction for mypy to run. Thus pylint squeals.
+# pylint: disable=protected-access
+def add_sync_subparser(sub_parsers: argparse._SubParsersAction) -> None:
+    """
+    Add the 'sync' subparser
+    """
+    parser_sync = sub_parsers.add_parser('sync',
+                                         formatter_class=RawDescriptionHelpFormatter,
+                                         help='retrieve the features published or updated since '
+                                         'the last synchronization.',
+                                         description='Search feature(s) in a collection using '
+                                         'selection criteria, retrieving only those published '
+                                         'or updated since the previous synchronization.',
+                                         epilog=EPILOG_SYNC + EPILOG_CREDENTIALS +
+                                         EPILOG_DOWNLOAD_DIR,
+                                         parents=[collection_option_parser(),
+                                                  credentials_options_parser(),
+                                                  download_dir_option_parser(),
+                                                  download_workers_option_parser()])
+    parser_sync.add_argument('--criteria', dest=CRITERIA_ARGNAME, nargs='+',
+                             help='search criteria (format --criteria=key:value)')
+    parser_sync.add_argument('--region', dest=REGION_ARGNAME, help=str_region_choice())
+    parser_sync.add_argument('--maxrecords', dest=MAXRECORDS_ARGNAME, type=int,
+                             help='number of features requested per page')
+    parser_sync.add_argument('--download', dest=DOWNLOAD_ARGNAME, nargs='?', default=False,
+                             choices=KNOWN_FILES_TYPES,
+                             const='product',
+                             help='download files corresponding to synchronized features, by '
+                             'default product will be downloaded')
+
+    parser_sync.set_defaults(func=cli_sync_collection)
@@ -21,6 +21,7 @@ from .parser_download import add_download_subparser
 from .parser_search import add_search_subparser
 from .parser_set import add_set_subparser
 from .parser_show import add_show_subparser
+from .parser_sync import add_sync_subparser
 from .parser_unset import add_unset_subparser
 
 
@@ -40,6 +41,7 @@ def build_parser() -> ArgumentParser:
     add_show_subparser(sub_parsers)
     add_download_subparser(sub_parsers)
     add_search_subparser(sub_parsers)
+    add_sync_subparser(sub_parsers)
     add_configure_server_subparser(sub_parsers)
 
     return parser
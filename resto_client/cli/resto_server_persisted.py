@@ -53,7 +53,8 @@ class RestoServerPersisted(RestoServer, PersistedAttributes):
                  username: Optional[str] = None,
                  password: Optional[str] = None,
                  token: Optional[str] = None,
-                 debug_server: bool = False) -> None:
+                 debug_server: bool = False,
+                 check_collection: bool = True) -> None:
         """
         Build a new RestoServer instance from arguments and database.
 
@@ -63,6 +64,8 @@ class RestoServerPersisted(RestoServer, PersistedAttributes):
         :param password: account password on the server
         :param token: an existing token associated to this account (will be checked prior its use)
         :param debug_server: When True debugging information on server and requests is printed out.
+        :param check_collection: when False, current_collection is used without checking that it
+                                 exists on the server, which saves retrieving the collections.
         """
         self.server_on = True
         super(RestoServerPersisted, self).__init__(server_name,
@@ -70,7 +73,8 @@ class RestoServerPersisted(RestoServer, PersistedAttributes):
                                                    username=username,
                                                    password=password,
                                                    token=token,
-                                                   debug_server=debug_server)
+                                                   debug_server=debug_server,
+                                                   check_collection=check_collection)
 
     def switch_off(self) -> None:
         """
@@ -166,9 +170,12 @@ class RestoServerPersisted(RestoServer, PersistedAttributes):
             # Build from requested server name without using any default.
             server_parameters[SERVER_KEY] = server_name
 
-        # Update current_collection if specified
+        # Update current_collection if specified. A persisted collection was checked when it was
+        # recorded: only a requested one needs to be checked against the server collections.
         if current_collection is not None:
             server_parameters[COLLECTION_KEY] = current_collection
+        else:
+            server_parameters['check_collection'] = False
         # Create server from parameters
         server = RestoServerPersisted(**server_parameters)
         # Update credentials if specified
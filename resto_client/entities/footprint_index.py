@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+.. admonition:: License
+
+   Copyright 2019 CNES
+
+   Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+   in compliance with the License. You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software distributed under the License
+   is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+   or implied. See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+from typing import Iterable, List  # @NoMove
+
+import shapely
+from shapely import wkb
+from shapely.geometry.base import BaseGeometry
+from shapely.ops import unary_union
+from shapely.prepared import prep
+from shapely.strtree import STRtree
+
+from resto_client.functions.wkb_utils import geometry_to_wkb
+
+from .resto_feature import BaseRestoFeature
+
+
+SHAPELY_2 = int(shapely.__version__.split('.')[0]) >= 2
+"""True when shapely 2 is installed, whose STRtree evaluates the predicates itself."""
+
+
+class FootprintIndex():
+    """
+     Class holding a spatial index (a shapely STRtree) over the footprints of resto features,
+     to find the features intersecting or covering an area of interest and to measure how much
+     of this area is covered by them.
+
+     With shapely 2 the footprints are built in a single vectorized call and the predicates are
+     evaluated within the tree query. With older versions the tree only provides the candidates
+     whose bounding box intersects the area, which are then tested against a prepared geometry.
+    """
+
+    def __init__(self, features: Iterable[BaseRestoFeature]) -> None:
+        """
+        :param features: the features to index, for instance the features of a
+                         RestoFeatureCollection or those returned by a harvest. Features without
+                         geometry are kept but never found.
+        """
+        self.features = list(features)
+        wkb_footprints = [geometry_to_wkb(feature.geometry) for feature in self.features]
+        if SHAPELY_2:
+            self._footprints = shapely.from_wkb(wkb_footprints)
+            self._tree = STRtree(self._footprints)
+        else:
+            self._footprints = [None if footprint is None else wkb.loads(footprint)
+                                for footprint in wkb_footprints]
+            indexed_footprints = [footprint for footprint in self._footprints
+                                  if footprint is not None]
+            self._indexes_by_id = {id(footprint): index
+                                   for index, footprint in enumerate(self._footprints)
+                                   if footprint is not None}
+            self._tree = STRtree(indexed_footprints)
+
+    def __len__(self) -> int:
+        return len(self.features)
+
+    def _query(self, aoi: BaseGeometry, predicate: str) -> List[int]:
+        """
+        :param aoi: the area of interest
+        :param predicate: the predicate between the area and the footprints to select, as named
+                          by shapely: 'intersects' or 'covered_by'.
+        :returns: the sorted indexes of the features whose footprint satisfies the predicate.
+        """
+        if SHAPELY_2:
+            return sorted(self._tree.query(aoi, predicate=predicate).tolist())
+        candidates = [self._indexes_by_id[id(footprint)] for footprint in self._tree.query(aoi)]
+        if predicate == 'intersects':
+            prepared_aoi = prep(aoi)
+            return sorted(index for index in candidates
+                          if prepared_aoi.intersects(self._footprints[index]))
+        return sorted(index for index in candidates if self._footprints[index].covers(aoi))
+
+    def intersecting(self, aoi: BaseGeometry) -> List[BaseRestoFeature]:
+        """
+        :param aoi: the area of interest
+        :returns: the features whose footprint intersects the area, in their original order.
+        """
+        return [self.features[index] for index in self._query(aoi, 'intersects')]
+
+    def covering(self, aoi: BaseGeometry) -> List[BaseRestoFeature]:
+        """
+        :param aoi: the area of interest
+        :returns: the features whose footprint covers the whole area, in their original order.
+        """
+        return [self.features[index] for index in self._query(aoi, 'covered_by')]
+
+    def coverage_fraction(self, aoi: BaseGeometry) -> float:
+        """
+        :param aoi: the area of interest, which must have a non null area.
+        :returns: the fraction of the area covered by the union of the features footprints,
+                  between 0 and 1.
+        """
+        footprints = [self._footprints[index] for index in self._query(aoi, 'intersects')]
+        if not footprints:
+            return 0.
+        covered_area = unary_union(footprints).intersection(aoi).area
+        return min(covered_area / aoi.area, 1.)
@@ -14,7 +14,6 @@
    or implied. See the License for the specific language governing permissions and
    limitations under the License.
 """
-import copy
 from typing import List, Optional, Union  # @UnusedImport @NoMove
 
 from prettytable import PrettyTable
@@ -34,7 +33,8 @@ class RestoCollection():
         """
         :param collection_descr: description of the collection
         """
-        self._collection_descr = copy.deepcopy(collection_descr)
+        # Only top level fields are removed from the description: a shallow copy is enough.
+        self._collection_descr = dict(collection_descr)
         self.license = RestoCollectionLicense(self._collection_descr)
         if 'statistics' in self._collection_descr:
             stats_field: Union[dict, list] = self._collection_descr['statistics']
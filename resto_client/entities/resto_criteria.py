@@ -19,10 +19,13 @@ from typing import (Optional, Any, Union)  # @NoMove @UnusedImport
 
 from pathlib import Path
 
+from shapely.geometry.base import BaseGeometry
+from shapely.prepared import PreparedGeometry
+
 from resto_client.base_exceptions import RestoClientUserError, RestoClientDesignError
 from resto_client.entities.resto_criteria_definition import (test_criterion,
                                                              get_criteria_for_protocol)
-from resto_client.functions.aoi_utils import search_file_from_key, geojson_zone_to_bbox
+from resto_client.functions.aoi_utils import search_file_from_key, ZONE_REGISTRY
 
 
 class RestoCriteria(dict):
@@ -36,6 +39,10 @@ class RestoCriteria(dict):
         :param dict kwargs: dictionary in keyword=value form
         """
         self.supported_criteria = get_criteria_for_protocol(resto_protocol)
+        # Union of the shapes of the region, when the geometry criterion was built from a region.
+        self.region_geometry: Optional[BaseGeometry] = None
+        # The same union, prepared once for all by the zone registry for the intersection tests.
+        self.region_prepared: Optional[PreparedGeometry] = None
 
         super(RestoCriteria, self).__init__()
         self.update(kwargs)
@@ -133,15 +140,20 @@ class RestoCriteria(dict):
         if 'identifiers' in self or 'identifier' in self:
             if 'geometry' in self:
                 del self['geometry']
+            self.region_geometry = None
+            self.region_prepared = None
         # else if geometry already given we won't overwrite it
         elif 'geometry' not in self and region is not None:
             if isinstance(region, Path):
                 geojson_file = region
             else:
                 geojson_file = search_file_from_key(region)
-            shape_bbox = geojson_zone_to_bbox(geojson_file)
-            geometry_criteria = str(shape_bbox)
-            self['geometry'] = geometry_criteria
+            # The server only receives the convex hull of the region, to keep the URL short.
+            # The union of its shapes is kept for filtering the results precisely.
+            zone = ZONE_REGISTRY.get_zone(geojson_file)
+            self.region_geometry = zone.union
+            self.region_prepared = zone.prepared
+            self['geometry'] = zone.convex_hull_wkt
 
     def _retrieve_criterion(self, key: str) -> str:
         """
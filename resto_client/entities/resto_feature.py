@@ -15,7 +15,7 @@
    limitations under the License.
 """
 import json
-from typing import Optional, Dict  # @NoMove
+from typing import TYPE_CHECKING, Optional, Dict  # @NoMove
 from pathlib import Path
 
 import geojson
@@ -29,24 +29,25 @@ from .resto_license import RestoFeatureLicense
 KNOWN_FILES_TYPES = ['product', 'quicklook', 'thumbnail', 'annexes']
 
 
-class RestoFeature(geojson.Feature):
+class BaseRestoFeature():
     """
-     Class holding a Resto feature.
+     Base class of the Resto features, providing the accessors to their properties.
+
+     Subclasses must provide the properties, license, downloaded_files_paths and
+     downloaded_files_verified attributes.
     """
+    __slots__ = ()
 
-    def __init__(self, feature_descr: dict) -> None:
-        """
-        :param feature_descr: Feature description
-        :raises TypeError: When Feature type in descriptor is different from 'Feature'
-        """
-        if feature_descr['type'] != 'Feature':
-            raise TypeError('Cannot create a feature whose type is not Feature')
-        super(RestoFeature, self).__init__(id=feature_descr['id'],
-                                           geometry=feature_descr['geometry'],
-                                           properties=feature_descr['properties'])
-        self.license = RestoFeatureLicense(feature_descr['properties'])
-        self.downloaded_files_paths: Dict[str, Path]
-        self.downloaded_files_paths = {}
+    id: str
+    properties: dict
+
+    if TYPE_CHECKING:
+        # Declared read-only, as the compact features decode their geometry on access.
+        @property
+        def geometry(self) -> Optional[dict]:
+            """
+            :returns: the geometry of the feature.
+            """
 
     def get_download_url(self, file_type: str) -> str:
         """
@@ -188,7 +189,7 @@ class RestoFeature(geojson.Feature):
         return self.properties['thumbnail']
 
     @property
-    def download_annexes_service(self) -> dict:
+    def download_annexes_service(self) -> Optional[dict]:
         """
         :returns: the entire annexes service which was stored in json
         """
@@ -279,10 +280,37 @@ class RestoFeature(geojson.Feature):
         """
         :returns: the product storage.
         """
-        if self.properties.get('storage') is not None:
-            return self.properties.get('storage').get('mode')
+        storage = self.properties.get('storage')
+        if storage is not None:
+            return storage.get('mode')
         return None
 
+
+class RestoFeature(BaseRestoFeature, geojson.Feature):
+    """
+     Class holding a Resto feature.
+    """
+
+    def __init__(self, feature_descr: dict) -> None:
+        """
+        :param feature_descr: Feature description
+        :raises TypeError: When Feature type in descriptor is different from 'Feature'
+        """
+        if feature_descr['type'] != 'Feature':
+            raise TypeError('Cannot create a feature whose type is not Feature')
+        # The license is removed from the properties: copy them, not to modify the description,
+        # which may be shared with the response cache.
+        properties = dict(feature_descr['properties'])
+        super(RestoFeature, self).__init__(id=feature_descr['id'],
+                                           geometry=feature_descr['geometry'],
+                                           properties=properties)
+        self.license = RestoFeatureLicense(properties)
+        self.downloaded_files_paths: Dict[str, Path]
+        self.downloaded_files_paths = {}
+        # For each downloaded file: True if it was checked against its checksum, None otherwise.
+        self.downloaded_files_verified: Dict[str, Optional[bool]]
+        self.downloaded_files_verified = {}
+
     def __str__(self) -> str:
 
         if self.properties is not None:
@@ -346,3 +374,141 @@ class RestoFeature(geojson.Feature):
                 else:
                     second_table.add_row([property_field, value])
         return second_table.get_string()
+
+
+ENCODED_PROPERTIES = ('services', 'links', 'keywords', 'license', 'license_info')
+"""Properties of a compact feature which are kept encoded in json until they are needed."""
+
+
+class CompactRestoFeature(BaseRestoFeature):
+    """
+     Class holding a Resto feature with a small memory footprint.
+
+     Unlike RestoFeature this is not a dictionary: the attributes are stored in slots, the
+     geometry is kept as a json string decoded on each access and the bulky properties listed in
+     ENCODED_PROPERTIES are kept as a single json string, which is decoded only when the services
+     or the license are requested. The annexes are parsed once. The GeoJSON description of the
+     feature can be rebuilt with to_geojson().
+    """
+    __slots__ = ('id', 'properties', '_encoded_geometry', '_encoded_properties', '_services',
+                 '_license', '_annexes', '_downloaded_files_paths', '_downloaded_files_verified')
+
+    def __init__(self, feature_descr: dict) -> None:
+        """
+        :param feature_descr: Feature description. It is not modified.
+        :raises TypeError: When Feature type in descriptor is different from 'Feature'
+        """
+        if feature_descr['type'] != 'Feature':
+            raise TypeError('Cannot create a feature whose type is not Feature')
+        self.id = feature_descr['id']  # pylint: disable=invalid-name
+        self._encoded_geometry = json.dumps(feature_descr['geometry'], separators=(',', ':'))
+        properties = feature_descr['properties']
+        self.properties = {key: value for key, value in properties.items()
+                           if key not in ENCODED_PROPERTIES}
+        encoded_properties = {key: properties[key] for key in ENCODED_PROPERTIES
+                              if key in properties}
+        self._encoded_properties = json.dumps(encoded_properties, separators=(',', ':'))
+        self._services: Optional[dict] = None
+        self._license: Optional[RestoFeatureLicense] = None
+        self._annexes: Optional[dict] = None
+        self._downloaded_files_paths: Optional[Dict[str, Path]] = None
+        self._downloaded_files_verified: Optional[Dict[str, Optional[bool]]] = None
+
+    @classmethod
+    def from_feature(cls, feature: RestoFeature) -> 'CompactRestoFeature':
+        """
+        Build a compact feature from a RestoFeature.
+
+        :param feature: the feature to convert
+        :returns: a compact feature holding the same description and downloaded files.
+        """
+        # The license properties are restored as received: they are only normalized when read.
+        compact_feature = cls({'type': 'Feature',
+                               'id': feature.id,
+                               'geometry': feature.geometry,
+                               'properties': dict(feature.properties,
+                                                  **feature.license.item_entries)})
+        if feature.downloaded_files_paths:
+            compact_feature.downloaded_files_paths.update(feature.downloaded_files_paths)
+            compact_feature.downloaded_files_verified.update(feature.downloaded_files_verified)
+        return compact_feature
+
+    def _decode_properties(self) -> dict:
+        """
+        :returns: the properties which are kept encoded in json, freshly decoded.
+        """
+        return json.loads(self._encoded_properties)
+
+    def to_geojson(self) -> dict:
+        """
+        :returns: the GeoJSON description of this feature, as received from the server.
+        """
+        properties = dict(self.properties)
+        properties.update(self._decode_properties())
+        return {'type': 'Feature', 'id': self.id, 'geometry': self.geometry,
+                'properties': properties}
+
+    def to_feature(self) -> RestoFeature:
+        """
+        :returns: a RestoFeature holding the same description and downloaded files.
+        """
+        feature = RestoFeature(self.to_geojson())
+        feature.downloaded_files_paths.update(self.downloaded_files_paths)
+        feature.downloaded_files_verified.update(self.downloaded_files_verified)
+        return feature
+
+    @property
+    def geometry(self) -> Optional[dict]:
+        """
+        :returns: the geometry of the feature, freshly decoded.
+        """
+        return json.loads(self._encoded_geometry)
+
+    @property
+    def license(self) -> RestoFeatureLicense:
+        """
+        :returns: the feature license, built on first access.
+        """
+        if self._license is None:
+            self._license = RestoFeatureLicense(self._decode_properties())
+        return self._license
+
+    @property
+    def downloaded_files_paths(self) -> Dict[str, Path]:
+        """
+        :returns: the paths of the downloaded files, indexed by file type.
+        """
+        if self._downloaded_files_paths is None:
+            self._downloaded_files_paths = {}
+        return self._downloaded_files_paths
+
+    @property
+    def downloaded_files_verified(self) -> Dict[str, Optional[bool]]:
+        """
+        :returns: for each downloaded file type: True if it was checked against its checksum,
+                  None otherwise.
+        """
+        if self._downloaded_files_verified is None:
+            self._downloaded_files_verified = {}
+        return self._downloaded_files_verified
+
+    @property
+    def download_annexes_service(self) -> Optional[dict]:
+        """
+        :returns: the entire annexes service which was stored in json, parsed on first access.
+        """
+        if self._annexes is None and self.properties.get('annexes') is not None:
+            self._annexes = json.loads(self.properties['annexes'])[0]
+        return self._annexes
+
+    @property
+    def download_product_service(self) -> dict:
+        """
+        :returns: the entire download service, decoded on first access.
+        """
+        if self._services is None:
+            self._services = self._decode_properties()['services']
+        return self._services['download']
+
+    def __str__(self) -> str:
+        return str(self.to_feature())
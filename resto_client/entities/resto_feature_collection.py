@@ -14,15 +14,23 @@
    or implied. See the License for the specific language governing permissions and
    limitations under the License.
 """
-from typing import List, Optional  # @NoMove
+from typing import TYPE_CHECKING, Dict, List, Optional, Union  # @NoMove
 
 import json
 from pathlib import Path
 
 import geojson
 from prettytable import PrettyTable
+from shapely.geometry import shape
+from shapely.geometry.base import BaseGeometry
+from shapely.prepared import PreparedGeometry, prep
 
 from .resto_feature import RestoFeature
+from .resto_feature_columns import RestoFeatureColumns
+
+if TYPE_CHECKING:
+    import numpy
+    import pyarrow
 
 
 class RestoFeatureCollection(geojson.FeatureCollection):
@@ -42,6 +50,29 @@ class RestoFeatureCollection(geojson.FeatureCollection):
         self.resto_features = [RestoFeature(desc) for desc in feature_coll_descr['features']]
         super(RestoFeatureCollection, self).__init__(properties=feature_coll_descr['properties'],
                                                      features=self.resto_features)
+        # The index and the identifiers cache are set as attributes, not as geojson items, such
+        # that they are not serialized with the feature collection.
+        features_index: Dict[str, Optional[RestoFeature]] = {}
+        object.__setattr__(self, '_features_index', features_index)
+        object.__setattr__(self, '_all_id', None)
+        object.__setattr__(self, '_nb_discarded', 0)
+        for feature in self.resto_features:
+            self._index_feature(feature)
+
+    def _index_feature(self, feature: RestoFeature) -> None:
+        """
+        Record a feature in the index, by uuid and by productIdentifier. An identifier shared by
+        several features is recorded with None, as it cannot designate a single feature.
+
+        :param feature: the feature to index
+        """
+        for feature_id in {feature.id, feature.properties.get('productIdentifier')}:
+            if feature_id is not None:
+                if feature_id in self._features_index:
+                    self._features_index[feature_id] = None
+                else:
+                    self._features_index[feature_id] = feature
+        object.__setattr__(self, '_all_id', None)
 
     @property
     def identifier(self) -> str:
@@ -76,22 +107,51 @@ class RestoFeatureCollection(geojson.FeatureCollection):
     @property
     def all_id(self) -> List[str]:
         """
-        :returns: the identifiers of all features in this feature collection
+        :returns: the identifiers of all features in this feature collection. The list is
+                  computed once and must not be modified.
         """
-        return [feature.product_identifier for feature in self.features]
+        if self._all_id is None:
+            object.__setattr__(self, '_all_id',
+                               [feature.product_identifier for feature in self.resto_features])
+        return self._all_id
 
     def get_feature(self, feature_id: str) -> RestoFeature:
         """
         Get the feature from this features collection with the requested id
 
-        :param feature_id: identifier of the feature to retrieve
+        :param feature_id: identifier or uuid of the feature to retrieve
         :returns: a resto feature
         :raises KeyError: when no feature with the specified identifier can be found.
         """
-        result = [feat for feat in self.resto_features if feat.product_identifier == feature_id]
-        if len(result) != 1:
+        feature = self._features_index.get(feature_id)
+        if feature is None:
             raise KeyError(f'No feature found with id: {feature_id}')
-        return result[0]
+        return feature
+
+    def append(self, feature: RestoFeature) -> bool:
+        """
+        Add a feature to this feature collection, unless a feature with the same uuid is already
+        in it.
+
+        :param feature: the feature to add
+        :returns: True if the feature was added, False if it was already in the collection.
+        """
+        if feature.id in self._features_index:
+            return False
+        self.resto_features.append(feature)
+        self['features'].append(feature)
+        self._index_feature(feature)
+        return True
+
+    def merge(self, other: 'RestoFeatureCollection') -> int:
+        """
+        Add the features of another feature collection, for instance another page of the same
+        search, to this one, skipping those already in it. The properties are left unchanged.
+
+        :param other: the feature collection whose features must be added
+        :returns: the number of features added
+        """
+        return sum(self.append(feature) for feature in other.resto_features)
 
     def write_json(self, dir_path: Path) -> Path:
         """
@@ -104,6 +164,64 @@ class RestoFeatureCollection(geojson.FeatureCollection):
             json.dump(self, stream, indent=2)
         return dir_path / json_name
 
+    @property
+    def nb_discarded(self) -> int:
+        """
+        :returns: the number of features removed by filter_by_region()
+        """
+        return self._nb_discarded
+
+    def filter_by_region(self, region: Union[BaseGeometry, PreparedGeometry]) -> int:
+        """
+        Remove the features whose footprint does not intersect a region. This is meant to refine
+        the results of a search, which was made with a simplified geometry of the region.
+        Features without footprint are kept.
+
+        :param region: the region which must be intersected by the footprints, preferably
+                       prepared, as the prepared geometries of the zones are.
+        :returns: the number of features removed
+        """
+        prepared_region = region if isinstance(region, PreparedGeometry) else prep(region)
+        kept_features = [feature for feature in self.resto_features
+                         if feature.geometry is None
+                         or prepared_region.intersects(shape(feature.geometry))]
+        nb_discarded = len(self.resto_features) - len(kept_features)
+        if nb_discarded:
+            self.resto_features[:] = kept_features
+            self['features'][:] = kept_features
+            self._features_index.clear()
+            for feature in kept_features:
+                self._index_feature(feature)
+        object.__setattr__(self, '_nb_discarded', self._nb_discarded + nb_discarded)
+        return nb_discarded
+
+    def to_numpy_records(self) -> 'numpy.ndarray':
+        """
+        :returns: the main attributes of the features as a numpy structured array, with one
+                  record per feature.
+        :raises ImportError: when numpy is not installed.
+        """
+        return RestoFeatureColumns(self.resto_features).to_numpy_records()
+
+    def to_arrow(self) -> 'pyarrow.Table':
+        """
+        :returns: the main attributes of the features as an Arrow table, with one row per feature.
+        :raises ImportError: when numpy or pyarrow is not installed.
+        """
+        return RestoFeatureColumns(self.resto_features).to_arrow()
+
+    def write_parquet(self, dir_path: Path) -> Path:
+        """
+        Save the main attributes of the features in a Parquet file
+
+        :param dir_path: Path where to write the Parquet file
+        :returns: Path of the saved Parquet file
+        :raises ImportError: when numpy or pyarrow is not installed.
+        """
+        parquet_path = dir_path / 'request_{}.parquet'.format(self.identifier)
+        RestoFeatureColumns.write_parquet(self.resto_features, parquet_path)
+        return parquet_path
+
     def __str__(self) -> str:
 
         if self.properties is not None:
@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+"""
+.. admonition:: License
+
+   Copyright 2019 CNES
+
+   Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+   in compliance with the License. You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software distributed under the License
+   is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+   or implied. See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union  # @NoMove
+
+from resto_client.functions.wkb_utils import geometry_to_wkb
+
+from .resto_feature import BaseRestoFeature
+
+# numpy and pyarrow are optional dependencies, installed with: pip install resto_client[columnar]
+try:
+    import numpy
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+try:
+    import pyarrow
+    import pyarrow.parquet
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+
+# Columns built from the features: name of the column, feature property and kind of values.
+# 'id' and 'geometry' are taken from the feature itself, not from its properties.
+FEATURE_COLUMNS = (('id', None, 'string'),
+                   ('product_identifier', 'productIdentifier', 'string'),
+                   ('collection', 'collection', 'string'),
+                   ('platform', 'platform', 'string'),
+                   ('instrument', 'instrument', 'string'),
+                   ('product_type', 'productType', 'string'),
+                   ('processing_level', 'processingLevel', 'string'),
+                   ('start_date', 'startDate', 'date'),
+                   ('completion_date', 'completionDate', 'date'),
+                   ('updated', 'updated', 'date'),
+                   ('cloud_cover', 'cloudCover', 'float'),
+                   ('resolution', 'resolution', 'float'),
+                   ('orbit_number', 'orbitNumber', 'float'),
+                   ('geometry', None, 'wkb'))
+
+PARQUET_BATCH_SIZE = 10000
+"""Number of features converted and written at once by RestoFeatureColumns.write_parquet()."""
+
+
+def _utc_date(date: Optional[str]) -> Any:
+    """
+    :param date: a date as provided by resto, in ISO 8601 format.
+    :returns: the date in a form understood by numpy: an ISO 8601 string without time zone,
+              a numpy.datetime64 when an offset must be applied, or None if undefined.
+    """
+    if not date:
+        return None
+    if date.endswith('Z'):
+        return date[:-1]
+    if len(date) > 6 and date[-6] in '+-' and date[-3] == ':':
+        offset = int(date[-5:-3]) * 60 + int(date[-2:])
+        if date[-6] == '+':
+            offset = -offset
+        return numpy.datetime64(date[:-6], 'ms') + numpy.timedelta64(offset, 'm')
+    return date
+
+
+class RestoFeatureColumns():
+    """
+     Class holding the main attributes of resto features as columns, for analytics.
+
+     The values are appended to one list per column, directly from the features properties,
+     while iterating over the features. They are then converted into typed numpy or Arrow
+     arrays: dates as datetime64 in milliseconds, numbers as float and geometries as WKB.
+     numpy is needed for the conversions and pyarrow for the Arrow and Parquet ones.
+    """
+
+    def __init__(self, features: Iterable[BaseRestoFeature]=()) -> None:
+        """
+        :param features: the features to convert, which may be an iterator.
+        """
+        self._values: Dict[str, List[Any]] = {name: [] for name, _, _ in FEATURE_COLUMNS}
+        self.extend(features)
+
+    def extend(self, features: Iterable[BaseRestoFeature]) -> None:
+        """
+        Append the attributes of some features to the columns.
+
+        :param features: the features to append, which may be an iterator.
+        """
+        append_id = self._values['id'].append
+        append_geometry = self._values['geometry'].append
+        appenders = [(self._values[name].append, property_name)
+                     for name, property_name, _ in FEATURE_COLUMNS if property_name is not None]
+        for feature in features:
+            properties = feature.properties
+            append_id(feature.id)
+            for append, property_name in appenders:
+                append(properties.get(property_name))
+            append_geometry(geometry_to_wkb(feature.geometry))
+
+    def __len__(self) -> int:
+        return len(self._values['id'])
+
+    @staticmethod
+    def _check_numpy() -> None:
+        """
+        :raises ImportError: when numpy is not installed.
+        """
+        if not HAS_NUMPY:
+            raise ImportError('Columnar export requires numpy: pip install resto_client[columnar]')
+
+    def _numpy_column(self, name: str, kind: str) -> 'numpy.ndarray':
+        """
+        :param name: name of the column
+        :param kind: kind of values in the column
+        :returns: the column values as a numpy array of the type corresponding to their kind.
+        """
+        values = self._values[name]
+        if kind == 'date':
+            return numpy.array([_utc_date(date) for date in values], dtype='datetime64[ms]')
+        if kind == 'float':
+            return numpy.array(values, dtype=float)
+        column = numpy.empty(len(values), dtype=object)
+        column[:] = values
+        return column
+
+    def to_numpy_records(self) -> 'numpy.ndarray':
+        """
+        :returns: a numpy structured array with one record per feature, which can be given to
+                  pandas.DataFrame.from_records().
+        :raises ImportError: when numpy is not installed.
+        """
+        self._check_numpy()
+        columns = [(name, self._numpy_column(name, kind)) for name, _, kind in FEATURE_COLUMNS]
+        records = numpy.empty(len(self), dtype=[(name, column.dtype) for name, column in columns])
+        for name, column in columns:
+            records[name] = column
+        return records
+
+    def to_arrow(self) -> 'pyarrow.Table':
+        """
+        :returns: an Arrow table with one row per feature, where undefined values are nulls.
+        :raises ImportError: when numpy or pyarrow is not installed.
+        """
+        self._check_numpy()
+        if not HAS_PYARROW:
+            raise ImportError('Arrow export requires pyarrow: pip install resto_client[columnar]')
+        arrays = []
+        for name, _, kind in FEATURE_COLUMNS:
+            if kind == 'string':
+                array = pyarrow.array(self._values[name], type=pyarrow.string())
+            elif kind == 'wkb':
+                array = pyarrow.array(self._values[name], type=pyarrow.binary())
+            elif kind == 'date':
+                array = pyarrow.array(self._numpy_column(name, kind), from_pandas=True,
+                                      type=pyarrow.timestamp('ms', tz='UTC'))
+            else:
+                array = pyarrow.array(self._numpy_column(name, kind), from_pandas=True)
+            arrays.append(array)
+        return pyarrow.Table.from_arrays(arrays, names=[name for name, _, _ in FEATURE_COLUMNS])
+
+    @classmethod
+    def write_parquet(cls, features: Iterable[BaseRestoFeature], file_path: Union[Path, str],
+                      batch_size: int=PARQUET_BATCH_SIZE) -> int:
+        """
+        Write features in a Parquet file, converting them by batches such that a stream of
+        features of any length can be written with a bounded memory.
+
+        :param features: the features to write, which may be an iterator.
+        :param file_path: path of the Parquet file to write
+        :param batch_size: number of features converted and written at once
+        :returns: the number of features written
+        :raises ImportError: when numpy or pyarrow is not installed.
+        """
+        features = iter(features)
+        nb_features = 0
+        writer = None
+        try:
+            while True:
+                table = cls(islice(features, batch_size)).to_arrow()
+                if writer is None:
+                    writer = pyarrow.parquet.ParquetWriter(str(file_path), table.schema)
+                if table.num_rows == 0 and nb_features:
+                    break
+                writer.write_table(table)
+                nb_features += table.num_rows
+                if table.num_rows < batch_size:
+                    break
+        finally:
+            if writer is not None:
+                writer.close()
+        return nb_features
@@ -55,7 +55,9 @@ class RestoLicense(dict):
         else:
             self._license_infos = license_entry
 
-        # Remove license information from item_description
+        # Keep license information as found in item_description, before removing it from there.
+        self.item_entries = {key: item_description[key] for key in ('license', 'license_info')
+                             if key in item_description}
         RestoLicense._clean_license_in_item(item_description)
         self.update(self._license_infos)
 
@@ -14,19 +14,23 @@
    or implied. See the License for the specific language governing permissions and
    limitations under the License.
 """
-from typing import Any, List  # @UnusedImport @NoMove
+from typing import Any, Dict, Iterable, List, Optional, Tuple  # @UnusedImport @NoMove
 
 import json
+import threading
 
 from pathlib import Path
 from shapely.geometry import shape
 from shapely.geometry.base import BaseGeometry
 from shapely.ops import unary_union
+from shapely.prepared import prep
 from resto_client.base_exceptions import RestoClientUserError
+from resto_client.settings.resto_client_config import RESTO_CLIENT_CONFIG_DIR
 
 
 HERE = Path(__file__).parent
 PATH_AOI = HERE.parent / 'zones'
+USER_PATH_AOI = Path(RESTO_CLIENT_CONFIG_DIR) / 'zones'
 
 
 class LowerList(list):
@@ -50,10 +54,7 @@ def list_all_geojson() -> List[str]:
 
     :returns: list of file in lower_case
     """
-    list_file = [f.stem for f in PATH_AOI.iterdir() if f.suffix == '.geojson']
-    # prepare test by lower all name
-    list_file = [element.lower() for element in list_file]
-    return list_file
+    return ZONE_REGISTRY.names()
 
 
 def search_file_from_key(key: str) -> Path:
@@ -63,6 +64,9 @@ def search_file_from_key(key: str) -> Path:
     :param  key: the geojson file
     :returns: geojson file associated
     """
+    zone_path = ZONE_REGISTRY.find(key)
+    if zone_path is not None:
+        return zone_path
     if not key.endswith('.geojson'):
         key += '.geojson'
     return PATH_AOI / key
@@ -85,10 +89,17 @@ def geojson_zone_to_bbox(geojson_path: Path) -> BaseGeometry:
     :param geojson_path: the path to the geojson file
     :returns: the bbox geometry of the kml
     """
-    # will contain all shape of the geojson
-    shapes = geojson_to_shape(geojson_path)
-    # translate it for resto into bbox bounds
-    return shapes_to_bbox(shapes)
+    return ZONE_REGISTRY.get_zone(geojson_path).convex_hull
+
+
+def geojson_zone_to_union(geojson_path: Path) -> BaseGeometry:
+    """
+    Translate a geojson file to the union of its geometries
+
+    :param geojson_path: the path to the geojson file
+    :returns: the union of all the shapes of the geojson file
+    """
+    return ZONE_REGISTRY.get_zone(geojson_path).union
 
 
 def find_sensitive_file(geojson_path: Path) -> Path:
@@ -141,3 +152,124 @@ def shapes_to_bbox(shapes: List[BaseGeometry]) -> BaseGeometry:
     convex_envelope = union_mono_shape.convex_hull
 
     return convex_envelope
+
+
+class ZoneGeometry():  # pylint: disable=too-few-public-methods
+    """
+     Class holding the geometries derived from a zone file, computed once when it is loaded.
+    """
+
+    def __init__(self, shapes: List[BaseGeometry]) -> None:
+        """
+        :param shapes: the shapes found in the zone file
+        """
+        self.shapes = shapes
+        self.union = unary_union(shapes)
+        self.convex_hull = self.union.convex_hull
+        self.convex_hull_wkt = self.convex_hull.wkt
+        self.prepared = prep(self.union)
+
+
+class ZoneRegistry():
+    """
+     Class indexing the zone files found in several directories and holding the geometries of
+     the zones already loaded.
+
+     A directory is scanned again only when its modification time changes and a zone file is
+     parsed again only when its own modification time changes, such that building many criteria
+     on the same regions does not read the files each time. The registry is thread safe.
+    """
+
+    def __init__(self, directories: Iterable[Path]=()) -> None:
+        """
+        :param directories: the directories containing the zone files, in increasing order of
+                            precedence when a zone name is found in several of them.
+        """
+        self._lock = threading.Lock()
+        self._directories: List[Path] = []
+        self._directories_mtimes: Dict[Path, Optional[int]] = {}
+        self._zones_paths: Dict[str, Path] = {}
+        self._zones: Dict[Path, Tuple[Optional[int], ZoneGeometry]] = {}
+        for directory in directories:
+            self.add_directory(directory)
+
+    def add_directory(self, directory: Path) -> None:
+        """
+        Add a directory of zone files, taking precedence over the directories already added.
+        The directory may not exist yet.
+
+        :param directory: the directory to add
+        """
+        with self._lock:
+            if directory not in self._directories:
+                self._directories.append(directory)
+                self._directories_mtimes.clear()
+
+    @staticmethod
+    def _mtime(path: Path) -> Optional[int]:
+        """
+        :param path: a file or directory path
+        :returns: the modification time of the path in nanoseconds, or None if it does not exist.
+        """
+        try:
+            return path.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def _zones_index(self) -> Dict[str, Path]:
+        """
+        :returns: the paths of the zone files indexed by lowercase zone name, after scanning the
+                  directories again if any of them changed.
+        """
+        with self._lock:
+            directories_mtimes = {directory: self._mtime(directory)
+                                  for directory in self._directories}
+            if directories_mtimes != self._directories_mtimes:
+                self._zones_paths = {}
+                for directory in self._directories:
+                    if directories_mtimes[directory] is None:
+                        continue
+                    for zone_path in directory.iterdir():
+                        if zone_path.suffix == '.geojson':
+                            self._zones_paths[zone_path.stem.lower()] = zone_path
+                self._directories_mtimes = directories_mtimes
+            return self._zones_paths
+
+    def names(self) -> List[str]:
+        """
+        :returns: the lowercase names of all the zones available
+        """
+        return list(self._zones_index())
+
+    def find(self, key: str) -> Optional[Path]:
+        """
+        :param key: the name of a zone, in any case, with or without the .geojson extension.
+        :returns: the path of the zone file or None if there is no zone with this name.
+        """
+        key = key.lower()
+        if key.endswith('.geojson'):
+            key = key[:-len('.geojson')]
+        return self._zones_index().get(key)
+
+    def get_zone(self, geojson_path: Path) -> ZoneGeometry:
+        """
+        :param geojson_path: the path of a geojson file, possibly with a wrong case.
+        :returns: the geometries of the zone described in the file, loaded again only when the
+                  file changed.
+        :raises RestoClientUserError: when the file is not found.
+        """
+        if not geojson_path.exists():
+            geojson_path = find_sensitive_file(geojson_path)
+        mtime = self._mtime(geojson_path)
+        with self._lock:
+            cached_zone = self._zones.get(geojson_path)
+        if cached_zone is not None and cached_zone[0] == mtime:
+            return cached_zone[1]
+        zone = ZoneGeometry(geojson_to_shape(geojson_path))
+        with self._lock:
+            self._zones[geojson_path] = (mtime, zone)
+        return zone
+
+
+ZONE_REGISTRY = ZoneRegistry([PATH_AOI, USER_PATH_AOI])
+"""Registry of the zones provided with resto_client and of those of the user."""
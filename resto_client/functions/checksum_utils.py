@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+.. admonition:: License
+
+   Copyright 2019 CNES
+
+   Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+   in compliance with the License. You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software distributed under the License
+   is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+   or implied. See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+import hashlib
+from pathlib import Path
+import re
+from typing import Any, Optional, Tuple  # @NoMove
+
+
+# Algorithm to use when the checksum has no prefix, guessed from its number of hex digits.
+ALGORITHMS_BY_LENGTH = {32: 'md5', 40: 'sha1', 64: 'sha256', 128: 'sha512'}
+
+READ_BLOCK_SIZE = 4 * 1024 * 1024
+
+
+def parse_checksum(checksum: Optional[str]) -> Optional[Tuple[str, str]]:
+    """
+    Split a checksum as provided by resto into a hash algorithm and a digest.
+
+    Checksums may be prefixed by the algorithm name, e.g. 'md5:5d41...' or 'SHA256=2cf2...'.
+    When there is no prefix the algorithm is guessed from the length of the digest.
+
+    :param checksum: the checksum to parse
+    :returns: the hashlib name of the algorithm and the lowercase hexadecimal digest, or None if
+              the checksum is undefined or its algorithm is not supported.
+    """
+    if not checksum:
+        return None
+    match = re.match(r'^\s*(?:([A-Za-z0-9-]+)\s*[:=]\s*)?([0-9A-Fa-f]+)\s*$', checksum)
+    if match is None:
+        return None
+    algorithm, digest = match.groups()
+    if algorithm is None:
+        algorithm = ALGORITHMS_BY_LENGTH.get(len(digest))
+        if algorithm is None:
+            return None
+    algorithm = algorithm.lower().replace('-', '')
+    if algorithm not in hashlib.algorithms_available:
+        return None
+    return algorithm, digest.lower()
+
+
+def file_checksum(file_path: Path, algorithm: str) -> str:
+    """
+    Compute the hexadecimal digest of a file.
+
+    :param file_path: the file to read
+    :param algorithm: the hashlib name of the hash algorithm
+    :returns: the lowercase hexadecimal digest of the file content
+    """
+    hasher = hashlib.new(algorithm)
+    update_hash_from_file(hasher, file_path)
+    return hasher.hexdigest()
+
+
+def update_hash_from_file(hasher: Any, file_path: Path) -> None:
+    """
+    Feed a hash object with the content of a file.
+
+    :param hasher: a hash object as returned by hashlib.new()
+    :param file_path: the file to read
+    """
+    with open(file_path, 'rb') as file_desc:
+        for block in iter(lambda: file_desc.read(READ_BLOCK_SIZE), b''):
+            hasher.update(block)
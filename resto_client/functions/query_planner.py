@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+.. admonition:: License
+
+   Copyright 2019 CNES
+
+   Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+   in compliance with the License. You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software distributed under the License
+   is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+   or implied. See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional  # @NoMove
+
+from shapely import wkt
+from shapely.geometry import box
+
+
+DATE_FORMAT = '%Y-%m-%d'
+
+MIN_TILE_SIZE = 0.01
+"""Size in degrees under which a box or a geometry is not split any further."""
+
+CriteriaType = Dict[str, Any]
+
+
+def split_criteria(criteria: CriteriaType) -> Optional[List[CriteriaType]]:
+    """
+    Split search criteria into two sub-criteria covering together the same results.
+
+    The time interval defined by startDate and completionDate is split first, then the area
+    defined by box or geometry. Sub-criteria may share some results at their boundaries, which
+    must be removed by the caller.
+
+    :param criteria: the criteria of a search
+    :returns: two criteria whose searches results cover those of criteria, or None when criteria
+              cannot be split any further.
+    """
+    for splitter in (split_dates, split_box, split_geometry):
+        sub_criteria = splitter(criteria)
+        if sub_criteria is not None:
+            return sub_criteria
+    return None
+
+
+def split_dates(criteria: CriteriaType) -> Optional[List[CriteriaType]]:
+    """
+    Split the time interval of search criteria in two halves.
+
+    A date without time is read by resto as the beginning of that day, such that both halves
+    share the middle date: the first one ends when the second one starts.
+
+    :param criteria: the criteria of a search
+    :returns: two criteria with the first and second halves of the [startDate, completionDate]
+              interval, or None when these criteria are not both defined or they are less than
+              two days apart.
+    """
+    if 'startDate' not in criteria or 'completionDate' not in criteria:
+        return None
+    start_date = datetime.strptime(criteria['startDate'], DATE_FORMAT)
+    completion_date = datetime.strptime(criteria['completionDate'], DATE_FORMAT)
+    nb_days = (completion_date - start_date).days
+    if nb_days < 2:
+        return None
+    middle_date = (start_date + timedelta(days=nb_days // 2)).strftime(DATE_FORMAT)
+    return [dict(criteria, completionDate=middle_date), dict(criteria, startDate=middle_date)]
+
+
+def split_box(criteria: CriteriaType) -> Optional[List[CriteriaType]]:
+    """
+    Split the box of search criteria in two halves along its largest dimension.
+
+    :param criteria: the criteria of a search
+    :returns: two criteria with a half of the box each, or None when there is no box criterion
+              or when the halves would be smaller than MIN_TILE_SIZE.
+    """
+    if 'box' not in criteria:
+        return None
+    west, south, east, north = (float(coord) for coord in str(criteria['box']).split(','))
+    if max(east - west, north - south) < 2 * MIN_TILE_SIZE:
+        return None
+    if east - west >= north - south:
+        middle = (west + east) / 2
+        boxes = [(west, south, middle, north), (middle, south, east, north)]
+    else:
+        middle = (south + north) / 2
+        boxes = [(west, south, east, middle), (west, middle, east, north)]
+    return [dict(criteria, box=','.join(str(coord) for coord in sub_box)) for sub_box in boxes]
+
+
+def split_geometry(criteria: CriteriaType) -> Optional[List[CriteriaType]]:
+    """
+    Split the geometry of search criteria in two parts, by cutting its bounding box in two halves
+    along its largest dimension.
+
+    :param criteria: the criteria of a search
+    :returns: two criteria with a part of the geometry each, or None when there is no geometry
+              criterion, when it is not a surface or when the parts would be smaller than
+              MIN_TILE_SIZE.
+    """
+    if 'geometry' not in criteria:
+        return None
+    geometry = wkt.loads(str(criteria['geometry']))
+    if geometry.area == 0.:
+        return None
+    west, south, east, north = geometry.bounds
+    if max(east - west, north - south) < 2 * MIN_TILE_SIZE:
+        return None
+    if east - west >= north - south:
+        middle = (west + east) / 2
+        halves = [box(west, south, middle, north), box(middle, south, east, north)]
+    else:
+        middle = (south + north) / 2
+        halves = [box(west, south, east, middle), box(west, middle, east, north)]
+    parts = [geometry.intersection(half) for half in halves]
+    if any(part.is_empty for part in parts):
+        return None
+    return [dict(criteria, geometry=part.wkt) for part in parts]
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+.. admonition:: License
+
+   Copyright 2019 CNES
+
+   Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+   in compliance with the License. You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software distributed under the License
+   is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+   or implied. See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+from array import array
+from itertools import chain
+import struct
+import sys
+from typing import Any, List, Optional  # @NoMove
+
+from shapely.geometry import shape
+
+
+WKB_GEOMETRY_TYPES = {'Point': 1, 'LineString': 2, 'Polygon': 3,
+                      'MultiPoint': 4, 'MultiLineString': 5, 'MultiPolygon': 6}
+"""WKB codes of the GeoJSON geometry types which are encoded without shapely."""
+
+
+def _wkb_points(points: List[List[float]]) -> bytes:
+    """
+    :param points: a sequence of 2D points
+    :returns: the number of points and their coordinates, as written in WKB.
+    """
+    coordinates = array('d', chain.from_iterable(points))
+    if len(coordinates) != 2 * len(points):
+        raise ValueError('Only 2D coordinates can be encoded directly')
+    if sys.byteorder != 'little':
+        coordinates.byteswap()
+    return struct.pack('<I', len(points)) + coordinates.tobytes()
+
+
+def _wkb_body(geometry_type: str, coordinates: Any) -> bytes:
+    """
+    :param geometry_type: the type of a GeoJSON geometry, other than GeometryCollection
+    :param coordinates: the coordinates of the geometry
+    :returns: the geometry encoded in little endian WKB.
+    :raises ValueError: when the geometry cannot be encoded directly.
+    """
+    header = struct.pack('<BI', 1, WKB_GEOMETRY_TYPES[geometry_type])
+    if geometry_type == 'Point':
+        return header + _wkb_points([coordinates])[4:]
+    if geometry_type == 'LineString':
+        return header + _wkb_points(coordinates)
+    if geometry_type == 'Polygon':
+        # Rings are closed when needed, as shapely does when building polygons.
+        return header + struct.pack('<I', len(coordinates)) + \
+            b''.join(_wkb_points(ring if ring[0] == ring[-1] else ring + [ring[0]])
+                     for ring in coordinates)
+    part_type = geometry_type[len('Multi'):]
+    return header + struct.pack('<I', len(coordinates)) + \
+        b''.join(_wkb_body(part_type, part) for part in coordinates)
+
+
+def geometry_to_wkb(geometry: Optional[dict]) -> Optional[bytes]:
+    """
+    :param geometry: a GeoJSON geometry
+    :returns: the geometry encoded in WKB, or None if the geometry is undefined.
+    """
+    if geometry is None:
+        return None
+    if geometry['type'] in WKB_GEOMETRY_TYPES:
+        # Writing the WKB directly is much faster than building a shapely geometry.
+        try:
+            return _wkb_body(geometry['type'], geometry['coordinates'])
+        except (ValueError, TypeError, IndexError):
+            pass
+    return shape(geometry).wkb
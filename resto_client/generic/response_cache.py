@@ -0,0 +1,303 @@
+# -*- coding: utf-8 -*-
+"""
+.. admonition:: License
+
+   Copyright 2019 CNES
+
+   Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+   in compliance with the License. You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software distributed under the License
+   is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+   or implied. See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+import json
+import os
+from pathlib import Path
+import sqlite3
+import time
+from typing import Dict, Iterator, Optional  # @NoMove
+import zlib
+
+
+DEFAULT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+"""Default maximum size of the compressed responses kept in a SQLite cache."""
+
+SQLITE_TIMEOUT = 30.
+"""Number of seconds to wait for a lock held by another process on the SQLite cache."""
+
+SQLITE_SCHEMA_VERSION = 2
+"""Version of the SQLite cache tables. Caches with another version are recreated."""
+
+
+class CacheEntry():  # pylint: disable=too-few-public-methods
+    """
+    A response recorded in a cache, with the validators provided by the server for it.
+    """
+
+    def __init__(self, response: dict, expired: bool,
+                 etag: Optional[str]=None, last_modified: Optional[str]=None) -> None:
+        """
+        :param response: the json response
+        :param expired: True if the response must be revalidated before being used
+        :param etag: the ETag header of the response, if any.
+        :param last_modified: the Last-Modified header of the response, if any.
+        """
+        self.response = response
+        self.expired = expired
+        self.etag = etag
+        self.last_modified = last_modified
+
+    @property
+    def revalidable(self) -> bool:
+        """
+        :returns: True if the server provided a validator which can be used to revalidate
+                  this response.
+        """
+        return self.etag is not None or self.last_modified is not None
+
+    @property
+    def conditional_headers(self) -> Dict[str, str]:
+        """
+        :returns: the headers to send for requesting the response only if it has changed.
+        """
+        headers = {}
+        if self.etag is not None:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified is not None:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class ResponseCache(ABC):
+    """
+    Base class for the caches of the json responses of the requests, indexed by keys.
+    """
+
+    def get(self, key: str) -> Optional[dict]:
+        """
+        :param key: the key of the response
+        :returns: the cached response if it exists and has not expired, None otherwise.
+        """
+        entry = self.get_entry(key)
+        if entry is None or entry.expired:
+            return None
+        return entry.response
+
+    @abstractmethod
+    def get_entry(self, key: str) -> Optional[CacheEntry]:
+        """
+        :param key: the key of the response
+        :returns: the cached response if it exists and either has not expired or can be
+                  revalidated, None otherwise.
+        """
+
+    @abstractmethod
+    def put(self, key: str, response: dict, duration: int,
+            etag: Optional[str]=None, last_modified: Optional[str]=None) -> None:
+        """
+        Record a response in the cache.
+
+        :param key: the key of the response
+        :param response: the json response to record
+        :param duration: number of seconds during which the response can be used
+        :param etag: the ETag header of the response, if any.
+        :param last_modified: the Last-Modified header of the response, if any.
+        """
+
+    @abstractmethod
+    def refresh(self, key: str, duration: int) -> None:
+        """
+        Extend the validity of a response, after the server told that it did not change.
+
+        :param key: the key of the response
+        :param duration: number of seconds during which the response can be used from now on
+        """
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """
+        Remove a response from the cache, if it exists.
+
+        :param key: the key of the response
+        """
+
+
+class JsonFileCache(ResponseCache):
+    """
+    Cache recording each response in its own json file in a directory, whose modification time
+    gives the age of the response.
+    """
+
+    def __init__(self, cache_dir: Path) -> None:
+        """
+        :param cache_dir: the directory where the json files are recorded
+        """
+        self.cache_dir = cache_dir
+
+    def _file_name(self, key: str) -> Path:
+        """
+        :param key: the key of the response
+        :returns: the path to the json file holding the response
+        """
+        return self.cache_dir / f'{key}.json'
+
+    def get_entry(self, key: str) -> Optional[CacheEntry]:
+        file_name = self._file_name(key)
+        # Using file modification time to avoid file "tunneling" management on some OS.
+        try:
+            expiration_time = file_name.stat().st_mtime
+            with open(file_name) as json_file:
+                file_content = json.load(json_file)
+        except (FileNotFoundError, ValueError):
+            return None
+        entry = CacheEntry(file_content['response'], expiration_time <= time.time(),
+                           file_content.get('etag'), file_content.get('last_modified'))
+        if entry.expired and not entry.revalidable:
+            self.delete(key)
+            return None
+        return entry
+
+    def put(self, key: str, response: dict, duration: int,
+            etag: Optional[str]=None, last_modified: Optional[str]=None) -> None:
+        file_name = self._file_name(key)
+        file_content = {'etag': etag, 'last_modified': last_modified, 'response': response}
+        # Write a temporary file first, such that concurrent readers never see a partial file.
+        tmp_file_name = file_name.with_name(f'{file_name.name}.{os.getpid()}.tmp')
+        with open(tmp_file_name, 'w') as json_file:
+            json.dump(file_content, json_file, indent=4)
+        self._set_expiration(tmp_file_name, duration)
+        tmp_file_name.replace(file_name)
+
+    def refresh(self, key: str, duration: int) -> None:
+        try:
+            self._set_expiration(self._file_name(key), duration)
+        except FileNotFoundError:
+            # Already removed by a concurrent request
+            pass
+
+    @staticmethod
+    def _set_expiration(file_name: Path, duration: int) -> None:
+        """
+        Record the expiration time of a response in the modification time of its file.
+
+        :param file_name: the file holding the response
+        :param duration: number of seconds during which the response can be used from now on
+        """
+        expiration_time = time.time() + duration
+        os.utime(file_name, (expiration_time, expiration_time))
+
+    def delete(self, key: str) -> None:
+        try:
+            self._file_name(key).unlink()
+        except FileNotFoundError:
+            # Already removed by a concurrent request
+            pass
+
+
+class SQLiteCache(ResponseCache):
+    """
+    Cache recording the responses compressed in a single SQLite database.
+
+    The total size of the compressed responses is bounded: when it is exceeded, the least
+    recently used responses are removed. Expired responses are kept until then when the server
+    provided a validator for them. A connection is opened for each operation and the database is
+    used in WAL mode, such that it can be shared by several threads and processes.
+    """
+
+    def __init__(self, db_path: Path, max_bytes: int=DEFAULT_CACHE_MAX_BYTES) -> None:
+        """
+        :param db_path: the path of the SQLite database file
+        :param max_bytes: the maximum size of the compressed responses kept in the cache
+        """
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        with self._connect() as connection:
+            connection.execute('PRAGMA journal_mode=WAL')
+            schema_version = connection.execute('PRAGMA user_version').fetchone()[0]
+            if schema_version != SQLITE_SCHEMA_VERSION:
+                # Cached responses can always be requested again: drop those of other versions.
+                connection.execute('DROP TABLE IF EXISTS responses')
+                connection.execute('PRAGMA user_version = {}'.format(SQLITE_SCHEMA_VERSION))
+            connection.execute('CREATE TABLE IF NOT EXISTS responses ('
+                               'key TEXT PRIMARY KEY, content BLOB NOT NULL, '
+                               'size INTEGER NOT NULL, expires REAL NOT NULL, '
+                               'accessed REAL NOT NULL, etag TEXT, last_modified TEXT)')
+            connection.execute('CREATE INDEX IF NOT EXISTS responses_accessed '
+                               'ON responses (accessed)')
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """
+        :returns: a context manager providing a connection to the database, committing the
+                  changes on exit and closing the connection.
+        """
+        connection = sqlite3.connect(str(self.db_path), timeout=SQLITE_TIMEOUT)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def get_entry(self, key: str) -> Optional[CacheEntry]:
+        now = time.time()
+        with self._connect() as connection:
+            row = connection.execute('SELECT content, expires, etag, last_modified '
+                                     'FROM responses WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                return None
+            content, expiration_time, etag, last_modified = row
+            expired = expiration_time <= now
+            if expired and etag is None and last_modified is None:
+                connection.execute('DELETE FROM responses WHERE key = ?', (key,))
+                return None
+            connection.execute('UPDATE responses SET accessed = ? WHERE key = ?', (now, key))
+        response = json.loads(zlib.decompress(content).decode('utf-8'))
+        return CacheEntry(response, expired, etag, last_modified)
+
+    def put(self, key: str, response: dict, duration: int,
+            etag: Optional[str]=None, last_modified: Optional[str]=None) -> None:
+        content = zlib.compress(json.dumps(response, separators=(',', ':')).encode('utf-8'))
+        if len(content) > self.max_bytes:
+            return
+        now = time.time()
+        with self._connect() as connection:
+            connection.execute('INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)',
+                               (key, content, len(content), now + duration, now,
+                                etag, last_modified))
+            connection.execute('DELETE FROM responses WHERE expires <= ? '
+                               'AND etag IS NULL AND last_modified IS NULL', (now,))
+            self._evict(connection)
+
+    def refresh(self, key: str, duration: int) -> None:
+        now = time.time()
+        with self._connect() as connection:
+            connection.execute('UPDATE responses SET expires = ?, accessed = ? WHERE key = ?',
+                               (now + duration, now, key))
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        """
+        Remove the least recently used responses until their total size fits the budget.
+
+        :param connection: the connection to the database
+        """
+        total_size = connection.execute('SELECT TOTAL(size) FROM responses').fetchone()[0]
+        if total_size <= self.max_bytes:
+            return
+        rows = connection.execute('SELECT key, size FROM responses ORDER BY accessed')
+        keys_to_delete = []
+        for key, size in rows:
+            if total_size <= self.max_bytes:
+                break
+            keys_to_delete.append((key,))
+            total_size -= size
+        connection.executemany('DELETE FROM responses WHERE key = ?', keys_to_delete)
+
+    def delete(self, key: str) -> None:
+        with self._connect() as connection:
+            connection.execute('DELETE FROM responses WHERE key = ?', (key,))
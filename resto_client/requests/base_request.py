@@ -16,7 +16,7 @@
 """
 from abc import abstractmethod
 from urllib.parse import urljoin
-from typing import Optional, Union, Dict, Callable  # @NoMove @UnusedImport
+from typing import Optional, Union, Dict, Callable, Tuple, TYPE_CHECKING  # @NoMove @UnusedImport
 
 from colorama import Fore, Style, colorama_text
 import requests
@@ -35,6 +35,9 @@ from resto_client.services.base_service import BaseService
 from .authenticator import Authenticator
 
 
+if TYPE_CHECKING:
+    from resto_client.services.authentication_account import AuthorizationDataType  # @UnusedImport
+
 RestoEntities = Union[RestoFeature, RestoCollection, RestoCollections]
 
 RestoRequestResult = Union[RestoEntities, RestoResponse, RestoJsonResponseSimple]
@@ -112,6 +115,13 @@ class BaseRequest(Authenticator):
         """
         return self.parent_service.get_protocol()
 
+    @property
+    def http_session(self) -> requests.Session:
+        """
+        :returns: the HTTP session of the server, shared by all its requests.
+        """
+        return self.parent_service.parent_server.http_session
+
     def get_url(self) -> str:
         """
         :returns: full url for this request
@@ -193,6 +203,31 @@ class BaseRequest(Authenticator):
         response (self._request_result) and return a valid RestoRequestResult.
         """
 
+    def process_response(self, response: requests.Response) -> RestoRequestResult:
+        """
+        Process a response obtained without calling run_request(), e.g. by an asynchronous client.
+
+        :param response: the response to the request, or an object providing the same interface.
+        :returns: an object of one the types defined by RestoRequestResult.
+        """
+        self._request_result = response
+        return self.process_request_result()
+
+    @property
+    def request_headers(self) -> Dict[str, str]:
+        """
+        :returns: the headers to send with this request, once finalize_request() has been called.
+        """
+        return self._request_headers
+
+    def get_authentication_arguments(self) -> \
+            Tuple[Optional[requests.auth.HTTPBasicAuth], Optional['AuthorizationDataType']]:
+        """
+        :returns: the basic HTTP authorization and the authorization data to send with this
+                  request, when it is not authorized by a token.
+        """
+        return self._get_authentication_arguments(self._request_headers)
+
     def _run_request_post(self, stream: bool=False) -> None:
         """
         Create and execute a POST request and store the response content
@@ -200,7 +235,7 @@ class BaseRequest(Authenticator):
         :param stream: If True, only the response header will be retrieved, allowing to drive
                        the retrieval of the full response body within process_request_result()
         """
-        self._do_run_request(requests.post, stream=stream)
+        self._do_run_request(self.http_session.post, stream=stream)
 
     def _run_request_get(self, stream: bool=False) -> None:
         """
@@ -209,13 +244,13 @@ class BaseRequest(Authenticator):
         :param stream: If True, only the response header will be retrieved, allowing to drive
                        the retrieval of the full response body within process_request_result()
         """
-        self._do_run_request(requests.get, stream=stream)
+        self._do_run_request(self.http_session.get, stream=stream)
 
     def _do_run_request(self, method: Callable[..., requests.Response], stream: bool=False) -> None:
         """
         Send the request using the specified method and stores the response content
 
-        :param method: method to use for sending the request: requests.get() or requests.post()
+        :param method: method to use for sending the request: get() or post() of the HTTP session
         :param stream: If True, only the response header will be retrieved, allowing to drive
                        the retrieval of the full response body within process_request_result()
         :raises NetworkAccessDeniedError: if the request was refused because of a forbidden access.
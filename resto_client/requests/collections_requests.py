@@ -14,11 +14,20 @@
    or implied. See the License for the specific language governing permissions and
    limitations under the License.
 """
-from typing import TYPE_CHECKING, cast  # @NoMove
+from typing import Any, Dict, Iterator, List, TYPE_CHECKING, cast  # @NoMove
 
+try:
+    import ijson
+    from ijson.common import ObjectBuilder
+except ImportError:
+    # ijson is an optional dependency, installed with: pip install resto_client[streaming]
+    ijson = None
+
+from resto_client.base_exceptions import IncomprehensibleResponse, RestoResponseError
 from resto_client.entities.resto_collection import RestoCollection
 from resto_client.entities.resto_collections import RestoCollections
 from resto_client.entities.resto_criteria import RestoCriteria
+from resto_client.entities.resto_feature import RestoFeature
 from resto_client.entities.resto_feature_collection import RestoFeatureCollection
 from resto_client.responses.collection_description import CollectionDescription
 from resto_client.responses.collections_description import CollectionsDescription
@@ -31,6 +40,10 @@ if TYPE_CHECKING:
     from resto_client.services.resto_service import RestoService  # @UnusedImport
 
 
+INDEXED_FEATURES_BATCH_SIZE = 100
+"""Number of streamed features recorded at once in the feature index of the server."""
+
+
 class GetCollectionRequest(RestoJsonRequest):
     """
      Request accessing a single collection
@@ -58,14 +71,116 @@ class SearchCollectionRequest(RestoJsonRequest):
         :param collection: collection name
         :param criteria: the criteria to use for the search
         """
+        self.collection_name = collection
+        self.feature_collection_properties: Dict[str, Any] = {}
         super(SearchCollectionRequest, self).__init__(service,
                                                       collection=collection,
                                                       criteria_url=criteria.as_url_str())
 
+    def get_caching_duration(self) -> int:
+        # Search results change as products are ingested: they are cached only when the server
+        # was explicitly configured for it.
+        if not self.use_cache:
+            return 0
+        return self.parent_service.parent_server.search_caching_duration
+
     def run(self) -> RestoFeatureCollection:
         # overidding BaseRequest method, in order to specify the right type returned by this request
         return cast(RestoFeatureCollection, super(SearchCollectionRequest, self).run())
 
+    def process_json_result(self, json_result: dict) -> RestoFeatureCollection:
+        feature_collection = cast(RestoFeatureCollection,
+                                  super(SearchCollectionRequest,
+                                        self).process_json_result(json_result))
+        feature_index = self.parent_service.parent_server.feature_index
+        if feature_index is not None:
+            feature_index.record_features(self.collection_name, feature_collection.resto_features)
+        return feature_collection
+
+    def iter_features(self) -> Iterator[RestoFeature]:
+        """
+        Run the search and iterate over the features found, which are built one after the other
+        while the response is being received when ijson is installed. This avoids holding the
+        whole response and its features in memory. The members of the response other than the
+        features are validated once all the features have been received. Streamed responses are
+        neither recorded in the response cache nor revalidated with the server when they are
+        found expired in it.
+
+        Once the iteration is completed, feature_collection_properties holds the properties of
+        the feature collection, e.g. totalResults.
+
+        :returns: an iterator over the features of the response
+        """
+        cached_entry = self.get_cached_entry()
+        if ijson is None or (cached_entry is not None and not cached_entry.expired):
+            feature_collection = self.run()
+            self.feature_collection_properties = feature_collection.properties
+            yield from feature_collection.resto_features
+            return
+        self.finalize_request()
+        if self.get_method() == 'post':
+            self._run_request_post(stream=True)
+        else:
+            self._run_request_get(stream=True)
+        feature_index = self.parent_service.parent_server.feature_index
+        features_to_index: List[RestoFeature] = []
+        try:
+            self._request_result.raw.decode_content = True
+            for feature in self._parse_features(self._request_result.raw):
+                if feature_index is not None:
+                    features_to_index.append(feature)
+                    if len(features_to_index) == INDEXED_FEATURES_BATCH_SIZE:
+                        feature_index.record_features(self.collection_name, features_to_index)
+                        features_to_index = []
+                yield feature
+        finally:
+            self._request_result.close()
+        if feature_index is not None and features_to_index:
+            feature_index.record_features(self.collection_name, features_to_index)
+
+    def _parse_features(self, stream: Any) -> Iterator[RestoFeature]:
+        """
+        Parse a FeatureCollection geojson document incrementally. The members of the document
+        other than the features are gathered while parsing and validated like the whole response
+        is by run(), once the end of the document is reached.
+
+        :param stream: a file-like object providing the document
+        :returns: an iterator over the features of the document, built as soon as they are parsed.
+        :raises IncomprehensibleResponse: when the document is not a valid FeatureCollection.
+        """
+        msg = 'Response to {} from {} resto server cannot be understood.'
+        # The document without its features, for validating its members.
+        document: Dict[str, Any] = {}
+        builder = None
+        builder_prefix = None
+        member = None
+        try:
+            for prefix, event, value in ijson.parse(stream, use_float=True):
+                if builder is None:
+                    if prefix == '' and event == 'map_key':
+                        member = value
+                    elif prefix == 'features' and event == 'start_array':
+                        document['features'] = []
+                    elif (prefix in (member, 'features.item') and
+                          event in ('start_map', 'start_array')):
+                        builder = ObjectBuilder()
+                        builder_prefix = prefix
+                    elif prefix == member and not event.startswith('end_'):
+                        document[member] = value
+                if builder is not None:
+                    builder.event(event, value)
+                    if prefix == builder_prefix and event in ('end_map', 'end_array'):
+                        if builder_prefix == 'features.item':
+                            yield RestoFeature(builder.value)
+                        else:
+                            document[builder_prefix] = builder.value
+                        builder = None
+            self.resto_response_cls(self, document)
+        except (ijson.JSONError, KeyError, TypeError, RestoResponseError) as excp:
+            raise IncomprehensibleResponse(msg.format(type(self).__name__,
+                                                      self.get_server_name())) from excp
+        self.feature_collection_properties = document['properties']
+
 
 class GetCollectionsRequest(RestoJsonRequest):
     """
@@ -15,19 +15,27 @@
    limitations under the License.
 """
 from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import os
 from pathlib import Path
 import tempfile
+import threading
 from warnings import warn
 
 from typing import Optional, Tuple, Union, TYPE_CHECKING, cast  # @NoMove
 from tqdm import tqdm
 
 from resto_client.base_exceptions import (RestoClientDesignError,
+                                          RestoNetworkError,
                                           RestoResponseError,
                                           FeatureOnTape, LicenseSignatureRequested,
                                           IncomprehensibleResponse,
+                                          InconsistentResponse,
                                           AccessDeniedError)
 from resto_client.entities.resto_feature import RestoFeature
+from resto_client.functions.checksum_utils import (parse_checksum, file_checksum,
+                                                   update_hash_from_file)
 from resto_client.functions.utils import get_file_properties
 from resto_client.responses.download_error_response import DownloadErrorResponse
 from resto_client.responses.sign_license_response import SignLicenseResponse
@@ -35,7 +43,9 @@ from resto_client.services.service_access import RestoClientUnsupportedRequest
 from resto_client.settings.resto_client_config import resto_client_print
 
 from .base_request import BaseRequest
+from .partial_download import PartialDownload
 from .resto_json_request import RestoJsonRequest
+from .stream_writer import StreamWriter, ChunkType
 
 
 if TYPE_CHECKING:
@@ -48,6 +58,16 @@ class RestrictedProductError(AccessDeniedError):
     """
 
 
+class ChecksumMismatchError(InconsistentResponse):
+    """
+    Exception used when a downloaded file does not match the checksum announced by the server
+    """
+
+
+SEGMENTED_DOWNLOAD_MIN_SIZE = 64 * 1024 * 1024
+"""Minimum size of a product for being downloaded by several segments in parallel."""
+
+
 class SignLicenseRequest(RestoJsonRequest):
     """
      Requests for signing a license
@@ -91,13 +111,18 @@ class DownloadRequestBase(BaseRequest):
     def __init__(self,
                  service: 'RestoService',
                  feature: RestoFeature,
-                 download_directory: Path) -> None:
+                 download_directory: Path,
+                 progress_bar: Optional[tqdm] = None) -> None:
         """
         :param service: resto service
         :param  feature: resto feature
         :param download_directory: an existing directory path where download will occur
+        :param progress_bar: a progress bar shared with other downloads, or None for using a
+                             progress bar dedicated to this download.
         """
         self._feature = feature
+        self._progress_bar = progress_bar
+        self._verified: Optional[bool] = None
 
         super(DownloadRequestBase, self).__init__(service=service)
         # product specific initialization
@@ -112,6 +137,13 @@ class DownloadRequestBase(BaseRequest):
         # overidding BaseRequest method, in order to specify the right type returned by this request
         return cast(RestoFeature, super(DownloadRequestBase, self).run())
 
+    @property
+    def block_size(self) -> int:
+        """
+        :returns: the initial size of the blocks read from the network for this download.
+        """
+        return self.parent_service.parent_server.download_block_size
+
     def get_file_infos(self, content_type: str) -> Tuple[str, Path, str, Union[str, None]]:
         """
         Returns filename, full filename, mimetype and encoding according to the content type.
@@ -210,7 +242,8 @@ class DownloadRequestBase(BaseRequest):
             self.download_file(full_file_path)
         # If it's a product
         elif content_type == self._feature.product_mimetype:
-            self.download_file(full_file_path, file_size=self._feature.product_size)
+            self.download_file(full_file_path, file_size=self._feature.product_size,
+                               checksum=self._feature.product_checksum)
         else:
             msg = 'Unexpected content-type {} when downloading {}.'
             raise IncomprehensibleResponse(msg.format(content_type,
@@ -219,26 +252,113 @@ class DownloadRequestBase(BaseRequest):
         # Download finished. Write the file path where download has been made and
         # return updated feature
         self._feature.downloaded_files_paths[self.file_type] = full_file_path
+        self._feature.downloaded_files_verified[self.file_type] = self._verified
         return self._feature
 
-    def download_file(self, file_path: Path, file_size: Optional[int]=None) -> None:
+    def download_file(self, file_path: Path, file_size: Optional[int]=None,
+                      checksum: Optional[str]=None) -> None:
         """
         method called when we know that we have a file to download
-        iterate a result created with GET with stream option and write it directly in a file
+        iterate a result created with GET with stream option and write it into a part file, which
+        is moved to file_path once complete. When a previous download of the same file has been
+        interrupted, it is resumed from where it stopped if the server supports Range requests.
+        When a checksum is provided, the file is hashed while it is written and checked against it.
+
+        :param file_path: path of the file to record
+        :param file_size: expected size of the file, or None to use the response content length.
+        :param checksum: the checksum of the file as provided by the server, or None.
+        :raises RestoNetworkError: when the response ends before the expected size is reached.
+        :raises ChecksumMismatchError: when the downloaded file does not match its checksum.
         """
         resto_client_print('downloading file: {}'.format(file_path))
         # Get and Save the result's size if not given
         if file_size is None:
             file_size = int(self._request_result.headers.get('content-length', 0))
 
-        block_size = 1024
+        partial_download = PartialDownload(file_path, self.get_url(), file_size or None)
+        validator = PartialDownload.get_validator(self._request_result.headers)
+        offset = partial_download.resumable_offset(
+            validator, self._request_result.headers.get('accept-ranges'))
+        if offset > 0:
+            offset = self._resume_request(offset, cast(str, validator))
+        partial_download.write_sidecar(validator)
+
+        parsed_checksum = parse_checksum(checksum)
+        hasher = None
+        if parsed_checksum is not None:
+            hasher = hashlib.new(parsed_checksum[0])
+            if offset > 0:
+                # Resumed download: only the bytes already received are read again.
+                update_hash_from_file(hasher, partial_download.part_path)
+
+        if self._progress_bar is None:
+            progress_bar = tqdm(unit="B", total=file_size, unit_scale=True, desc='Downloading',
+                                initial=offset)
+        else:
+            # Shared progress bar: account for this file in the overall size to download
+            progress_bar = self._progress_bar
+            with progress_bar.get_lock():
+                progress_bar.total += file_size
+                progress_bar.update(offset)
+
+        stream_writer = StreamWriter(self._request_result, self.block_size, progress_bar, hasher)
+        with open(partial_download.part_path, 'ab' if offset > 0 else 'wb') as file_desc:
+            stream_writer.copy(file_desc.write)
+        if self._progress_bar is None:
+            progress_bar.close()
+
+        downloaded_size = partial_download.part_path.stat().st_size
+        content_encoded = 'content-encoding' in self._request_result.headers
+        if file_size and not content_encoded and downloaded_size < file_size:
+            # Keep the part file such that download can be resumed later on.
+            msg = 'Download of {} stopped after {} bytes out of {}.'
+            raise RestoNetworkError(msg.format(file_path.name, downloaded_size, file_size))
+        if hasher is not None and parsed_checksum is not None:
+            if hasher.hexdigest() != parsed_checksum[1]:
+                partial_download.discard()
+                self._withdraw_progress(file_size, downloaded_size)
+                msg = 'Downloaded file {} does not match its {} checksum.'
+                raise ChecksumMismatchError(msg.format(file_path.name, parsed_checksum[0]))
+            self._verified = True
+        partial_download.complete()
+
+    def _withdraw_progress(self, file_size: int, downloaded_size: int) -> None:
+        """
+        Withdraw a discarded file from the shared progress bar, such that it is not accounted
+        twice when its download is restarted.
 
-        with open(file_path, 'wb') as file_desc:
-            # do iteration with progress bar using tqdm
-            progress_bar = tqdm(unit="B", total=file_size, unit_scale=True, desc='Downloading')
-            for block in self._request_result.iter_content(block_size):
-                progress_bar.update(len(block))
-                file_desc.write(block)
+        :param file_size: the size of the file, added to the progress bar total
+        :param downloaded_size: the number of bytes of the file reported in the progress bar
+        """
+        if self._progress_bar is not None:
+            with self._progress_bar.get_lock():
+                self._progress_bar.total -= file_size
+                self._progress_bar.update(-downloaded_size)
+
+    def _resume_request(self, offset: int, validator: str) -> int:
+        """
+        Replace the current response by the response to a Range request starting at some offset.
+
+        :param offset: the offset of the first byte to retrieve
+        :param validator: the ETag or Last-Modified value of the partially downloaded response
+        :returns: the offset at which the new response content starts: the requested offset when
+                  the server honoured the Range request, 0 when it sent the whole file again.
+        """
+        self._request_result.close()
+        range_headers = {'Range': 'bytes={}-'.format(offset), 'If-Range': validator}
+        self.update_headers(range_headers)
+        try:
+            self.run_request()
+            range_honoured = self._request_result.status_code == 206
+        except RestoNetworkError:
+            # Range not satisfiable: the whole file must be downloaded again.
+            range_honoured = False
+            for header in range_headers:
+                del self._request_headers[header]
+            self.run_request()
+        for header in range_headers:
+            self._request_headers.pop(header, None)
+        return offset if range_honoured else 0
 
 
 class DownloadProductRequest(DownloadRequestBase):
@@ -249,6 +369,131 @@ class DownloadProductRequest(DownloadRequestBase):
     filename_suffix = ''
     request_action = 'downloading product'
 
+    def download_file(self, file_path: Path, file_size: Optional[int]=None,
+                      checksum: Optional[str]=None) -> None:
+        """
+        Download the product, splitting it into several byte ranges fetched concurrently when
+        the server parameters request it and the server supports Range requests.
+
+        :param file_path: path of the file to record
+        :param file_size: expected size of the file, or None to use the response content length.
+        :param checksum: the checksum of the file as provided by the server, or None.
+        """
+        headers = self._request_result.headers
+        if file_size is None:
+            file_size = int(headers.get('content-length', 0))
+        nb_segments = self.parent_service.parent_server.download_segments
+        validator = PartialDownload.get_validator(headers)
+        if (nb_segments > 1 and file_size >= SEGMENTED_DOWNLOAD_MIN_SIZE and
+                headers.get('accept-ranges') == 'bytes' and validator is not None and
+                'content-encoding' not in headers):
+            self._download_segmented(file_path, file_size, nb_segments, validator, checksum)
+        else:
+            super(DownloadProductRequest, self).download_file(file_path, file_size, checksum)
+
+    def _download_segmented(self, file_path: Path, file_size: int, nb_segments: int,
+                            validator: str, checksum: Optional[str]) -> None:
+        """
+        Download the product by fetching several byte ranges concurrently, each of them being
+        written in place into a preallocated part file. As segments are received out of order,
+        the product is checked against its checksum by reading it once all of them are received.
+
+        :param file_path: path of the file to record
+        :param file_size: size of the product
+        :param nb_segments: number of byte ranges to download in parallel
+        :param validator: ETag or Last-Modified value of the product response
+        :param checksum: the checksum of the product as provided by the server, or None.
+        :raises ChecksumMismatchError: when the downloaded product does not fit its checksum.
+        """
+        resto_client_print('downloading file: {} in {} segments'.format(file_path, nb_segments))
+        # Segments are retrieved by dedicated requests: release the initial response.
+        self._request_result.close()
+        partial_download = PartialDownload(file_path, self.get_url(), file_size)
+        partial_download.write_sidecar(validator, mode='segmented')
+        with open(partial_download.part_path, 'wb') as part_file:
+            part_file.truncate(file_size)
+
+        segment_size = -(-file_size // nb_segments)
+        segments = [(start, min(start + segment_size, file_size) - 1)
+                    for start in range(0, file_size, segment_size)]
+
+        if self._progress_bar is None:
+            progress_bar = tqdm(unit="B", total=file_size, unit_scale=True, desc='Downloading')
+        else:
+            progress_bar = self._progress_bar
+            with progress_bar.get_lock():
+                progress_bar.total += file_size
+                progress_bar.refresh()
+
+        part_fd = os.open(partial_download.part_path, os.O_WRONLY | getattr(os, 'O_BINARY', 0))
+        write_lock = threading.Lock()
+        try:
+            with ThreadPoolExecutor(max_workers=nb_segments) as executor:
+                futures = [executor.submit(self._download_segment, part_fd, write_lock,
+                                           segment, validator, progress_bar)
+                           for segment in segments]
+                for future in futures:
+                    future.result()
+        finally:
+            os.close(part_fd)
+            if self._progress_bar is None:
+                progress_bar.close()
+
+        parsed_checksum = parse_checksum(checksum)
+        if parsed_checksum is not None:
+            algorithm, expected_digest = parsed_checksum
+            if file_checksum(partial_download.part_path, algorithm) != expected_digest:
+                partial_download.discard()
+                self._withdraw_progress(file_size, file_size)
+                msg = 'Downloaded product {} does not match its {} checksum.'
+                raise ChecksumMismatchError(msg.format(self._feature.product_identifier,
+                                                       algorithm))
+            self._verified = True
+        partial_download.complete()
+
+    def _download_segment(self, part_fd: int, write_lock: threading.Lock,
+                          segment: Tuple[int, int], validator: str, progress_bar: tqdm) -> None:
+        """
+        Download a byte range of the product and write it at its offset in the part file.
+
+        :param part_fd: OS level descriptor of the part file opened for writing
+        :param write_lock: lock protecting seek and write when os.pwrite is unavailable
+        :param segment: first and last bytes of the range to download
+        :param validator: ETag or Last-Modified value of the product response
+        :param progress_bar: the progress bar to update
+        :raises RestoNetworkError: when the server does not return the requested range.
+        """
+        headers = dict(self._request_headers)
+        headers.update({'Range': 'bytes={}-{}'.format(*segment), 'If-Range': validator})
+        auth_arg, data_arg = self._get_authentication_arguments(headers)
+        with self.http_session.get(self.get_url(), headers=headers, stream=True,
+                                   auth=auth_arg, data=data_arg) as response:
+            if response.status_code != 206:
+                msg = 'Error {} when {} segment {}-{} for {}.'
+                raise RestoNetworkError(msg.format(response.status_code, self.request_action,
+                                                   segment[0], segment[1], self.get_url()))
+            offset = segment[0]
+
+            def _write_block(block: ChunkType) -> None:
+                """
+                Write a block at the current offset in the part file.
+
+                :param block: the block to write
+                """
+                nonlocal offset
+                if hasattr(os, 'pwrite'):
+                    os.pwrite(part_fd, block, offset)
+                else:
+                    with write_lock:
+                        os.lseek(part_fd, offset, os.SEEK_SET)
+                        os.write(part_fd, block)
+                offset += len(block)
+
+            StreamWriter(response, self.block_size, progress_bar).copy(_write_block)
+        if offset != segment[1] + 1:
+            msg = 'Segment {}-{} of {} stopped at byte {}.'
+            raise RestoNetworkError(msg.format(segment[0], segment[1], self.get_url(), offset))
+
 
 class DownloadQuicklookRequest(DownloadRequestBase):
     """
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+.. admonition:: License
+
+   Copyright 2019 CNES
+
+   Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+   in compliance with the License. You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software distributed under the License
+   is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+   or implied. See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+import json
+from pathlib import Path
+from typing import Optional, Dict  # @NoMove
+
+from requests.structures import CaseInsensitiveDict
+
+
+PART_SUFFIX = '.part'
+SIDECAR_SUFFIX = '.json'
+
+
+class PartialDownload():
+    """
+    Class managing a file being downloaded: the bytes are written into a '.part' file next to
+    the final file, and a small json sidecar records the URL, the expected size and the
+    validator (ETag or Last-Modified) of the response, such that an interrupted download can be
+    resumed later on with an HTTP Range request.
+    """
+
+    def __init__(self, file_path: Path, url: str, file_size: Optional[int]=None) -> None:
+        """
+        :param file_path: the path of the file once its download will be completed
+        :param url: the URL from which the file is downloaded
+        :param file_size: the expected size of the file, or None if unknown
+        """
+        self.file_path = file_path
+        self.url = url
+        self.file_size = file_size
+        self.part_path = file_path.with_name(file_path.name + PART_SUFFIX)
+        self.sidecar_path = self.part_path.with_name(self.part_path.name + SIDECAR_SUFFIX)
+
+    @staticmethod
+    def get_validator(headers: CaseInsensitiveDict) -> Optional[str]:
+        """
+        :param headers: the headers of an HTTP response
+        :returns: the value which can be used in an If-Range header for this response, or None
+                  if the response provides neither an ETag nor a Last-Modified header.
+        """
+        return headers.get('etag', headers.get('last-modified'))
+
+    def _read_sidecar(self) -> Dict[str, Optional[object]]:
+        """
+        :returns: the content of the sidecar file or an empty dictionary if it cannot be read.
+        """
+        try:
+            with open(self.sidecar_path) as sidecar_file:
+                return json.load(sidecar_file)
+        except (OSError, ValueError):
+            return {}
+
+    def write_sidecar(self, validator: Optional[str], mode: str='sequential') -> None:
+        """
+        Record the characteristics of the download in the sidecar file.
+
+        :param validator: ETag or Last-Modified value of the response being downloaded.
+        :param mode: the way the part file is written. Only 'sequential' part files can be resumed.
+        """
+        sidecar = {'url': self.url, 'size': self.file_size, 'validator': validator, 'mode': mode}
+        with open(self.sidecar_path, 'w') as sidecar_file:
+            json.dump(sidecar, sidecar_file)
+
+    def resumable_offset(self, validator: Optional[str], accept_ranges: Optional[str]) -> int:
+        """
+        Compute the offset from which the download can be resumed.
+
+        :param validator: ETag or Last-Modified value of the response received from the server.
+        :param accept_ranges: the Accept-Ranges header of the response received from the server.
+        :returns: the number of bytes already downloaded which can be kept, 0 if the download
+                  must start from the beginning.
+        """
+        if accept_ranges != 'bytes' or validator is None or not self.part_path.is_file():
+            return 0
+        sidecar = self._read_sidecar()
+        if (sidecar.get('url') != self.url or sidecar.get('validator') != validator or
+                sidecar.get('size') != self.file_size or sidecar.get('mode') != 'sequential'):
+            return 0
+        offset = self.part_path.stat().st_size
+        if self.file_size is not None and offset >= self.file_size:
+            return 0
+        return offset
+
+    def complete(self) -> None:
+        """
+        Move the part file to its final location and remove the sidecar file.
+        """
+        self.part_path.replace(self.file_path)
+        self.discard_sidecar()
+
+    def discard(self) -> None:
+        """
+        Remove the part file and its sidecar.
+        """
+        if self.part_path.exists():
+            self.part_path.unlink()
+        self.discard_sidecar()
+
+    def discard_sidecar(self) -> None:
+        """
+        Remove the sidecar file, if it exists.
+        """
+        if self.sidecar_path.exists():
+            self.sidecar_path.unlink()
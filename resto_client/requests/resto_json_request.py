@@ -15,14 +15,12 @@
    limitations under the License.
 """
 from abc import abstractmethod
-from datetime import datetime, timedelta
-import json
-from pathlib import Path
+import hashlib
 from typing import Type, Optional
 
 from resto_client.base_exceptions import (RestoResponseError, IncomprehensibleResponse)
+from resto_client.generic.response_cache import CacheEntry, ResponseCache
 from resto_client.responses.resto_json_response import RestoJsonResponse
-from resto_client.settings.resto_client_config import RESTO_CLIENT_CONFIG_DIR
 
 from .base_request import BaseRequest, RestoRequestResult
 
@@ -31,8 +29,18 @@ class RestoJsonRequest(BaseRequest):
     """
      Base class for requests able to provide a RestoJsonResponse with associated as_resto_object()
      method. Response caching can be enabled client class by client class, by specifying a positive
-     number of caching seconds.
+     number of caching seconds. Cached responses are keyed by the method, the URL and the account
+     used by the request, such that different queries of the same class have their own entry.
+     Once expired, a cached response which came with an ETag or a Last-Modified header is
+     revalidated with a conditional request, and used again if the server answers 304.
     """
+
+    use_cache = True
+    """Set to False on a request instance to bypass the cache, e.g. to get up to date results."""
+
+    _cached_entry: Optional[CacheEntry] = None
+    _json_result: Optional[dict] = None
+
     @property  # type:ignore
     @abstractmethod
     def resto_response_cls(self) -> Type[RestoJsonResponse]:
@@ -44,59 +52,86 @@ class RestoJsonRequest(BaseRequest):
         """
         :returns: The caching duration to be used for caching this request's result
         """
+        if not self.use_cache:
+            return 0
         return self.parent_service.service_access.get_caching_duration(self)
 
     @property
-    def cache_file_name(self) -> Path:
-        """
-        :returns: the path to a file containing the cached json response.
-        """
-        cache_dir = self.parent_service.parent_server.ensure_server_directory(
-            RESTO_CLIENT_CONFIG_DIR)
-        return cache_dir / f'{self.__class__.__name__}_result.json'
-
-    def get_cached_response(self) -> Optional[dict]:
-        """
-        :returns: the cached response as a dictionary if the cached response has not expired, None
-                  otherwise.
-        """
-        cached_response = None
-        # if caching is enabled for this request and cached file exists
-        if self.get_caching_duration() > 0 and self.cache_file_name.exists():
-            # Using file modification time to avoid file "tunneling" management on some OS.
-            cache_file_modif_time = datetime.fromtimestamp(self.cache_file_name.stat().st_mtime)
-            cache_file_age = datetime.now() - cache_file_modif_time
-            if cache_file_age < timedelta(seconds=self.get_caching_duration()):
-                if self.debug:
-                    print(f'Using cached response for {self.__class__.__name__}')
-                with open(self.cache_file_name) as json_file:
-                    cached_response = json.load(json_file)
-            else:
-                if self.debug:
-                    print('removing too old cached file')
-                self.cache_file_name.unlink()
-        return cached_response
+    def cache_key(self) -> str:
+        """
+        :returns: a digest of the method, the URL and the account used by this request, which
+                  identifies its response in the cache.
+        """
+        auth_identity = ''
+        if not self._anonymous_request and self.auth_service.username is not None:
+            auth_identity = self.auth_service.username
+        key_items = [self.get_method(), self.get_url(), auth_identity]
+        return hashlib.sha256('\n'.join(key_items).encode('utf-8')).hexdigest()
+
+    def get_cached_entry(self) -> Optional[CacheEntry]:
+        """
+        :returns: the cached response of this request, if caching is enabled and the cached
+                  response has not expired or can be revalidated, None otherwise.
+        """
+        if self.get_caching_duration() <= 0:
+            return None
+        return self.response_cache.get_entry(self.cache_entry_key)
 
     def set_cached_response(self) -> None:
         """
-        When cache is enabled, records the current request response json content in the cache file.
+        When cache is enabled, records the json content of the current request response, as
+        decoded when it was processed, in the cache, with its validators if the server provided
+        some. Nothing is done when the server answered that the cached response is still valid,
+        as it has already been refreshed.
         """
-        if self.get_caching_duration() > 0:  # if caching is enabled for this request
-            json_response = self._request_result.json()
-            with open(self.cache_file_name, 'w') as json_file:
-                json.dump(json_response, json_file, indent=4)
+        caching_duration = self.get_caching_duration()
+        # if caching is enabled for this request and a new response was received
+        if caching_duration > 0 and self._json_result is not None:
+            headers = self._request_result.headers
+            self.response_cache.put(self.cache_entry_key, self._json_result,
+                                    caching_duration, etag=headers.get('etag'),
+                                    last_modified=headers.get('last-modified'))
+
+    @property
+    def cache_entry_key(self) -> str:
+        """
+        :returns: the key of this request response in the cache.
+        """
+        return f'{self.__class__.__name__}_{self.cache_key}'
+
+    @property
+    def response_cache(self) -> ResponseCache:
+        """
+        :returns: the cache where the responses of the server requests are recorded.
+        """
+        return self.parent_service.parent_server.response_cache
 
     def run(self) -> RestoRequestResult:
-        cached_response = self.get_cached_response()
-        if cached_response is not None:
-            resto_object = self.process_json_result(cached_response)
-        else:
-            resto_object = super(RestoJsonRequest, self).run()
-            self.set_cached_response()
+        self._cached_entry = self.get_cached_entry()
+        if self._cached_entry is not None and not self._cached_entry.expired:
+            if self.debug:
+                print(f'Using cached response for {self.__class__.__name__}')
+            return self.process_json_result(self._cached_entry.response)
+        resto_object = super(RestoJsonRequest, self).run()
+        self.set_cached_response()
         return resto_object
 
+    def finalize_request(self) -> None:
+        super(RestoJsonRequest, self).finalize_request()
+        if self._cached_entry is not None:
+            # Expired response: ask the server to send it only if it has changed.
+            self.update_headers(self._cached_entry.conditional_headers)
+
     def process_request_result(self) -> RestoRequestResult:
-        return self.process_json_result(self._request_result.json())
+        self._json_result = None
+        if self._request_result.status_code == 304 and self._cached_entry is not None:
+            if self.debug:
+                print(f'Cached response for {self.__class__.__name__} is still valid')
+            self.response_cache.refresh(self.cache_entry_key, self.get_caching_duration())
+            return self.process_json_result(self._cached_entry.response)
+        # Keep the decoded response, such that it is not decoded again when put in the cache.
+        self._json_result = self._request_result.json()
+        return self.process_json_result(self._json_result)
 
     # TOSO: think about putting this method into RestoRequest, to be available to all subclasses
     def process_json_result(self, json_result: dict) -> RestoRequestResult:
@@ -112,6 +147,6 @@ class RestoJsonRequest(BaseRequest):
         except RestoResponseError:
             msg = 'Response to {} from {} resto server cannot be understood.'
             # TOOD: move elsewhere ?
-            raise IncomprehensibleResponse(msg.format(self.get_server_name()))
+            raise IncomprehensibleResponse(msg.format(type(self).__name__, self.get_server_name()))
 
         return resto_response.as_resto_object()
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+.. admonition:: License
+
+   Copyright 2019 CNES
+
+   Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+   in compliance with the License. You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software distributed under the License
+   is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+   or implied. See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+import time
+from typing import Any, Callable, Optional, Union  # @NoMove
+
+import requests
+from requests.exceptions import ChunkedEncodingError, ConnectionError as RequestsConnectionError
+from tqdm import tqdm
+from urllib3.exceptions import ProtocolError, ReadTimeoutError
+
+
+DEFAULT_DOWNLOAD_BLOCK_SIZE = 1024 * 1024
+"""Initial size of the blocks read from the network when downloading a file."""
+
+MAX_BLOCK_SIZE_FACTOR = 8
+"""The block size may grow up to this factor times its initial value on fast links."""
+
+PROGRESS_REFRESH_INTERVAL = 0.5
+"""Minimum number of seconds between two updates of the progress bar."""
+
+ChunkType = Union[bytes, memoryview]
+
+
+class StreamWriter():
+    """
+    Class copying the body of a streamed response to a sink, block after block.
+
+    Blocks are read from the raw response into a single reusable buffer, whose used size grows
+    while the network keeps filling it completely, and the progress bar is updated at a fixed
+    rate instead of once per block. Responses with a Content-Encoding must be decoded and are
+    read through requests.Response.iter_content() instead. When a hash object is provided, it
+    is updated with each block while it is written, which avoids reading the file again.
+    """
+
+    def __init__(self,
+                 response: requests.Response,
+                 block_size: int=DEFAULT_DOWNLOAD_BLOCK_SIZE,
+                 progress_bar: Optional[tqdm]=None,
+                 hasher: Optional[Any]=None) -> None:
+        """
+        :param response: a response obtained with the stream option
+        :param block_size: initial size of the blocks read from the response
+        :param progress_bar: progress bar to update with the number of bytes read, if any.
+        :param hasher: hash object, as returned by hashlib.new(), to update with the body, if any.
+        """
+        self._response = response
+        self._hasher = hasher
+        self._block_size = block_size
+        self._max_block_size = block_size * MAX_BLOCK_SIZE_FACTOR
+        self._progress_bar = progress_bar
+        self._pending_progress = 0
+        self._last_refresh = time.monotonic()
+
+    def copy(self, write: Callable[[ChunkType], object]) -> int:
+        """
+        Copy the whole response body to a sink.
+
+        :param write: function receiving each block of the body. The block is only valid during
+                      the call, as its buffer is reused for the next block.
+        :returns: the number of bytes copied.
+        :raises ChunkedEncodingError: when the connection is broken while reading the body.
+        :raises RequestsConnectionError: when reading the body times out.
+        """
+        nb_bytes = 0
+        if 'content-encoding' in self._response.headers:
+            for block in self._response.iter_content(self._max_block_size):
+                write(block)
+                if self._hasher is not None:
+                    self._hasher.update(block)
+                nb_bytes += len(block)
+                self._update_progress(len(block))
+        else:
+            buffer = memoryview(bytearray(self._max_block_size))
+            block_size = self._block_size
+            while True:
+                # Translate urllib3 exceptions like requests.Response.iter_content() does.
+                try:
+                    nb_read = self._response.raw.readinto(buffer[:block_size])
+                except ProtocolError as excp:
+                    raise ChunkedEncodingError(excp)
+                except ReadTimeoutError as excp:
+                    raise RequestsConnectionError(excp)
+                if not nb_read:
+                    break
+                write(buffer[:nb_read])
+                if self._hasher is not None:
+                    self._hasher.update(buffer[:nb_read])
+                nb_bytes += nb_read
+                self._update_progress(nb_read)
+                if nb_read == block_size and block_size < self._max_block_size:
+                    block_size = min(2 * block_size, self._max_block_size)
+        self._update_progress(0, force=True)
+        return nb_bytes
+
+    def _update_progress(self, nb_bytes: int, force: bool=False) -> None:
+        """
+        Record some bytes read and update the progress bar if the refresh interval has elapsed.
+
+        :param nb_bytes: number of bytes read since last call
+        :param force: if True the progress bar is updated whatever the elapsed time.
+        """
+        if self._progress_bar is None:
+            return
+        self._pending_progress += nb_bytes
+        now = time.monotonic()
+        if force or now - self._last_refresh >= PROGRESS_REFRESH_INTERVAL:
+            with self._progress_bar.get_lock():
+                self._progress_bar.update(self._pending_progress)
+            self._pending_progress = 0
+            self._last_refresh = now
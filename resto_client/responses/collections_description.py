@@ -14,7 +14,6 @@
    or implied. See the License for the specific language governing permissions and
    limitations under the License.
 """
-import copy
 from typing import Optional, Union
 
 from resto_client.base_exceptions import (InconsistentResponse,
@@ -36,16 +35,16 @@ def rebuild_os_description(opensearch_description: Union[dict, None]) -> Optiona
     If osDescription is multi-lingual, retain only one language, preferably english
 
     :param opensearch_description: the osDescription field to process (possibly None)
-    :returns: osDescription english fields
+    :returns: osDescription english fields, sharing their structure with opensearch_description.
     """
     normalized_osdescription = None
     if opensearch_description is not None:
         if any([os_key in opensearch_description for os_key in OSDESCRIPTION_KEYS]):
-            normalized_osdescription = copy.deepcopy(opensearch_description)
+            normalized_osdescription = opensearch_description
         elif 'en' in opensearch_description:
-            normalized_osdescription = copy.deepcopy(opensearch_description['en'])
+            normalized_osdescription = opensearch_description['en']
         elif 'fr' in opensearch_description:
-            normalized_osdescription = copy.deepcopy(opensearch_description['fr'])
+            normalized_osdescription = opensearch_description['fr']
 
     return normalized_osdescription
 
@@ -100,38 +99,35 @@ class CollectionsDescription(RestoJsonResponse):
     def normalize_response(self) -> None:
         """
         Normalize the original response in a response whose structure does not depend on the server.
+
+        The original response is not modified: the normalized response is made of new containers
+        for the modified fields, sharing the unmodified structures with the original response.
         """
-        result = None
         if self.detected_protocol == 'theia_version':
-            result = copy.deepcopy(self._original_response)
+            synthesis = dict(self._original_response['synthesis'])
+            statistics = dict(synthesis['statistics'])
         elif self.detected_protocol == 'peps_version':
-            result = {'collections': self._original_response['collections'],
-                      'synthesis': {'name': '*',
-                                    'osDescription': None,
-                                    'statistics': self._original_response['statistics']}
-                      }
+            synthesis = {'name': '*', 'osDescription': None}
+            statistics = dict(self._original_response['statistics'])
         else:
-            result = {'collections': self._original_response['collections'],
-                      'synthesis': {'name': '*',
-                                    'osDescription': None,
-                                    'statistics': {'count': 0,
-                                                   'facets': self._original_response['statistics']}}
-                      }
+            synthesis = {'name': '*', 'osDescription': None}
+            statistics = {'count': 0, 'facets': self._original_response['statistics']}
         # Update synthesis fields
         # Correct synthesis statistics count
         count = 0
-        if 'collection' in result['synthesis']['statistics']['facets']:
-            count = counting_stats(result['synthesis']['statistics']['facets']['collection'])
-        result['synthesis']['statistics']['count'] = count
+        if 'collection' in statistics['facets']:
+            count = counting_stats(statistics['facets']['collection'])
+        statistics['count'] = count
+        synthesis['statistics'] = statistics
         # rebuild an osDescription for synthesis
-        os_description = rebuild_os_description(result['synthesis']['osDescription'])
-        result['synthesis']['osDescription'] = os_description
+        synthesis['osDescription'] = rebuild_os_description(synthesis['osDescription'])
 
         # rebuild osDescription for each collection
-        for collection in result['collections']:
-            collection['osDescription'] = rebuild_os_description(collection['osDescription'])
+        collections = [dict(collection,
+                            osDescription=rebuild_os_description(collection['osDescription']))
+                       for collection in self._original_response['collections']]
 
-        self._normalized_response = result
+        self._normalized_response = {'collections': collections, 'synthesis': synthesis}
 
     def as_resto_object(self) -> RestoCollections:
         """
@@ -15,7 +15,6 @@
    limitations under the License.
 """
 from abc import abstractmethod
-import copy
 from typing import Dict, List, Any, Optional, TYPE_CHECKING  # @UnusedImport
 import warnings
 
@@ -58,9 +57,11 @@ class RestoJsonResponse(RestoResponse):
         """
         Returns a normalized response whose structure does not depend on the server.
 
-        This method should be overidden by client classes. Default is to copy the original response.
+        This method should be overidden by client classes. Default is a shallow copy of the
+        original response: its fields can be replaced, but the structures they contain are shared
+        with the original response and must be copied before being modified.
         """
-        self._normalized_response = copy.deepcopy(self._original_response)
+        self._normalized_response = dict(self._original_response)
 
     @abstractmethod
     def as_resto_object(self) -> Any:
@@ -104,11 +105,11 @@ class RestoJsonResponseSimple(RestoJsonResponse):
 
         # Then check that no other entries than those defined as needed or optional
         # are contained in the response. Issue a warning if not when in debug mode.
-        response = copy.deepcopy(self._original_response)
-        for field in self.needed_fields:
-            response.pop(field)
-        for field in self.optional_fields:
-            response.pop(field, None)
-        if response.keys() and self._parent_request.debug:  # type: ignore
-            msg = '{} response contains unknown entries: {}.'
-            warnings.warn(msg.format(self.request_name, response))
+        if self._parent_request.debug:  # type: ignore
+            unknown_fields = (self._original_response.keys() - set(self.needed_fields) -
+                              set(self.optional_fields))
+            if unknown_fields:
+                msg = '{} response contains unknown entries: {}.'
+                warnings.warn(msg.format(self.request_name,
+                                         {field: self._original_response[field]
+                                          for field in unknown_fields}))
@@ -0,0 +1,485 @@
+# -*- coding: utf-8 -*-
+"""
+.. admonition:: License
+
+   Copyright 2019 CNES
+
+   Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+   in compliance with the License. You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software distributed under the License
+   is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+   or implied. See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+import asyncio
+from functools import partial
+import hashlib
+import io
+import json
+from pathlib import Path
+from typing import (Any, BinaryIO, Callable, Dict, List, Optional, Tuple, TypeVar,
+                    Union, cast)  # @NoMove
+
+from requests.structures import CaseInsensitiveDict
+
+# aiohttp is an optional dependency, installed with: pip install resto_client[async]
+try:
+    import aiohttp
+    HAS_AIOHTTP = True
+except ImportError:
+    HAS_AIOHTTP = False
+
+from resto_client.base_exceptions import (RestoClientDesignError, RestoClientEmulatedResponse,
+                                          RestoNetworkError, NetworkAccessDeniedError)
+from resto_client.entities.resto_criteria import RestoCriteria
+from resto_client.entities.resto_feature import RestoFeature
+from resto_client.entities.resto_feature_collection import RestoFeatureCollection
+from resto_client.functions.checksum_utils import parse_checksum, update_hash_from_file
+from resto_client.requests.base_request import BaseRequest, RestoRequestResult
+from resto_client.requests.collections_requests import SearchCollectionRequest
+from resto_client.requests.features_requests import ChecksumMismatchError, DownloadRequestBase
+from resto_client.requests.partial_download import PartialDownload
+from resto_client.requests.resto_json_request import RestoJsonRequest
+
+from .resto_server import RestoServer
+from .resto_service import RestoService
+
+
+DEFAULT_MAX_CONNECTIONS = 100
+"""Default maximum number of simultaneous connections opened by an AsyncRestoServer."""
+
+ResultType = TypeVar('ResultType')
+
+
+class ResponseAdapter():
+    """
+    Object providing the part of the requests.Response interface used when processing the
+    response of a request, for a response whose body has been read by aiohttp. This allows
+    reusing the processing of the responses made by the requests classes.
+    """
+
+    def __init__(self, status_code: int, headers: Dict[str, str], content: bytes,
+                 url: str) -> None:
+        """
+        :param status_code: the HTTP status of the response
+        :param headers: the headers of the response
+        :param content: the body of the response, already decoded if it had a Content-Encoding.
+        :param url: the URL of the response
+        """
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers)
+        # The body is already decoded and fully received: it needs neither decoding nor resuming.
+        self.headers.pop('content-encoding', None)
+        self.headers.pop('accept-ranges', None)
+        self.content = content
+        self.url = url
+        self.raw = io.BytesIO(content)
+
+    @property
+    def text(self) -> str:
+        """
+        :returns: the body of the response as text
+        """
+        return self.content.decode('utf-8', errors='replace')
+
+    def json(self) -> Any:
+        """
+        :returns: the body of the response decoded as json
+        """
+        return json.loads(self.content.decode('utf-8'))
+
+    def close(self) -> None:
+        """
+        Release the body of the response.
+        """
+        self.raw.close()
+
+
+class AsyncRestoServer():
+    """
+    A Resto Server accessed through asyncio, which allows running many operations concurrently
+    from a single thread.
+
+    It relies on a RestoServer for the routes, the criteria, the credentials and the processing
+    of the responses, but sends the requests with aiohttp. Retrieving a token or the collections
+    of the server is done once, in the default executor of the event loop.
+    """
+
+    def __init__(self,
+                 server_name: str,
+                 current_collection: Optional[str] = None,
+                 username: Optional[str] = None,
+                 password: Optional[str] = None,
+                 token: Optional[str] = None,
+                 debug_server: bool = False,
+                 max_connections: int = DEFAULT_MAX_CONNECTIONS,
+                 check_collection: bool = True) -> None:
+        """
+        :param server_name: the name of the server to use in the database
+        :param current_collection: name of the collection to use
+        :param username: account to use on this server
+        :param password: account password on the server
+        :param token: an existing token associated to this account (will be checked prior its use)
+        :param debug_server: When True debugging information on server and requests is printed out.
+        :param max_connections: maximum number of simultaneous connections to the server.
+        :param check_collection: when False, current_collection is used without checking that it
+                                 exists on the server, which saves retrieving the collections.
+        :raises ImportError: when aiohttp is not installed.
+        """
+        if not HAS_AIOHTTP:
+            raise ImportError('AsyncRestoServer requires aiohttp: pip install resto_client[async]')
+        self._server = RestoServer(server_name, current_collection=current_collection,
+                                   username=username, password=password, token=token,
+                                   debug_server=debug_server, check_collection=check_collection)
+        self.max_connections = max_connections
+        self._http_session: Optional[aiohttp.ClientSession] = None
+
+    async def __aenter__(self) -> 'AsyncRestoServer':
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.close()
+
+    @property
+    def server(self) -> RestoServer:
+        """
+        :returns: the synchronous server used for everything but sending the requests.
+        """
+        return self._server
+
+    @property
+    def http_session(self) -> 'aiohttp.ClientSession':
+        """
+        :returns: the aiohttp session shared by all the requests, created on first use.
+        """
+        if self._http_session is None:
+            connector = aiohttp.TCPConnector(limit=self.max_connections)
+            self._http_session = aiohttp.ClientSession(connector=connector)
+        return self._http_session
+
+    async def close(self) -> None:
+        """
+        Close the connections opened by this server.
+        """
+        if self._http_session is not None:
+            await self._http_session.close()
+            self._http_session = None
+        self._server.close()
+
+# +++++++++++++++++++++++ credentials section ++++++++++++++++++++++++++++++++++++
+
+    def set_credentials(self,
+                        username: Optional[str]=None,
+                        password: Optional[str]=None,
+                        token_value: Optional[str]=None) -> None:
+        """
+        Set the credentials to be used by the authentication service.
+
+        :param username: name of the account on the server
+        :param password: account password
+        :param token_value: a token associated to these credentials
+        """
+        self._server.set_credentials(username=username, password=password,
+                                     token_value=token_value)
+
+    async def get_token(self) -> str:
+        """
+        :returns: the current token, retrieved from the server if there is none.
+        """
+        auth_service = self._server.authentication_service
+        return await self._run_in_executor(lambda: auth_service.token_value)
+
+    async def reset_credentials(self) -> None:
+        """
+        Reset the credentials, revoking the current token if any.
+        """
+        await self._run_in_executor(self._server.reset_credentials)
+
+# +++++++++++++++++++++++ resto service section ++++++++++++++++++++++++++++++++++++
+
+    async def search_by_criteria(self, criteria: Dict[str, Any],
+                                 collection_name: Optional[str] = None) -> RestoFeatureCollection:
+        """
+        Search a collection using search criteria
+
+        :param criteria: searching criteria
+        :param collection_name: name of the collection to use. Default to the current collection.
+        :returns: a collection of resto features
+        """
+        resto_service = self._server.resto_service
+        collection = await self._run_in_executor(resto_service.ensure_collection, collection_name)
+        resto_criteria = RestoCriteria(resto_service.get_protocol(), **criteria)
+        search_request = SearchCollectionRequest(resto_service, collection, criteria=resto_criteria)
+        return cast(RestoFeatureCollection, await self._run(search_request))
+
+    async def get_feature_by_id(self, feature_id: str,
+                                collection_name: Optional[str] = None) -> RestoFeature:
+        """
+        Get a feature from a collection using its identifier.
+
+        :param feature_id: the feature id (not uuid) to search for
+        :param collection_name: name of the collection to use. Default to the current collection.
+        :returns: the requested feature
+        """
+        feature_collection = await self.search_by_criteria({'identifier': feature_id},
+                                                           collection_name)
+        return RestoService.select_feature(feature_collection, feature_id)
+
+    async def get_features_from_ids(self, features_ids: Union[str, List[str]],
+                                    collection_name: Optional[str] = None) -> List[RestoFeature]:
+        """
+        Get a list of resto features retrieved by their identifiers, concurrently.
+
+        :param features_ids: Feature(s) identifier(s)
+        :param collection_name: name of the collection to use. Default to the current collection.
+        :returns: a list of Resto features, in the order of the identifiers.
+        """
+        if not isinstance(features_ids, list):
+            features_ids = [features_ids]
+        return list(await asyncio.gather(*[self.get_feature_by_id(feature_id, collection_name)
+                                           for feature_id in features_ids]))
+
+    async def download_feature_file(self, feature: RestoFeature,
+                                    file_type: str, download_dir: Path) -> Path:
+        """
+        Download one of the files associated to a feature : product, quicklook, thumbnail, annexes.
+
+        Products are streamed to disk and checked against their checksum while being received.
+        Unlike RestoServer, license signature and tape staging are not handled automatically:
+        the corresponding LicenseSignatureRequested and FeatureOnTape events are raised.
+
+        :param feature: a resto feature
+        :param file_type: type of file to download: product, quicklook, thumbnail or annexes
+        :param download_dir: the path to the directory where download must be done.
+        :returns: the path of the downloaded file
+        :raises RestoClientDesignError: when the file_type is not supported.
+        """
+        resto_service = self._server.resto_service
+        if file_type not in resto_service.DOWNLOAD_REQUEST_CLASSES:
+            msg = 'Unexpected file to download : {} can be {}'
+            raise RestoClientDesignError(msg.format(file_type,
+                                                    resto_service.DOWNLOAD_REQUEST_CLASSES.keys()))
+        download_req_cls = resto_service.DOWNLOAD_REQUEST_CLASSES[file_type]
+        download_request = download_req_cls(resto_service, feature, download_directory=download_dir)
+        await self._finalize_request(download_request)
+        response = await self._send_request(download_request)
+        try:
+            content_type = response.headers.get('content-type')
+            if (file_type == 'product' and content_type is not None and
+                    content_type == feature.product_mimetype):
+                _, file_path, _, _ = download_request.get_file_infos(content_type)
+                verified = await self._stream_product(response, download_request, feature,
+                                                      file_path)
+                feature.downloaded_files_paths[file_type] = file_path
+                feature.downloaded_files_verified[file_type] = verified
+            else:
+                # Errors, small files and products on tape are processed like RestoServer does.
+                response_adapter = await self._read_response(response, download_request)
+                await self._run_in_executor(download_request.process_response, response_adapter)
+        finally:
+            response.release()
+        return feature.downloaded_files_paths[file_type]
+
+# +++++++++++++++++++++++ requests runner section ++++++++++++++++++++++++++++++++++++
+
+    async def _run(self, request: BaseRequest) -> RestoRequestResult:
+        """
+        Run a request asynchronously: same as BaseRequest.run() but sending it with aiohttp.
+
+        :param request: the request to run
+        :returns: the result of the request, as returned by its run() method.
+        """
+        # The cache, the processing of the responses and the feature index involve sqlite and
+        # json decoding: they are run in the executor, not to block the event loop.
+        if isinstance(request, RestoJsonRequest):
+            cached_entry = await self._run_in_executor(request.get_cached_entry)
+            if cached_entry is not None and not cached_entry.expired:
+                return await self._run_in_executor(request.process_json_result,
+                                                   cached_entry.response)
+        try:
+            await self._finalize_request(request)
+        except RestoClientEmulatedResponse as excp:
+            return excp.result
+        response = await self._send_request(request)
+        try:
+            response_adapter = await self._read_response(response, request)
+        finally:
+            response.release()
+        result = await self._run_in_executor(request.process_response, response_adapter)
+        if isinstance(request, RestoJsonRequest):
+            await self._run_in_executor(request.set_cached_response)
+        return result
+
+    async def _finalize_request(self, request: BaseRequest) -> None:
+        """
+        Prepare a request before sending it, retrieving a token first if it needs one.
+
+        :param request: the request to prepare
+        """
+        auth_service = self._server.authentication_service
+        need_token = (request.authentication_type == 'ALWAYS' or
+                      (request.authentication_type == 'OPPORTUNITY' and
+                       auth_service.account_defined))
+        if need_token and not auth_service.token_is_available:
+            # Done once for all the requests: tokens are shared by the authentication service.
+            await self._run_in_executor(lambda: auth_service.token_value)
+        request.finalize_request()
+
+    async def _send_request(self, request: BaseRequest) -> 'aiohttp.ClientResponse':
+        """
+        Send a prepared request and wait for the headers of its response.
+
+        :param request: the request to send
+        :returns: the response, whose body has not been read yet.
+        :raises NetworkAccessDeniedError: if the request was refused because of a forbidden access.
+        :raises RestoNetworkError: for other errors
+        """
+        auth_arg, data_arg = request.get_authentication_arguments()
+        basic_auth = None
+        if auth_arg is not None:
+            # The credentials are encoded in UTF-8 for requests, while aiohttp expects them as str.
+            username, password = [value.decode('utf-8') if isinstance(value, bytes) else value
+                                  for value in (auth_arg.username, auth_arg.password)]
+            basic_auth = aiohttp.BasicAuth(username, password, encoding='utf-8')
+        try:
+            response = await self.http_session.request(request.get_method().upper(),
+                                                       request.get_url(),
+                                                       headers=request.request_headers,
+                                                       auth=basic_auth, data=data_arg)
+        except aiohttp.ClientError as excp:
+            msg = 'Error when {} for {}.'.format(request.request_action, request.get_url())
+            raise RestoNetworkError(msg) from excp
+        if response.status >= 400:
+            response.release()
+            msg = 'Error {} when {} for {}.'.format(response.status, request.request_action,
+                                                    request.get_url())
+            if response.status == 403:
+                raise NetworkAccessDeniedError(msg)
+            raise RestoNetworkError(msg)
+        return response
+
+    @staticmethod
+    async def _read_response(response: 'aiohttp.ClientResponse',
+                             request: BaseRequest) -> ResponseAdapter:
+        """
+        Read the whole body of a response.
+
+        :param response: the response to read
+        :param request: the request which received the response
+        :returns: the response, usable where a requests.Response is expected.
+        :raises RestoNetworkError: when the body cannot be received.
+        """
+        try:
+            content = await response.read()
+        except aiohttp.ClientError as excp:
+            msg = 'Error when {} for {}.'.format(request.request_action, request.get_url())
+            raise RestoNetworkError(msg) from excp
+        return ResponseAdapter(response.status, dict(response.headers), content,
+                               str(response.url))
+
+    async def _stream_product(self, response: 'aiohttp.ClientResponse',
+                              request: DownloadRequestBase, feature: RestoFeature,
+                              file_path: Path) -> Optional[bool]:
+        """
+        Write the body of a product response into a file, checking it against its checksum.
+
+        When a previous download of the same file has been interrupted, it is resumed from where
+        it stopped if the server supports Range requests. Writing and hashing the blocks are done
+        in the executor, not to block the event loop.
+
+        :param response: the response to read
+        :param request: the request which received the response
+        :param feature: the feature whose product is downloaded
+        :param file_path: path of the file to record
+        :returns: True if the product was checked against its checksum, None otherwise.
+        :raises RestoNetworkError: when the body cannot be received or is shorter than the product.
+        :raises ChecksumMismatchError: when the downloaded file does not match its checksum.
+        """
+        headers = CaseInsensitiveDict(response.headers)
+        file_size = feature.product_size
+        partial_download = PartialDownload(file_path, request.get_url(), file_size)
+        validator = PartialDownload.get_validator(headers)
+        offset = partial_download.resumable_offset(validator, headers.get('accept-ranges'))
+        if offset > 0:
+            response, offset = await self._resume_response(response, request, offset,
+                                                           cast(str, validator))
+        partial_download.write_sidecar(validator)
+        parsed_checksum = parse_checksum(feature.product_checksum)
+        hasher = None if parsed_checksum is None else hashlib.new(parsed_checksum[0])
+        if hasher is not None and offset > 0:
+            # Resumed download: only the bytes already received are read again.
+            await self._run_in_executor(update_hash_from_file, hasher, partial_download.part_path)
+
+        def _write_block(file_desc: BinaryIO, block: bytes) -> None:
+            file_desc.write(block)
+            if hasher is not None:
+                hasher.update(block)
+
+        try:
+            with open(partial_download.part_path, 'ab' if offset > 0 else 'wb') as file_desc:
+                async for block in response.content.iter_chunked(
+                        self._server.download_block_size):
+                    await self._run_in_executor(_write_block, file_desc, block)
+        except aiohttp.ClientError as excp:
+            msg = 'Error when {} for {}.'.format(request.request_action, request.get_url())
+            raise RestoNetworkError(msg) from excp
+        finally:
+            response.release()
+        downloaded_size = partial_download.part_path.stat().st_size
+        content_encoded = 'content-encoding' in response.headers
+        if file_size and not content_encoded and downloaded_size < file_size:
+            # Keep the part file such that download can be resumed later on.
+            msg = 'Download of {} stopped after {} bytes out of {}.'
+            raise RestoNetworkError(msg.format(file_path.name, downloaded_size, file_size))
+        if hasher is not None and parsed_checksum is not None:
+            if hasher.hexdigest() != parsed_checksum[1]:
+                partial_download.discard()
+                msg = 'Downloaded file {} does not match its {} checksum.'
+                raise ChecksumMismatchError(msg.format(file_path.name, parsed_checksum[0]))
+        partial_download.complete()
+        return None if hasher is None else True
+
+    async def _resume_response(self, response: 'aiohttp.ClientResponse',
+                               request: DownloadRequestBase, offset: int,
+                               validator: str) -> Tuple['aiohttp.ClientResponse', int]:
+        """
+        Request the end of a product from some offset, like DownloadRequestBase does.
+
+        :param response: the response received for the whole product, whose body is not read.
+        :param request: the request which received the response
+        :param offset: the offset of the first byte to retrieve
+        :param validator: the ETag or Last-Modified value of the partially downloaded response
+        :returns: the response to read and the offset at which its content starts: the response
+                  to the Range request and the requested offset when the server honoured it, the
+                  initial response and 0 otherwise.
+        """
+        range_headers = {'Range': 'bytes={}-'.format(offset), 'If-Range': validator}
+        request.update_headers(range_headers)
+        try:
+            range_response = await self._send_request(request)
+        except RestoNetworkError:
+            # Range not satisfiable: the whole product is read from the initial response.
+            return response, 0
+        finally:
+            for header in range_headers:
+                request.request_headers.pop(header, None)
+        if range_response.status != 206:
+            range_response.release()
+            return response, 0
+        response.release()
+        return range_response, offset
+
+    @staticmethod
+    async def _run_in_executor(function: Callable[..., ResultType], *args: Any) -> ResultType:
+        """
+        Run a blocking function in the default executor of the event loop.
+
+        :param function: the function to run
+        :param args: the arguments of the function
+        :returns: the result of the function
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, partial(function, *args))
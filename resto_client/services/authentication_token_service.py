@@ -15,6 +15,7 @@
    limitations under the License.
 """
 from abc import abstractmethod
+import threading
 from typing import cast, Optional, Any, TYPE_CHECKING  # @UnusedImport
 
 from resto_client.base_exceptions import (RestoClientDesignError, AccessDeniedError,
@@ -59,6 +60,8 @@ class AuthenticationTokenService(BaseService):
                                                          cast('AuthenticationService', self),
                                                          parent_server=parent_server)
         self._token_value: Optional[str] = None
+        # Lock preventing several threads to simultaneously request a token from the server
+        self._token_lock = threading.RLock()
 
     @property
     def current_token(self) -> Optional[str]:
@@ -82,11 +85,12 @@ class AuthenticationTokenService(BaseService):
         :returns: the current token value or a renewed value if the current token is invalid.
         :raises RestoClientNoToken: when server responded without providing a token.
         """
-        if self._token_value is None:
-            self._renew_token()
+        with self._token_lock:
             if self._token_value is None:
-                raise RestoClientNoToken('No token available and unable to retrieve one')
-        return self._token_value
+                self._renew_token()
+                if self._token_value is None:
+                    raise RestoClientNoToken('No token available and unable to retrieve one')
+            return self._token_value
 
     @token_value.setter
     def token_value(self, token_value: str) -> None:
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+.. admonition:: License
+
+   Copyright 2019 CNES
+
+   Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+   in compliance with the License. You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software distributed under the License
+   is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+   or implied. See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+from pathlib import Path
+from typing import Dict, Union  # @NoMove
+
+from prettytable import PrettyTable
+
+
+DownloadOutcome = Union[Path, Exception]
+
+
+class DownloadReport(dict):
+    """
+    Dictionary reporting the outcome of the download of a file type for several features.
+
+    Keys are the features product identifiers and values are either the path of the downloaded
+    file or the exception which prevented its download.
+    """
+
+    def __init__(self, file_type: str) -> None:
+        """
+        :param file_type: type of the downloaded files: product, quicklook, thumbnail or annexes
+        """
+        super(DownloadReport, self).__init__()
+        self.file_type = file_type
+
+    @property
+    def succeeded(self) -> Dict[str, Path]:
+        """
+        :returns: the paths of the downloaded files, indexed by feature identifier.
+        """
+        return {feature_id: outcome for feature_id, outcome in self.items()
+                if not isinstance(outcome, Exception)}
+
+    @property
+    def failed(self) -> Dict[str, Exception]:
+        """
+        :returns: the exceptions which prevented downloads, indexed by feature identifier.
+        """
+        return {feature_id: outcome for feature_id, outcome in self.items()
+                if isinstance(outcome, Exception)}
+
+    def raise_first_error(self) -> None:
+        """
+        Raise again the first exception recorded in this report, if any.
+        """
+        for outcome in self.failed.values():
+            raise outcome
+
+    def __str__(self) -> str:
+        report_table = PrettyTable()
+        report_table.title = '{} download report'.format(self.file_type.capitalize())
+        report_table.field_names = ['Feature', 'Result']
+        report_table.align['Feature'] = 'l'
+        report_table.align['Result'] = 'l'
+        for feature_id, outcome in self.items():
+            if isinstance(outcome, Exception):
+                result = 'FAILED: {}'.format(outcome)
+            else:
+                result = str(outcome)
+            report_table.add_row([feature_id, result])
+        return report_table.get_string()
@@ -0,0 +1,282 @@
+# -*- coding: utf-8 -*-
+"""
+.. admonition:: License
+
+   Copyright 2019 CNES
+
+   Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+   in compliance with the License. You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software distributed under the License
+   is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+   or implied. See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+import json
+from pathlib import Path
+import sqlite3
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple  # @NoMove
+
+from shapely.geometry import box, shape
+from shapely.prepared import prep
+
+from resto_client.entities.resto_feature import RestoFeature
+from resto_client.generic.response_cache import SQLITE_TIMEOUT
+
+
+DEFAULT_COVERAGE_MAX_AGE = 24 * 3600
+"""Default number of seconds during which a completed search can be answered from the index."""
+
+FEATURE_INDEX_SCHEMA_VERSION = 2
+"""Version of the feature index tables. Indexes with another version are recreated."""
+
+DATE_FORMAT = '%Y-%m-%d'
+
+WINDOW_CRITERIA = ('startDate', 'completionDate')
+"""Criteria defining the time window of a search."""
+
+PAGING_CRITERIA = ('page', 'index', 'maxRecords')
+"""Criteria which do not change the set of features found by a search."""
+
+LOCAL_CRITERIA = ('identifier', 'platform', 'productType', 'cloudCover', 'box')
+"""Criteria which can be evaluated on the index, in addition to the time window."""
+
+CriteriaType = Dict[str, Any]
+
+
+class FeatureIndex():
+    """
+    Index recording in a SQLite database the features found by the searches on a server, with
+    the time windows of the searches which were completed, such that repeating these searches
+    can be answered locally.
+
+    A search can be answered from the index when all its criteria other than its time window can
+    be evaluated locally (see LOCAL_CRITERIA) and when its time window is covered by completed
+    searches using the same criteria or a subset of them, recorded less than max_age seconds ago.
+    """
+
+    def __init__(self, db_path: Path, max_age: int=DEFAULT_COVERAGE_MAX_AGE) -> None:
+        """
+        :param db_path: the path of the SQLite database file
+        :param max_age: number of seconds after which a completed search is no longer used for
+                        answering searches, as new features may have been published since.
+        """
+        self.db_path = db_path
+        self.max_age = max_age
+        with self._connect() as connection:
+            connection.execute('PRAGMA journal_mode=WAL')
+            schema_version = connection.execute('PRAGMA user_version').fetchone()[0]
+            if schema_version != FEATURE_INDEX_SCHEMA_VERSION:
+                # The index can always be rebuilt by searching again: drop other versions.
+                connection.execute('DROP TABLE IF EXISTS features')
+                connection.execute('DROP TABLE IF EXISTS coverage')
+                connection.execute('PRAGMA user_version = {}'.format(FEATURE_INDEX_SCHEMA_VERSION))
+            connection.execute('CREATE TABLE IF NOT EXISTS features ('
+                               'collection TEXT NOT NULL, id TEXT NOT NULL, '
+                               'product_identifier TEXT, start_date TEXT, completion_date TEXT, '
+                               'platform TEXT, product_type TEXT, cloud_cover REAL, '
+                               'storage_mode TEXT, west REAL, south REAL, east REAL, north REAL, '
+                               'feature TEXT NOT NULL, PRIMARY KEY (collection, id))')
+            connection.execute('CREATE INDEX IF NOT EXISTS features_dates '
+                               'ON features (collection, start_date)')
+            connection.execute('CREATE INDEX IF NOT EXISTS features_product_identifier '
+                               'ON features (product_identifier)')
+            connection.execute('CREATE TABLE IF NOT EXISTS coverage ('
+                               'collection TEXT NOT NULL, filters TEXT NOT NULL, '
+                               'start_date TEXT NOT NULL, completion_date TEXT NOT NULL, '
+                               'recorded REAL NOT NULL)')
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """
+        :returns: a context manager providing a connection to the database, committing the
+                  changes on exit and closing the connection.
+        """
+        connection = sqlite3.connect(str(self.db_path), timeout=SQLITE_TIMEOUT)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def record_features(self, collection: str, features: Iterable[RestoFeature]) -> None:
+        """
+        Record features found by a search, replacing their previous version if any.
+
+        :param collection: the name of the collection where the features were found
+        :param features: the features to record
+        """
+        rows = [self._feature_row(collection, feature) for feature in features]
+        if rows:
+            with self._connect() as connection:
+                connection.executemany('INSERT OR REPLACE INTO features VALUES '
+                                       '(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', rows)
+
+    @staticmethod
+    def _feature_row(collection: str, feature: RestoFeature) -> Tuple[Any, ...]:
+        """
+        :param collection: the name of the collection of the feature
+        :param feature: the feature to record
+        :returns: the values of the columns of the features table for this feature
+        """
+        properties = feature.properties
+        bounds: Tuple[Optional[float], ...] = (None, None, None, None)
+        if feature.get('geometry'):
+            bounds = shape(feature['geometry']).bounds
+        # The license entries were removed from the properties: record them as received.
+        feature_descr = {'type': 'Feature', 'id': feature['id'], 'geometry': feature['geometry'],
+                         'properties': dict(properties, **feature.license.item_entries)}
+        return (collection, feature['id'], properties.get('productIdentifier'),
+                properties.get('startDate'), properties.get('completionDate'),
+                properties.get('platform'), properties.get('productType'),
+                properties.get('cloudCover'), feature.storage, *bounds,
+                json.dumps(feature_descr, separators=(',', ':')))
+
+    def record_coverage(self, collection: str, criteria: CriteriaType) -> None:
+        """
+        Record that all the features found by a search have been recorded.
+
+        :param collection: the name of the collection searched
+        :param criteria: the criteria of the search
+        """
+        start_date, completion_date = self._get_window(criteria)
+        with self._connect() as connection:
+            connection.execute('INSERT INTO coverage VALUES (?, ?, ?, ?, ?)',
+                               (collection, self._filters_key(criteria), start_date.isoformat(),
+                                completion_date.isoformat(), time.time()))
+            connection.execute('DELETE FROM coverage WHERE recorded < ?',
+                               (time.time() - self.max_age,))
+
+    def covers(self, collection: str, criteria: CriteriaType) -> bool:
+        """
+        :param collection: the name of the collection to search
+        :param criteria: the criteria of the search
+        :returns: True if the search can be answered from the index.
+        """
+        filters = self._get_filters(criteria)
+        if any(key not in LOCAL_CRITERIA for key in filters):
+            return False
+        start_date, completion_date = self._get_window(criteria)
+        with self._connect() as connection:
+            rows = connection.execute('SELECT filters, start_date, completion_date '
+                                      'FROM coverage WHERE collection = ? AND recorded >= ?',
+                                      (collection, time.time() - self.max_age)).fetchall()
+        windows = []
+        for covered_filters, covered_start, covered_completion in rows:
+            # Features matching less restrictive criteria contain those matching these criteria.
+            if all(filters.get(key) == value
+                   for key, value in json.loads(covered_filters).items()):
+                windows.append((datetime.strptime(covered_start, DATE_FORMAT).date(),
+                                datetime.strptime(covered_completion, DATE_FORMAT).date()))
+        first_uncovered = start_date
+        for window_start, window_end in sorted(windows):
+            if window_start > first_uncovered:
+                return False
+            if window_end >= completion_date:
+                return True
+            first_uncovered = max(first_uncovered, window_end + timedelta(days=1))
+        return False
+
+    def search(self, collection: str, criteria: CriteriaType) -> Optional[List[RestoFeature]]:
+        """
+        Answer a search from the index.
+
+        :param collection: the name of the collection to search
+        :param criteria: the criteria of the search
+        :returns: the features found, most recent first, or None if the search cannot be
+                  answered from the index.
+        """
+        if not self.covers(collection, criteria):
+            return None
+        conditions = ['collection = ?']
+        parameters: List[Any] = [collection]
+        if 'startDate' in criteria:
+            conditions.append('completion_date >= ?')
+            parameters.append(criteria['startDate'])
+        if 'completionDate' in criteria:
+            # Feature dates are timestamps: compare them with the beginning of the next day.
+            end_date = datetime.strptime(criteria['completionDate'], DATE_FORMAT).date()
+            conditions.append('start_date < ?')
+            parameters.append((end_date + timedelta(days=1)).isoformat())
+        filters = self._get_filters(criteria)
+        for key, value in filters.items():
+            key_conditions, key_parameters = self._filter_condition(key, value)
+            conditions.append(key_conditions)
+            parameters.extend(key_parameters)
+        query = 'SELECT feature FROM features WHERE {} ORDER BY start_date DESC, id'
+        with self._connect() as connection:
+            rows = connection.execute(query.format(' AND '.join(conditions)),
+                                      parameters).fetchall()
+        features = [RestoFeature(json.loads(row[0])) for row in rows]
+        if 'box' in filters:
+            # The SQL condition only compares the bounding boxes: refine with the footprints.
+            prepared_box = prep(box(*self._box_bounds(filters['box'])))
+            features = [feature for feature in features
+                        if prepared_box.intersects(shape(feature['geometry']))]
+        return features
+
+    @staticmethod
+    def _filter_condition(key: str, value: Any) -> Tuple[str, List[Any]]:
+        """
+        :param key: one of the LOCAL_CRITERIA
+        :param value: the value of the criterion
+        :returns: the SQL condition evaluating the criterion and its parameters
+        """
+        if key == 'identifier':
+            return '(product_identifier = ? OR id = ?)', [value, value]
+        if key in ('platform', 'productType'):
+            column = 'platform' if key == 'platform' else 'product_type'
+            values = value if isinstance(value, list) else [value]
+            return '{} IN ({})'.format(column, ', '.join('?' * len(values))), list(values)
+        if key == 'cloudCover':
+            lower, upper = (float(bound) for bound in value[1:-1].split(','))
+            lower_operator = '>=' if value[0] == '[' else '>'
+            upper_operator = '<=' if value[-1] == ']' else '<'
+            condition = 'cloud_cover {} ? AND cloud_cover {} ?'.format(lower_operator,
+                                                                       upper_operator)
+            return condition, [lower, upper]
+        west, south, east, north = FeatureIndex._box_bounds(value)
+        return 'east >= ? AND west <= ? AND north >= ? AND south <= ?', [west, east, south, north]
+
+    @staticmethod
+    def _box_bounds(value: Any) -> Tuple[float, ...]:
+        """
+        :param value: the value of a box criterion: west, south, east, north
+        :returns: the bounds of the box, as floats
+        """
+        return tuple(float(coord) for coord in str(value).split(','))
+
+    @staticmethod
+    def _get_filters(criteria: CriteriaType) -> CriteriaType:
+        """
+        :param criteria: the criteria of a search
+        :returns: the criteria selecting the features, apart from their time window.
+        """
+        return {key: value for key, value in criteria.items()
+                if key not in WINDOW_CRITERIA + PAGING_CRITERIA}
+
+    def _filters_key(self, criteria: CriteriaType) -> str:
+        """
+        :param criteria: the criteria of a search
+        :returns: a canonical representation of the criteria selecting the features
+        """
+        return json.dumps(self._get_filters(criteria), sort_keys=True, default=str)
+
+    @staticmethod
+    def _get_window(criteria: CriteriaType) -> Tuple[date, date]:
+        """
+        :param criteria: the criteria of a search
+        :returns: the first and last days of the time window of the search
+        """
+        start_date = date.min
+        completion_date = date.max
+        if 'startDate' in criteria:
+            start_date = datetime.strptime(criteria['startDate'], DATE_FORMAT).date()
+        if 'completionDate' in criteria:
+            completion_date = datetime.strptime(criteria['completionDate'], DATE_FORMAT).date()
+        return start_date, completion_date
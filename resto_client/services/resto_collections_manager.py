@@ -14,7 +14,7 @@
    or implied. See the License for the specific language governing permissions and
    limitations under the License.
 """
-from typing import Optional
+from typing import Callable, Optional
 
 from resto_client.base_exceptions import RestoClientUserError, RestoClientDesignError
 from resto_client.entities.resto_collections import RestoCollections
@@ -23,17 +23,42 @@ from resto_client.entities.resto_collections import RestoCollections
 class RestoCollectionsManager():
     """
      Class managing the set of collections of a resto service.
+
+     When a collections loader is provided, the set of collections is retrieved by calling it the
+     first time that it is needed, rather than when the manager is created.
     """
 
-    def __init__(self) -> None:
+    def __init__(self,
+                 collections_loader: Optional[Callable[[], RestoCollections]] = None) -> None:
+        """
+        :param collections_loader: function returning the set of collections, called when the
+                                   collections are used for the first time.
+        """
         self._collections_set: Optional[RestoCollections] = None
         self._current_collection: Optional[str] = None
+        self._current_collection_checked = True
+        self._collections_loader = collections_loader
+
+    @property
+    def _collections_pending(self) -> bool:
+        """
+        :returns: True if the set of collections has not been loaded yet but can be loaded.
+        """
+        return self._collections_set is None and self._collections_loader is not None
+
+    def _load_collections(self) -> None:
+        """
+        Retrieve the set of collections with the collections loader, if not already done.
+        """
+        if self._collections_set is None and self._collections_loader is not None:
+            self.collections_set = self._collections_loader()
 
     @property
     def collections_set(self) -> Optional[RestoCollections]:
         """
         :returns: the set of collections associated to this collection manager.
         """
+        self._load_collections()
         return self._collections_set
 
     @collections_set.setter
@@ -45,7 +70,7 @@ class RestoCollectionsManager():
         else:
             self._collections_set = collections
             # Retrieve the stored current collection name and check if it is still valid
-            previous_current_collection = self.current_collection
+            previous_current_collection = self._current_collection
             # Retrieve candidate current collection.
             candidate_current_collection = self._collections_set.default_collection
             if candidate_current_collection is None:
@@ -54,8 +79,9 @@ class RestoCollectionsManager():
                     # Try to reuse previous current collection
                     self.current_collection = previous_current_collection
                 except RestoClientUserError:
-                    # Previous current collection is not in the collections. Set current to None.
-                    self.current_collection = None
+                    if self._current_collection_checked:
+                        # Previous current collection is not in the collections. Set it to None.
+                        self.current_collection = None
             else:
                 # There is exactly 1 collection. Use it as the current.
                 self.current_collection = candidate_current_collection
@@ -65,6 +91,9 @@ class RestoCollectionsManager():
         """
         :returns: the name of the current collection
         """
+        if self._current_collection is None:
+            # The collections, if not loaded yet, may define a default collection.
+            self._load_collections()
         return self._current_collection
 
     @current_collection.setter
@@ -75,6 +104,11 @@ class RestoCollectionsManager():
         :param collection_name: the name of the collection to set as current or None to deselect it.
         :raises RestoClientDesignError: when the set of collections is undefined
         """
+        self._current_collection_checked = True
+        if collection_name is None and self._collections_pending:
+            # The default collection, if any, will be selected when collections are loaded.
+            self._current_collection = None
+            return
         if collection_name is not None:
             if self.collections_set is None:
                 msg = 'Cannot set a current collection when there is no collections set'
@@ -88,6 +122,16 @@ class RestoCollectionsManager():
             collection_name = self.collections_set.default_collection
         self._current_collection = collection_name
 
+    def set_unchecked_collection(self, collection_name: str) -> None:
+        """
+        Set the current collection without checking that it belongs to the collections, such
+        that the collections need not be retrieved from the server.
+
+        :param collection_name: the name of the collection to set as current.
+        """
+        self._current_collection = collection_name
+        self._current_collection_checked = False
+
     def ensure_collection(self, collection: Optional[str]=None) -> str:
         """
         Change the current_collection if a collection is specified
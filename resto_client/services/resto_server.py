@@ -14,20 +14,51 @@
    or implied. See the License for the specific language governing permissions and
    limitations under the License.
 """
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Optional, TypeVar, List, Union, Dict, Any
+from typing import Optional, TypeVar, List, Union, Dict, Any, Iterator
 
+import requests
+from requests.adapters import HTTPAdapter
+from tqdm import tqdm
+
+from resto_client.base_exceptions import RestoClientUserError
 from resto_client.entities.resto_collection import RestoCollection
-from resto_client.entities.resto_feature import RestoFeature
+from resto_client.entities.resto_feature import (RestoFeature, BaseRestoFeature,
+                                                 CompactRestoFeature)
 from resto_client.entities.resto_feature_collection import RestoFeatureCollection
+from resto_client.generic.response_cache import ResponseCache, SQLiteCache
+from resto_client.requests.stream_writer import DEFAULT_DOWNLOAD_BLOCK_SIZE
+from resto_client.settings.dict_settings import DictSettingsJson
+from resto_client.settings.resto_client_config import RESTO_CLIENT_CONFIG_DIR
 from resto_client.settings.servers_database import DB_SERVERS
 
 from .authentication_service import AuthenticationService
-from .resto_service import RestoService
+from .download_report import DownloadReport, DownloadOutcome
+from .feature_index import FeatureIndex
+from .resto_service import RestoService, DEFAULT_MAX_RESULTS_PER_QUERY
 
 
 RestoServerType = TypeVar('RestoServerType', bound='RestoServer')
 
+DEFAULT_POOL_SIZE = 10
+"""Default number of keep-alive connections kept open per host by a RestoServer."""
+
+DEFAULT_DOWNLOAD_WORKERS = 1
+"""Default number of files downloaded simultaneously by a RestoServer."""
+
+DEFAULT_DOWNLOAD_SEGMENTS = 1
+"""Default number of byte ranges downloaded in parallel for a single large product."""
+
+DEFAULT_SEARCH_WORKERS = 4
+"""Default number of result pages requested simultaneously when harvesting a search."""
+
+RESPONSE_CACHE_FILE_NAME = 'response_cache.sqlite'
+
+FEATURE_INDEX_FILE_NAME = 'feature_index.sqlite'
+
+SYNC_STATE_FILE_NAME = 'sync_state.json'
+
 
 class RestoServer():
     """
@@ -40,7 +71,16 @@ class RestoServer():
                  username: Optional[str] = None,
                  password: Optional[str] = None,
                  token: Optional[str] = None,
-                 debug_server: bool = False) -> None:
+                 debug_server: bool = False,
+                 pool_size: int = DEFAULT_POOL_SIZE,
+                 download_workers: int = DEFAULT_DOWNLOAD_WORKERS,
+                 download_segments: int = DEFAULT_DOWNLOAD_SEGMENTS,
+                 download_block_size: int = DEFAULT_DOWNLOAD_BLOCK_SIZE,
+                 search_workers: int = DEFAULT_SEARCH_WORKERS,
+                 search_caching_duration: int = 0,
+                 response_cache: Optional[ResponseCache] = None,
+                 check_collection: bool = True,
+                 feature_index: Optional[FeatureIndex] = None) -> None:
         """
         Build a new RestoServer instance from arguments and database.
 
@@ -50,8 +90,35 @@ class RestoServer():
         :param password: account password on the server
         :param token: an existing token associated to this account (will be checked prior its use)
         :param debug_server: When True debugging information on server and requests is printed out.
+        :param pool_size: maximum number of connections kept alive per host by the HTTP session.
+        :param download_workers: maximum number of files downloaded simultaneously when
+                                 downloading the files of several features.
+        :param download_segments: number of byte ranges downloaded in parallel for a large product,
+                                  when the server supports Range requests.
+        :param download_block_size: initial size in bytes of the blocks read from the network
+                                    when downloading files. It grows on fast links.
+        :param search_workers: maximum number of result pages requested simultaneously when
+                               harvesting a search.
+        :param search_caching_duration: number of seconds during which the search results are
+                                        cached. By default they are not cached, such that new
+                                        products are found as soon as they are published.
+        :param response_cache: the cache where the responses of the requests are recorded. By
+                               default a SQLite cache located in the server configuration directory.
+        :param check_collection: when False, current_collection is used without checking that it
+                                 exists on the server, which saves retrieving the collections.
+        :param feature_index: the index where the features found by the searches are recorded.
+                              By default there is none until local_search() is used.
         """
         self.debug_server = debug_server
+        self.download_workers = download_workers
+        self.download_segments = download_segments
+        self.download_block_size = download_block_size
+        self.search_workers = search_workers
+        self.search_caching_duration = search_caching_duration
+        self._response_cache = response_cache
+        self._feature_index = feature_index
+        self._http_session = self._build_http_session(
+            max(pool_size, download_workers * download_segments, search_workers))
 
         # initialize the services
         self._server_name = DB_SERVERS.check_server_name(server_name)
@@ -62,9 +129,84 @@ class RestoServer():
                                            self._authentication_service, self)
 
         # set services parameters
-        self.current_collection = current_collection
+        if check_collection or current_collection is None:
+            self.current_collection = current_collection
+        else:
+            self._resto_service.set_unchecked_collection(current_collection)
         self.set_credentials(username=username, password=password, token_value=token)
 
+    @staticmethod
+    def _build_http_session(pool_size: int) -> requests.Session:
+        """
+        Build the HTTP session shared by all the services of this server, such that connections
+        to the resto and authentication services are kept alive and reused between requests.
+
+        :param pool_size: maximum number of connections kept alive per host.
+        :returns: a requests session using connection pools of the requested size.
+        """
+        http_session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        http_session.mount('https://', adapter)
+        http_session.mount('http://', adapter)
+        return http_session
+
+    @property
+    def resto_service(self) -> RestoService:
+        """
+        :returns: the resto service of this server.
+        """
+        return self._resto_service
+
+    @property
+    def authentication_service(self) -> AuthenticationService:
+        """
+        :returns: the authentication service of this server.
+        """
+        return self._authentication_service
+
+    @property
+    def http_session(self) -> requests.Session:
+        """
+        :returns: the HTTP session used by all the requests sent to this server.
+        """
+        return self._http_session
+
+    @property
+    def response_cache(self) -> ResponseCache:
+        """
+        :returns: the cache where the responses of the requests sent to this server are recorded.
+        """
+        if self._response_cache is None:
+            cache_dir = self.ensure_server_directory(RESTO_CLIENT_CONFIG_DIR)
+            self._response_cache = SQLiteCache(cache_dir / RESPONSE_CACHE_FILE_NAME)
+        return self._response_cache
+
+    @property
+    def feature_index(self) -> Optional[FeatureIndex]:
+        """
+        :returns: the index where the features found by the searches on this server are
+                  recorded, or None if they are not recorded.
+        """
+        return self._feature_index
+
+    def enable_feature_index(self) -> FeatureIndex:
+        """
+        Record the features found by the searches on this server in a feature index, located in
+        the server configuration directory, unless an index is already in use.
+
+        :returns: the feature index of this server
+        """
+        if self._feature_index is None:
+            index_dir = self.ensure_server_directory(RESTO_CLIENT_CONFIG_DIR)
+            self._feature_index = FeatureIndex(index_dir / FEATURE_INDEX_FILE_NAME)
+        return self._feature_index
+
+    def close(self) -> None:
+        """
+        Close the connections kept alive by this server HTTP session.
+        """
+        self._http_session.close()
+
     def set_credentials(self,
                         username: Optional[str]=None,
                         password: Optional[str]=None,
@@ -117,34 +259,116 @@ class RestoServer():
 # +++++++++++++++++++++++ proxy to resto_service functions ++++++++++++++++++++++++++++++++++++
 
     def search_by_criteria(self, criteria: Dict[str, Any],
-                           collection_name: Optional[str] = None) -> RestoFeatureCollection:
+                           collection_name: Optional[str] = None,
+                           precise_region: bool = False) -> RestoFeatureCollection:
         """
         Search a collection using search criteria
 
         :param criteria: searching criteria
         :param collection_name: name of the collection to use. Default to the current collection.
+        :param precise_region: if True, the features which do not intersect the region specified
+                               in the criteria, if any, are discarded from the result.
         :returns: a collection of resto features
         """
-        return self._resto_service.search_by_criteria(criteria, collection_name)
+        return self._resto_service.search_by_criteria(criteria, collection_name, precise_region)
+
+    def iter_search(self, criteria: Dict[str, Any],
+                    collection_name: Optional[str] = None) -> Iterator[RestoFeature]:
+        """
+        Search a collection using search criteria and iterate over all the features found,
+        whatever the number of result pages.
+
+        When ijson is installed the pages are streamed: they are validated once received, but they
+        are neither recorded in the response cache nor revalidated with the server. Use
+        search_by_criteria() for cached searches.
+
+        :param criteria: searching criteria. page or index, if specified, give the first page.
+        :param collection_name: name of the collection to use. Default to the current collection.
+        :returns: an iterator over the resto features found, fetching pages as needed.
+        """
+        return self._resto_service.iter_search_by_criteria(criteria, collection_name)
+
+    def harvest(self, criteria: Dict[str, Any],
+                collection_name: Optional[str] = None,
+                compact: bool = False) -> Iterator[BaseRestoFeature]:
+        """
+        Search a collection using search criteria and iterate over all the features found, like
+        iter_search() does, but requesting several result pages simultaneously.
+
+        :param criteria: searching criteria. page or index, if specified, give the first page.
+        :param collection_name: name of the collection to use. Default to the current collection.
+        :param compact: if True, features are returned as CompactRestoFeature, which take much
+                        less memory when many of them must be kept.
+        :returns: an iterator over the resto features found, in the order of the result pages.
+        """
+        features = self._resto_service.harvest_by_criteria(criteria, collection_name,
+                                                           self.search_workers)
+        if compact:
+            return map(CompactRestoFeature.from_feature, features)
+        return features
+
+    def split_search(self, criteria: Dict[str, Any],
+                     collection_name: Optional[str] = None,
+                     max_results: int = DEFAULT_MAX_RESULTS_PER_QUERY) -> Iterator[RestoFeature]:
+        """
+        Search a collection using search criteria too wide for a single query, by splitting it
+        into time slices or spatial tiles run concurrently, and iterate over all the features found.
+
+        :param criteria: searching criteria. Splitting uses startDate and completionDate first,
+                         then box, geometry or region.
+        :param collection_name: name of the collection to use. Default to the current collection.
+        :param max_results: number of results above which a query is split.
+        :returns: an iterator over the resto features found, each of them being returned once.
+        """
+        return self._resto_service.split_search_by_criteria(criteria, collection_name,
+                                                            max_results, self.search_workers)
+
+    def sync(self, criteria: Dict[str, Any],
+             collection_name: Optional[str] = None) -> Iterator[RestoFeature]:
+        """
+        Search a collection using search criteria, retrieving only the features published or
+        updated since the previous synchronization with the same collection and criteria.
+
+        Watermarks and pagination progress are saved in the server configuration directory, such
+        that an interrupted synchronization resumes where it stopped.
+
+        :param criteria: searching criteria
+        :param collection_name: name of the collection to use. Default to the current collection.
+        :returns: an iterator over the resto features published or updated since the last
+                  synchronization, or over all the features found for the first one.
+        """
+        state_dir = self.ensure_server_directory(RESTO_CLIENT_CONFIG_DIR)
+        sync_state = DictSettingsJson(state_dir / SYNC_STATE_FILE_NAME)
+        return self._resto_service.sync_by_criteria(criteria, sync_state, collection_name)
+
+    def local_search(self, criteria: Dict[str, Any],
+                     collection_name: Optional[str] = None) -> RestoFeatureCollection:
+        """
+        Search a collection using search criteria, answering from the feature index of this
+        server when the same search, or a wider one, was completed recently. Otherwise all the
+        result pages are retrieved from the server and recorded in the index.
+
+        :param criteria: searching criteria
+        :param collection_name: name of the collection to use. Default to the current collection.
+        :returns: a collection with all the resto features found
+        """
+        self.enable_feature_index()
+        return self._resto_service.local_search(criteria, collection_name, self.search_workers)
 
     def get_features_from_ids(self, features_ids: Union[str, List[str]],
                               collection_name: Optional[str] = None) -> List[RestoFeature]:
         """
-        Get a list of resto features retrieved by their identifiers
+        Get a list of resto features retrieved by their identifiers, resolving them by batches
+        when the server protocol allows it.
 
         :param features_ids: Feature(s) identifier(s)
         :param collection_name: name of the collection to use. Default to the current collection.
         :returns: a list of Resto features
         """
-        features_list = []
         if not isinstance(features_ids, list):
             features_ids = [features_ids]
-
-        for feature_id in features_ids:
-            feature = self._resto_service.get_feature_by_id(feature_id, collection_name)
-            features_list.append(feature)
-
-        return features_list
+        return self._resto_service.get_features_by_ids(features_ids, collection_name,
+                                                       self.search_workers)
 
     def download_feature_file(self, feature: RestoFeature,
                               file_type: str, download_dir: Path) -> None:
@@ -162,20 +386,65 @@ class RestoServer():
     def download_features_file_from_ids(self,
                                         features_ids: Union[str, List[str]],
                                         file_type: str,
-                                        download_dir: Path) -> None:
+                                        download_dir: Path) -> DownloadReport:
         """
         Download different file types from feature id(s)
 
         :param features_ids: id(s) of the feature(s) which as a file to download
         :param download_dir: the path to the directory where download must be done.
         :param file_type: type of file to download: product, quicklook, thumbnail or annexes
+        :returns: the outcome of the download of each feature file.
         """
         # Issue a search request into the collection to retrieve features.
         features = self.get_features_from_ids(features_ids)
+        return self.download_features_files(features, file_type, download_dir)
+
+    def download_features_files(self,
+                                features: List[RestoFeature],
+                                file_type: str,
+                                download_dir: Path) -> DownloadReport:
+        """
+        Download the files of a given type for several features, using up to download_workers
+        simultaneous downloads. The progress of all the downloads is reported in a single bar and
+        a failed download does not prevent the other ones to proceed. A feature given several
+        times is downloaded once.
 
+        :param features: the features whose files must be downloaded
+        :param file_type: type of file to download: product, quicklook, thumbnail or annexes
+        :param download_dir: the path to the directory where download must be done.
+        :returns: the outcome of the download of each feature file.
+        :raises RestoClientUserError: when different features have the same product identifier,
+                                      as their files would overwrite each other.
+        """
+        unique_features: Dict[str, RestoFeature] = {}
+        for feature in features:
+            known_feature = unique_features.setdefault(feature.product_identifier, feature)
+            if known_feature.id != feature.id:
+                msg = 'Features {} and {} have the same product identifier {}.'
+                raise RestoClientUserError(msg.format(known_feature.id, feature.id,
+                                                      feature.product_identifier))
+        features = list(unique_features.values())
+        report = DownloadReport(file_type)
+        server_download_dir = self.ensure_server_directory(download_dir)
+        with tqdm(unit='B', total=0, unit_scale=True, desc='Downloading') as progress_bar:
+            with ThreadPoolExecutor(max_workers=max(1, self.download_workers)) as executor:
+                futures = {executor.submit(self._resto_service.download_feature_file, feature,
+                                           file_type, server_download_dir,
+                                           progress_bar=progress_bar): feature
+                           for feature in features}
+                outcomes: Dict[int, DownloadOutcome] = {}
+                for future in as_completed(futures):
+                    feature = futures[future]
+                    try:
+                        future.result()
+                        outcomes[id(feature)] = feature.downloaded_files_paths[file_type]
+                    except Exception as excp:  # pylint: disable=broad-except
+                        # Any failure is recorded for its feature, not to lose the other ones.
+                        outcomes[id(feature)] = excp
+        # Report the outcomes in the features order
         for feature in features:
-            # Do download
-            self.download_feature_file(feature, file_type, download_dir)
+            report[feature.product_identifier] = outcomes[id(feature)]
+        return report
 
     def ensure_server_directory(self, data_dir: Path) -> Path:
         """
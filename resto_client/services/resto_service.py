@@ -14,12 +14,19 @@
    or implied. See the License for the specific language governing permissions and
    limitations under the License.
 """
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from itertools import islice
+import json
 from pathlib import Path
 import time
-from typing import Optional, Dict, Type, Any, TYPE_CHECKING
+from typing import (Optional, Callable, Deque, Dict, Generator, Iterable, Iterator, List, Tuple,
+                    Type, Any, TYPE_CHECKING)
 from warnings import warn
 
 from colorama import Fore, Style, colorama_text
+from tqdm import tqdm
 
 from resto_client.base_exceptions import (InconsistentResponse,
                                           LicenseSignatureRequested,
@@ -27,8 +34,10 @@ from resto_client.base_exceptions import (InconsistentResponse,
 from resto_client.entities.resto_collection import RestoCollection
 from resto_client.entities.resto_collections import RestoCollections
 from resto_client.entities.resto_criteria import RestoCriteria
+from resto_client.entities.resto_criteria_definition import get_criteria_for_protocol
 from resto_client.entities.resto_feature import RestoFeature
 from resto_client.entities.resto_feature_collection import RestoFeatureCollection
+from resto_client.functions.query_planner import split_criteria
 from resto_client.requests.collections_requests import (GetCollectionsRequest, GetCollectionRequest,
                                                         SearchCollectionRequest)
 from resto_client.requests.features_requests import (DownloadAnnexesRequest,
@@ -36,9 +45,11 @@ from resto_client.requests.features_requests import (DownloadAnnexesRequest,
                                                      DownloadQuicklookRequest,
                                                      DownloadThumbnailRequest,
                                                      SignLicenseRequest,
-                                                     FeatureOnTape)
+                                                     FeatureOnTape,
+                                                     ChecksumMismatchError)
 from resto_client.requests.features_requests import DownloadRequestBase  # @UnusedImport
 from resto_client.requests.service_requests import DescribeRequest
+from resto_client.settings.dict_settings import DictSettingsJson
 from resto_client.settings.resto_client_config import resto_client_print
 
 from .authentication_service import AuthenticationService
@@ -51,6 +62,25 @@ if TYPE_CHECKING:
     from .resto_server import RestoServer  # @UnusedImport
 
 
+DEFAULT_CHECKSUM_RETRIES = 2
+"""Number of times a download is restarted when the downloaded file does not fit its checksum."""
+
+DEFAULT_MAX_RESULTS_PER_QUERY = 5000
+"""Number of results above which a search is split into several sub-queries."""
+
+MAX_SPLIT_DEPTH = 10
+"""Maximum number of successive splits of a search."""
+
+MAX_SUB_QUERIES = 256
+"""Maximum number of sub-queries of a split search, which bounds the number of counting queries."""
+
+IDS_PER_QUERY = 50
+"""Maximum number of identifiers resolved by a single search when retrieving several features."""
+
+PAGES_PER_WORKER = 2
+"""Number of pages which may be requested in advance by each worker when harvesting a search."""
+
+
 class RestoService(BaseService):
     """
         A Resto Service, i.e. a valid resto accessible server
@@ -67,8 +97,8 @@ class RestoService(BaseService):
         """
         super(RestoService, self).__init__(resto_access, auth_service, parent_server)
         self.service_access.detected_protocol = None
-        self._collections_mgr = RestoCollectionsManager()
-        self._collections_mgr.collections_set = self.get_collections()
+        # Collections are retrieved from the server only when they are needed.
+        self._collections_mgr = RestoCollectionsManager(collections_loader=self.get_collections)
 
     def set_collection_mgr(self, collection_mgr: RestoCollectionsManager) -> None:
         """
@@ -93,6 +123,24 @@ class RestoService(BaseService):
         """
         self._collections_mgr.current_collection = collection_name
 
+    def ensure_collection(self, collection: Optional[str]=None) -> str:
+        """
+        Change the current collection if a collection is specified.
+
+        :param collection: the collection name to use, or None to use the current collection
+        :returns: the collection name to use
+        """
+        return self._collections_mgr.ensure_collection(collection)
+
+    def set_unchecked_collection(self, collection_name: str) -> None:
+        """
+        Set the current collection without checking it against the collections of the service,
+        which avoids retrieving them.
+
+        :param collection_name: collection to use
+        """
+        self._collections_mgr.set_unchecked_collection(collection_name)
+
     def show(self, with_stats: bool=True) -> str:
         """
         :returns: The server description as a tabulated listing
@@ -130,26 +178,458 @@ class RestoService(BaseService):
 
     def search_by_criteria(self,
                            criteria: Dict[str, Any],
-                           collection: Optional[str]=None) -> RestoFeatureCollection:
+                           collection: Optional[str]=None,
+                           precise_region: bool=False) -> RestoFeatureCollection:
         """
         Search a collection using criteria.
 
         :param criteria: the criteria to use for the search
         :param collection: the name of the collection to search
+        :param precise_region: if True and a region is specified in the criteria, the features
+                               which do not intersect the region itself, but only the convex hull
+                               sent to the server, are removed from the result. Their number is
+                               given by the nb_discarded attribute of the result.
         :returns: the result of the search
         """
         collection_name = self._collections_mgr.ensure_collection(collection)
         resto_criteria = RestoCriteria(self.get_protocol(), **criteria)
-        return SearchCollectionRequest(self, collection_name, criteria=resto_criteria).run()
+        feature_collection = SearchCollectionRequest(self, collection_name,
+                                                     criteria=resto_criteria).run()
+        if precise_region and resto_criteria.region_prepared is not None:
+            feature_collection.filter_by_region(resto_criteria.region_prepared)
+        return feature_collection
+
+    def iter_search_by_criteria(self,
+                                criteria: Dict[str, Any],
+                                collection: Optional[str]=None) -> Iterator[RestoFeature]:
+        """
+        Search a collection using criteria and iterate over the features of all the result pages.
+
+        Pages are requested one after the other, starting at the page or index specified in the
+        criteria, if any, until the total number of results is reached. Only one page is held in
+        memory at a time, or only one feature when ijson is installed, as features are then
+        built while the page is being received. Streamed pages are not cached.
+
+        :param criteria: the criteria to use for the search
+        :param collection: the name of the collection to search
+        :returns: an iterator over the features found
+        """
+        collection_name = self._collections_mgr.ensure_collection(collection)
+        position_key, first_position = self._get_first_position(criteria)
+        position = first_position
+        page_size = None
+        nb_features = 0
+        while True:
+            search_request = self._build_search_request(criteria, collection_name,
+                                                        position_key, position)
+            nb_page_features = 0
+            for feature in search_request.iter_features():
+                nb_page_features += 1
+                yield feature
+            total_results = search_request.feature_collection_properties.get('totalResults')
+            if page_size is None:
+                page_size = nb_page_features
+            nb_features += nb_page_features
+            if not nb_page_features or nb_page_features < page_size:
+                break
+            if total_results is not None:
+                nb_skipped = first_position - 1 if position_key == 'index' else \
+                    (first_position - 1) * page_size
+                if nb_skipped + nb_features >= total_results:
+                    break
+            position += nb_page_features if position_key == 'index' else 1
+        self._record_coverage(criteria, collection_name, first_position)
+
+    def harvest_by_criteria(self,
+                            criteria: Dict[str, Any],
+                            collection: Optional[str]=None,
+                            nb_workers: int=1) -> Iterator[RestoFeature]:
+        """
+        Search a collection using criteria and iterate over the features of all the result pages,
+        the pages following the first one being requested concurrently.
+
+        The first page gives the page size and the total number of results, from which the
+        remaining pages are deduced. They are requested by several workers, a bounded number of
+        them in advance, and buffered until the features of the previous pages have been yielded,
+        such that features come in the same order as with iter_search_by_criteria(). When the
+        server does not provide the total number of results, the pages are requested one after
+        the other until a page is not full.
+
+        :param criteria: the criteria to use for the search
+        :param collection: the name of the collection to search
+        :param nb_workers: maximum number of pages requested simultaneously
+        :returns: an iterator over the features found
+        """
+        collection_name = self._collections_mgr.ensure_collection(collection)
+        position_key, first_position = self._get_first_position(criteria)
+        first_page = self._search_page(criteria, collection_name, position_key, first_position)
+        page_size = len(first_page.resto_features)
+        total_results = first_page.total_results
+        yield from first_page.resto_features
+        del first_page
+        if page_size == 0:
+            self._record_coverage(criteria, collection_name, first_position)
+            return
+        if total_results is None:
+            # The remaining pages cannot be known in advance: request them one after the other,
+            # as iter_search_by_criteria() does, until a page is not full.
+            position = first_position
+            while True:
+                position += page_size if position_key == 'index' else 1
+                page_features = self._search_page(criteria, collection_name, position_key,
+                                                  position).resto_features
+                yield from page_features
+                if len(page_features) < page_size:
+                    break
+                del page_features
+            self._record_coverage(criteria, collection_name, first_position)
+            return
+
+        if position_key == 'index':
+            positions = range(first_position + page_size, total_results + 1, page_size)
+        else:
+            nb_pages = -(-total_results // page_size)
+            positions = range(first_position + 1, nb_pages + 1)
+
+        pages = self._map_in_order(
+            lambda position: self._search_page(criteria, collection_name, position_key, position),
+            positions, nb_workers, nb_workers * PAGES_PER_WORKER)
+        try:
+            for page in pages:
+                page_features = page.resto_features
+                del page
+                yield from page_features
+                if len(page_features) < page_size:
+                    # The result set shrank since the first page: no more features to expect.
+                    break
+                del page_features
+        finally:
+            pages.close()
+        self._record_coverage(criteria, collection_name, first_position)
+
+    def sync_by_criteria(self,
+                         criteria: Dict[str, Any],
+                         sync_state: DictSettingsJson,
+                         collection: Optional[str]=None) -> Iterator[RestoFeature]:
+        """
+        Search a collection using criteria and iterate over the features published or updated
+        since the previous synchronization with the same collection and criteria.
+
+        A watermark recorded in sync_state for the collection and the criteria gives the latest
+        update date of the features retrieved so far, with the identifiers of the features
+        updated at that date. Only the features updated since the day of the watermark are
+        requested, and those which were already retrieved are skipped. The page size given by
+        maxRecords is not part of the criteria identifying the synchronization. The pagination
+        progress is saved in sync_state after each page, such that an interrupted
+        synchronization resumes at the page where it stopped, retrieving that page again.
+
+        :param criteria: the criteria to use for the search
+        :param sync_state: the settings where watermarks and progress are saved
+        :param collection: the name of the collection to search
+        :returns: an iterator over the features published or updated since the last
+                  synchronization, or over all the features found for the first one.
+        """
+        collection_name = self._collections_mgr.ensure_collection(collection)
+        sync_criteria = {key: value for key, value in criteria.items()
+                         if key not in ('page', 'index')}
+        # The page size does not change the features found: it is not part of the key.
+        key_criteria = {key: value for key, value in sync_criteria.items() if key != 'maxRecords'}
+        sync_key = '{}:{}'.format(collection_name,
+                                  json.dumps(key_criteria, sort_keys=True, default=str))
+        sync_entry = sync_state.setdefault(sync_key, {})
+        watermark = sync_entry.get('watermark')
+        watermark_ids = set(sync_entry.get('watermark_ids', []))
+        max_records = sync_criteria.get('maxRecords')
+        pending = sync_entry.get('pending')
+        if pending is None or pending.get('max_records') != max_records:
+            # Pages of another size cannot be resumed: restart from the first one.
+            latest_update = watermark if pending is None else pending['latest_update']
+            latest_ids = sorted(watermark_ids) if pending is None else pending.get('latest_ids', [])
+            sync_entry['pending'] = {'since': None if watermark is None else watermark[:10],
+                                     'until': datetime.utcnow().strftime('%Y-%m-%d'),
+                                     'page': 1, 'page_size': None, 'max_records': max_records,
+                                     'latest_update': latest_update, 'latest_ids': latest_ids}
+            sync_state.save()
+        pending = sync_entry['pending']
+        pending.setdefault('latest_ids', [])
+        sync_criteria.update(self._get_updated_criteria(pending['since'], pending['until']))
+        while True:
+            page = self._search_page(sync_criteria, collection_name, 'page', pending['page'])
+            for feature in page.resto_features:
+                updated = feature.properties.get('updated')
+                # Features updated at the watermark itself may not have all been retrieved.
+                if watermark is None or updated is None or updated > watermark or \
+                        (updated == watermark and feature['id'] not in watermark_ids):
+                    yield feature
+                if updated is None:
+                    continue
+                if pending['latest_update'] is None or updated > pending['latest_update']:
+                    pending['latest_update'] = updated
+                    pending['latest_ids'] = [feature['id']]
+                elif updated == pending['latest_update'] and \
+                        feature['id'] not in pending['latest_ids']:
+                    pending['latest_ids'].append(feature['id'])
+            nb_page_features = len(page.resto_features)
+            if pending['page_size'] is None:
+                pending['page_size'] = nb_page_features
+            nb_features = (pending['page'] - 1) * pending['page_size'] + nb_page_features
+            pending['page'] += 1
+            if nb_page_features < pending['page_size'] or nb_page_features == 0 or \
+                    (page.total_results is not None and nb_features >= page.total_results):
+                break
+            sync_state.save()
+        sync_entry['watermark'] = pending['latest_update']
+        sync_entry['watermark_ids'] = pending['latest_ids']
+        del sync_entry['pending']
+        sync_state.save()
+
+    def _get_updated_criteria(self, since: Optional[str], until: str) -> Dict[str, str]:
+        """
+        :param since: the first day of update of the features to search, or None for all.
+        :param until: the last day of update of the features to search
+        :returns: the criteria selecting the features updated in this interval, using those
+                  supported by the protocol of this service.
+        """
+        if since is None:
+            return {}
+        if 'updatedFrom' in get_criteria_for_protocol(self.get_protocol()):
+            return {'updatedFrom': since}
+        return {'updated': '{}:{}'.format(since, max(since, until))}
+
+    def local_search(self,
+                     criteria: Dict[str, Any],
+                     collection: Optional[str]=None,
+                     nb_workers: int=1) -> RestoFeatureCollection:
+        """
+        Search a collection using criteria, answering from the feature index of the server when
+        the search is covered by completed searches recorded in it.
+
+        Otherwise all the result pages are requested from the server, which records the features
+        and the search in the index for the next time.
+
+        :param criteria: the criteria to use for the search
+        :param collection: the name of the collection to search
+        :param nb_workers: maximum number of pages requested simultaneously from the server
+        :returns: a feature collection with all the features found
+        :raises RestoClientDesignError: when the server has no feature index.
+        """
+        feature_index = self.parent_server.feature_index
+        if feature_index is None:
+            raise RestoClientDesignError('local_search() requires a server with a feature index')
+        collection_name = self._collections_mgr.ensure_collection(collection)
+        features = feature_index.search(collection_name, criteria)
+        origin = 'local'
+        if features is None:
+            features = list(self.harvest_by_criteria(criteria, collection_name, nb_workers))
+            origin = 'server'
+        properties = {'id': '{}_{}'.format(origin, collection_name), 'query': criteria,
+                      'totalResults': len(features), 'startIndex': 1,
+                      'itemsPerPage': len(features)}
+        return RestoFeatureCollection({'type': 'FeatureCollection', 'properties': properties,
+                                       'features': [dict(feature, type='Feature')
+                                                    for feature in features]})
+
+    def _record_coverage(self, criteria: Dict[str, Any], collection_name: str,
+                         first_position: int) -> None:
+        """
+        Record a search whose results have all been retrieved in the feature index, if any.
+
+        :param criteria: the criteria of the search
+        :param collection_name: the name of the collection searched
+        :param first_position: the first page or index retrieved
+        """
+        feature_index = self.parent_server.feature_index
+        if feature_index is not None and first_position == 1:
+            feature_index.record_coverage(collection_name, criteria)
+
+    def split_search_by_criteria(self,
+                                 criteria: Dict[str, Any],
+                                 collection: Optional[str]=None,
+                                 max_results: int=DEFAULT_MAX_RESULTS_PER_QUERY,
+                                 nb_workers: int=1) -> Iterator[RestoFeature]:
+        """
+        Search a collection using criteria which may return too many results for a single query,
+        and iterate over all the features found.
+
+        The search is split into time slices or spatial tiles until each sub-query returns at
+        most max_results results. Sub-queries are run concurrently, a bounded number of them in
+        advance, and their features are yielded in the order of the sub-queries. The features
+        found by several of them are yielded only once.
+
+        :param criteria: the criteria to use for the search
+        :param collection: the name of the collection to search
+        :param max_results: maximum number of results expected from a single query
+        :param nb_workers: maximum number of sub-queries run simultaneously
+        :returns: an iterator over the features found, without duplicates
+        """
+        collection_name = self._collections_mgr.ensure_collection(collection)
+        planned_criteria = self.plan_search(criteria, collection_name, max_results, nb_workers)
+        seen_ids = set()
+        # Each worker holds the features of a single sub-query until they are yielded.
+        sub_results = self._map_in_order(
+            lambda sub_criteria: list(self.iter_search_by_criteria(sub_criteria,
+                                                                   collection_name)),
+            planned_criteria, nb_workers, nb_workers)
+        try:
+            for features in sub_results:
+                for feature in features:
+                    if feature['id'] not in seen_ids:
+                        seen_ids.add(feature['id'])
+                        yield feature
+                del features
+        finally:
+            sub_results.close()
+
+    def plan_search(self,
+                    criteria: Dict[str, Any],
+                    collection_name: str,
+                    max_results: int=DEFAULT_MAX_RESULTS_PER_QUERY,
+                    nb_workers: int=1) -> List[Dict[str, Any]]:
+        """
+        Split search criteria into sub-criteria returning at most max_results results each,
+        when possible. The results of the sub-criteria are counted level by level, those of a
+        level being counted concurrently. Sub-criteria which still return too many results once
+        they cannot be split any further, or once MAX_SUB_QUERIES is reached, are kept as they
+        are, with a warning.
+
+        :param criteria: the criteria to use for the search
+        :param collection_name: the name of the collection to search
+        :param max_results: maximum number of results expected from a single query
+        :param nb_workers: maximum number of counting queries sent simultaneously
+        :returns: the criteria of the sub-queries to run
+        """
+        criteria = dict(criteria)
+        region = criteria.pop('region', None)
+        if region is not None and 'geometry' not in criteria:
+            # Regions are split through the geometry which they define.
+            region_criteria = RestoCriteria(self.get_protocol(), region=region)
+            if 'geometry' in region_criteria:
+                criteria['geometry'] = region_criteria['geometry']
+        # Sub-criteria in the order of the time slices or tiles, with the number of splits which
+        # produced them and whether their results must be counted.
+        sub_queries: List[Tuple[Dict[str, Any], int, bool]] = [(criteria, 0, True)]
+        with ThreadPoolExecutor(max_workers=nb_workers) as executor:
+            while any(to_count for _, _, to_count in sub_queries):
+                totals = iter(executor.map(
+                    lambda sub_criteria: self._count_results(sub_criteria, collection_name),
+                    [sub_criteria for sub_criteria, _, to_count in sub_queries if to_count]))
+                next_sub_queries: List[Tuple[Dict[str, Any], int, bool]] = []
+                nb_sub_queries = len(sub_queries)
+                for sub_criteria, depth, to_count in sub_queries:
+                    total_results = next(totals) if to_count else None
+                    split_sub_criteria = None
+                    if total_results is not None and total_results > max_results:
+                        if depth < MAX_SPLIT_DEPTH:
+                            split_sub_criteria = split_criteria(sub_criteria)
+                        if (split_sub_criteria is not None and
+                                nb_sub_queries + len(split_sub_criteria) - 1 > MAX_SUB_QUERIES):
+                            split_sub_criteria = None
+                        if split_sub_criteria is None:
+                            msg = 'Search with criteria {} cannot be split further and returns ' \
+                                '{} results, more than {}.'
+                            warn(msg.format(sub_criteria, total_results, max_results))
+                    if split_sub_criteria is None:
+                        next_sub_queries.append((sub_criteria, depth, False))
+                    else:
+                        nb_sub_queries += len(split_sub_criteria) - 1
+                        next_sub_queries.extend((split_criterion, depth + 1, True)
+                                                for split_criterion in split_sub_criteria)
+                sub_queries = next_sub_queries
+        return [sub_criteria for sub_criteria, _, _ in sub_queries]
+
+    def _count_results(self, criteria: Dict[str, Any], collection_name: str) -> Optional[int]:
+        """
+        :param criteria: the criteria of a search
+        :param collection_name: the name of the collection to search
+        :returns: the total number of results of the search, as given by the server, by
+                  requesting a single feature.
+        """
+        probe_criteria = dict(criteria, maxRecords=1)
+        probe_criteria.pop('index', None)
+        return self._search_page(probe_criteria, collection_name, 'page', 1).total_results
+
+    @staticmethod
+    def _map_in_order(function: Callable[[Any], Any], arguments: Iterable[Any],
+                      nb_workers: int, max_pending: int) -> Generator[Any, None, None]:
+        """
+        Apply a function to several arguments in worker threads and iterate over the results in
+        the order of the arguments. At most max_pending calls are submitted in advance, whose
+        results are buffered until the previous ones have been consumed.
+
+        :param function: the function to apply
+        :param arguments: the arguments to which the function is applied, one at a time.
+        :param nb_workers: maximum number of calls run simultaneously
+        :param max_pending: maximum number of calls submitted and not yet consumed.
+        :returns: an iterator over the results of the function. Pending calls are cancelled
+                  when it is closed before its end.
+        """
+        arguments_iterator = iter(arguments)
+        # Calls being run, in the order of their arguments: this is the reorder buffer.
+        pending_results: Deque[Future] = deque()
+        executor = ThreadPoolExecutor(max_workers=nb_workers)
+        try:
+            while True:
+                for argument in islice(arguments_iterator, max_pending - len(pending_results)):
+                    pending_results.append(executor.submit(function, argument))
+                if not pending_results:
+                    break
+                yield pending_results.popleft().result()
+        finally:
+            for pending_result in pending_results:
+                pending_result.cancel()
+            executor.shutdown(wait=False)
+
+    @staticmethod
+    def _get_first_position(criteria: Dict[str, Any]) -> Tuple[str, int]:
+        """
+        :param criteria: the criteria of a search
+        :returns: the criterion used to walk through the result pages, 'index' if it is specified
+                  in the criteria, 'page' otherwise, and its value for the first page.
+        """
+        position_key = 'index' if 'index' in criteria else 'page'
+        return position_key, int(criteria.get(position_key, 1))
+
+    def _search_page(self, criteria: Dict[str, Any], collection_name: str,
+                     position_key: str, position: int) -> RestoFeatureCollection:
+        """
+        Search one page of results.
+
+        :param criteria: the criteria to use for the search
+        :param collection_name: the name of the collection to search
+        :param position_key: the criterion giving the page to retrieve: 'page' or 'index'
+        :param position: the value of the position criterion
+        :returns: the page of results
+        """
+        return self._build_search_request(criteria, collection_name, position_key,
+                                          position).run()
+
+    def _build_search_request(self, criteria: Dict[str, Any], collection_name: str,
+                              position_key: str, position: int) -> SearchCollectionRequest:
+        """
+        Build the request searching one page of results.
+
+        :param criteria: the criteria to use for the search
+        :param collection_name: the name of the collection to search
+        :param position_key: the criterion giving the page to retrieve: 'page' or 'index'
+        :param position: the value of the position criterion
+        :returns: the request searching the page
+        """
+        page_criteria = dict(criteria)
+        page_criteria[position_key] = position
+        resto_criteria = RestoCriteria(self.get_protocol(), **page_criteria)
+        return SearchCollectionRequest(self, collection_name, criteria=resto_criteria)
 
     def get_feature_by_id(self,
                           feature_id: str,
-                          collection: Optional[str]=None) -> RestoFeature:
+                          collection: Optional[str]=None,
+                          use_cache: bool=True) -> RestoFeature:
         """
         Get a feature from a collection using its identifier.
 
         :param feature_id: the feature id (not uuid) to search for
         :param collection: the name of the collection to search
+        :param use_cache: when False, the feature is requested from the server even if a search
+                          response for it is still in the cache.
         :returns: the requested feature
         :raises IndexError: when the feature collection does not contain exactly one feature.
         :raises InconsistentResponse: when the retrieved feature has not the right id
@@ -158,9 +638,85 @@ class RestoService(BaseService):
         collection_name = self._collections_mgr.ensure_collection(collection)
         criteria = RestoCriteria(self.get_protocol(), identifier=feature_id)
 
-        feature_collection = \
-            SearchCollectionRequest(self, collection_name, criteria=criteria).run()
+        search_request = SearchCollectionRequest(self, collection_name, criteria=criteria)
+        search_request.use_cache = use_cache
+        return self.select_feature(search_request.run(), feature_id)
+
+    def get_features_by_ids(self,
+                            features_ids: List[str],
+                            collection: Optional[str]=None,
+                            nb_workers: int=1) -> List[RestoFeature]:
+        """
+        Get several features from a collection using their identifiers.
+
+        When the protocol supports the identifiers criterion, the identifiers are resolved by
+        chunks of IDS_PER_QUERY with one search per chunk. Identifiers which cannot be resolved
+        that way are looked up one by one. Searches are run concurrently.
+
+        :param features_ids: the features ids (not uuid) to search for
+        :param collection: the name of the collection to search
+        :param nb_workers: maximum number of searches run simultaneously
+        :returns: the requested features, in the order of their identifiers
+        :raises IndexError: when a feature cannot be found or several features have its id.
+        :raises InconsistentResponse: when a retrieved feature has not the right id
+                                      (case where uuid incorrectly provided as argument)
+        """
+        collection_name = self._collections_mgr.ensure_collection(collection)
+        unique_ids = list(dict.fromkeys(features_ids))
+        features_by_id: Dict[str, RestoFeature] = {}
+        with ThreadPoolExecutor(max_workers=nb_workers) as executor:
+            if 'identifiers' in get_criteria_for_protocol(self.get_protocol()):
+                chunks = [unique_ids[index:index + IDS_PER_QUERY]
+                          for index in range(0, len(unique_ids), IDS_PER_QUERY)]
+                for found_features in executor.map(
+                        lambda chunk: self._search_ids(chunk, collection_name), chunks):
+                    features_by_id.update(found_features)
+            missing_ids = [feature_id for feature_id in unique_ids
+                           if feature_id not in features_by_id]
+            missing_features = executor.map(
+                lambda feature_id: self.get_feature_by_id(feature_id, collection_name),
+                missing_ids)
+            features_by_id.update(zip(missing_ids, missing_features))
+        return [features_by_id[feature_id] for feature_id in features_ids]
+
+    def _search_ids(self, features_ids: List[str], collection_name: str) -> Dict[str, RestoFeature]:
+        """
+        Search several features in a single request using the identifiers criterion.
+
+        :param features_ids: the features ids (not uuid) to search for
+        :param collection_name: the name of the collection to search
+        :returns: the features found, indexed by their requested identifier. Identifiers matching
+                  no feature or several features are left out.
+        """
+        criteria = RestoCriteria(self.get_protocol(), identifiers=','.join(features_ids),
+                                 maxRecords=str(len(features_ids)))
+        feature_collection = SearchCollectionRequest(self, collection_name, criteria=criteria).run()
+        requested_ids = set(features_ids)
+        features_by_id: Dict[str, RestoFeature] = {}
+        ambiguous_ids = set()
+        for feature in feature_collection.resto_features:
+            feature_id = feature.product_identifier
+            if feature_id in requested_ids:
+                if feature_id in features_by_id:
+                    ambiguous_ids.add(feature_id)
+                features_by_id[feature_id] = feature
+        for feature_id in ambiguous_ids:
+            del features_by_id[feature_id]
+        return features_by_id
+
+    @staticmethod
+    def select_feature(feature_collection: RestoFeatureCollection,
+                       feature_id: str) -> RestoFeature:
+        """
+        Get the feature found by a search on its identifier.
 
+        :param feature_collection: the result of the search
+        :param feature_id: the feature id (not uuid) searched for
+        :returns: the requested feature
+        :raises IndexError: when the feature collection does not contain exactly one feature.
+        :raises InconsistentResponse: when the retrieved feature has not the right id
+                                      (case where uuid incorrectly provided as argument)
+        """
         if len(feature_collection['features']) > 1:
             raise IndexError('Several results found for id {}'.format(feature_id))
         if not feature_collection['features']:
@@ -202,7 +758,9 @@ class RestoService(BaseService):
     def download_feature_file(self,
                               feature: RestoFeature,
                               file_type: str,
-                              download_dir: Path) -> None:
+                              download_dir: Path,
+                              progress_bar: Optional[tqdm] = None,
+                              checksum_retries: int = DEFAULT_CHECKSUM_RETRIES) -> None:
         """
         Download one of the files associated to a feature : product, quicklook, thumbnail, annexes.
 
@@ -210,7 +768,12 @@ class RestoService(BaseService):
         :param file_type: the type of the file to donwload. Can be one of  'product', 'quicklook',
                           'thumbnail', 'annexes'.
         :param download_dir: the directory where downloaded file must be recorded.
+        :param progress_bar: a progress bar shared by several downloads, or None for using a
+                             progress bar dedicated to this download.
+        :param checksum_retries: number of times the download is restarted when the downloaded
+                                 file does not fit its checksum.
         :raises RestoClientDesignError: when the file_type is not supported.
+        :raises ChecksumMismatchError: when the file still does not fit its checksum after retries.
         """
         if file_type not in self.DOWNLOAD_REQUEST_CLASSES:
             msg = 'Unexpected file to download : {} can be {}'
@@ -218,7 +781,8 @@ class RestoService(BaseService):
                                                     self.DOWNLOAD_REQUEST_CLASSES.keys()))
 
         download_req_cls = self.DOWNLOAD_REQUEST_CLASSES[file_type]
-        download_req = download_req_cls(self, feature, download_directory=download_dir)
+        download_req = download_req_cls(self, feature, download_directory=download_dir,
+                                        progress_bar=progress_bar)
         # Do download
         try:
             download_req.run()
@@ -226,15 +790,25 @@ class RestoService(BaseService):
             # Launch request for signing license:
             self.sign_license(excp.error_response.license_to_sign)
             # Retry file download after license signature
-            self.download_feature_file(feature, file_type, download_dir)
+            self.download_feature_file(feature, file_type, download_dir, progress_bar,
+                                       checksum_retries)
+        except ChecksumMismatchError as excp:
+            if checksum_retries <= 0:
+                raise
+            warn('{} Restarting download.'.format(excp))
+            self.download_feature_file(feature, file_type, download_dir, progress_bar,
+                                       checksum_retries - 1)
         except FeatureOnTape as excp:
             warn('Waiting 60 seconds for product transfert...')
             # Wait 60 second
             time.sleep(60)
             # Redo_feature to update the storage status
-            redo_feature = self.get_feature_by_id(feature.product_identifier)
+            redo_feature = self.get_feature_by_id(feature.product_identifier, use_cache=False)
             # Retry file download after product staging
-            self.download_feature_file(redo_feature, file_type, download_dir)
+            self.download_feature_file(redo_feature, file_type, download_dir, progress_bar,
+                                       checksum_retries)
+            feature.downloaded_files_paths.update(redo_feature.downloaded_files_paths)
+            feature.downloaded_files_verified.update(redo_feature.downloaded_files_verified)
 
     def __str__(self) -> str:
         msg_fmt = '{}current collection: {}\n'
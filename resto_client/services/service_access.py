@@ -315,7 +315,8 @@ class RestoServiceAccess(ServiceAccess):
                     'method': 'get',
                     'accept': 'application/json',
                     'authentication': 'NEVER',
-                    'streamed': 'NO'},
+                    'streamed': 'NO',
+                    'caching_duration': 1800},
                 'SearchCollectionRequest': {
                     'rel_url': 'api/collections/{collection}/search.json?{criteria_url}',
                     'method': 'get',
@@ -56,5 +56,8 @@ class DictSettingsJson(dict):
         """
         Save the settings in the associated json file.
         """
-        with open(self.filepath, 'w') as file_desc:
+        # Write a temporary file first, such that an interruption never leaves a partial file.
+        tmp_filepath = self.filepath.with_name(self.filepath.name + '.tmp')
+        with open(tmp_filepath, 'w') as file_desc:
             json.dump(self, file_desc)
+        tmp_filepath.replace(self.filepath)
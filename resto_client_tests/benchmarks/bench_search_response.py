@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+.. admonition:: License
+
+   Copyright 2019 CNES
+
+   Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+   in compliance with the License. You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software distributed under the License
+   is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+   or implied. See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+import copy
+import timeit
+from typing import Any, Callable  # @NoMove
+from unittest.mock import MagicMock
+
+from resto_client.responses.feature_collection_response import FeatureCollectionResponse
+
+
+NB_FEATURES = 500
+NB_FOOTPRINT_POINTS = 100
+NB_RUNS = 20
+
+
+def build_search_response(nb_features: int=NB_FEATURES) -> dict:
+    """
+    :param nb_features: number of features in the response
+    :returns: a json search response similar to those of resto servers, with detailed footprints.
+    """
+    features = []
+    for index in range(nb_features):
+        footprint = [[1. + point * 1e-3, 43. + point * 1e-3]
+                     for point in range(NB_FOOTPRINT_POINTS)]
+        properties = {'productIdentifier': 'PRODUCT_{}'.format(index),
+                      'startDate': '2020-01-01T10:00:00Z', 'completionDate': '2020-01-01T10:00:10Z',
+                      'platform': 'SENTINEL2A', 'cloudCover': 12.5,
+                      'title': 'Product {}'.format(index),
+                      'services': {'download': {'url': 'https://resto/{}/download'.format(index),
+                                                'mimeType': 'application/zip', 'size': 1000}},
+                      'keywords': [{'name': 'keyword_{}'.format(keyword), 'id': keyword}
+                                   for keyword in range(20)]}
+        features.append({'type': 'Feature', 'id': 'uuid_{}'.format(index),
+                         'geometry': {'type': 'Polygon', 'coordinates': [footprint]},
+                         'properties': properties})
+    return {'type': 'FeatureCollection', 'features': features,
+            'properties': {'id': 'search', 'totalResults': nb_features, 'startIndex': 1}}
+
+
+def time_it(function: Callable[[], Any]) -> float:
+    """
+    :param function: the function to time
+    :returns: the best time of the function over NB_RUNS runs, in milliseconds
+    """
+    return min(timeit.repeat(function, number=1, repeat=NB_RUNS)) * 1000.
+
+
+def main() -> None:
+    """
+    Compare the processing time of a search response with and without the deep copies which
+    were done by the identification and the normalization of the responses.
+    """
+    response = build_search_response()
+    request = MagicMock(debug=False)
+
+    def process_response() -> None:
+        FeatureCollectionResponse(request, response).as_resto_object()
+
+    def process_response_with_copies() -> None:
+        # Former identification and normalization: two deep copies of the response.
+        copy.deepcopy(response)
+        copy.deepcopy(response)
+        process_response()
+
+    with_copies = time_it(process_response_with_copies)
+    without_copies = time_it(process_response)
+    print('Search response with {} features'.format(NB_FEATURES))
+    print('  with deep copies    : {:8.1f} ms'.format(with_copies))
+    print('  without deep copies : {:8.1f} ms'.format(without_copies))
+    print('  speedup             : {:8.1f}x'.format(with_copies / without_copies))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+.. admonition:: License
+
+   Copyright 2019 CNES
+
+   Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+   in compliance with the License. You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software distributed under the License
+   is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+   or implied. See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+import unittest
+
+from shapely.geometry import box, mapping
+
+from resto_client.entities.footprint_index import FootprintIndex
+from resto_client.entities.resto_feature import CompactRestoFeature
+
+
+def make_feature(feature_id: str, footprint: dict) -> CompactRestoFeature:
+    """
+    :param feature_id: identifier of the feature
+    :param footprint: GeoJSON geometry of the feature, or None
+    :returns: a minimal resto feature with this footprint
+    """
+    return CompactRestoFeature({'type': 'Feature', 'id': 'uuid_' + feature_id,
+                                'geometry': footprint,
+                                'properties': {'productIdentifier': feature_id}})
+
+
+class UTestFootprintIndex(unittest.TestCase):
+    """
+    Unit Tests of the FootprintIndex class
+    """
+
+    def setUp(self) -> None:
+        self.index = FootprintIndex(iter([make_feature('west', mapping(box(0., 0., 2., 2.))),
+                                          make_feature('none', None),
+                                          make_feature('east', mapping(box(2., 0., 4., 2.))),
+                                          make_feature('far', mapping(box(10., 10., 11., 11.)))]))
+
+    def test_n_intersecting(self) -> None:
+        """
+        Unit test of the features intersecting or covering an area of interest
+        """
+        self.assertEqual(len(self.index), 4)
+        features = self.index.intersecting(box(1., 1., 3., 3.))
+        self.assertEqual([feature.product_identifier for feature in features], ['west', 'east'])
+        features = self.index.covering(box(0.5, 0.5, 1.5, 1.5))
+        self.assertEqual([feature.product_identifier for feature in features], ['west'])
+        self.assertEqual(self.index.covering(box(1., 1., 3., 1.5)), [])
+
+    def test_n_coverage_fraction(self) -> None:
+        """
+        Unit test of the fraction of an area of interest covered by the footprints
+        """
+        self.assertAlmostEqual(self.index.coverage_fraction(box(1., 1., 3., 3.)), 0.5)
+        self.assertAlmostEqual(self.index.coverage_fraction(box(0.5, 0.5, 3.5, 1.5)), 1.)
+        self.assertEqual(self.index.coverage_fraction(box(20., 20., 21., 21.)), 0.)
@@ -148,11 +148,18 @@ class UTestRestoCriteria(unittest.TestCase):
         self.assertEqual(resto_criteria['geometry'], polygon)
         # Verify that region criteria is not created by only geometry one
         self.assertFalse('region' in resto_criteria)
+        # Verify that the region itself is kept, which is smaller than its convex hull.
+        self.assertEqual(resto_criteria.region_geometry.convex_hull.wkt, polygon)
+        self.assertLess(resto_criteria.region_geometry.area,
+                        resto_criteria.region_geometry.convex_hull.area)
+        self.assertTrue(resto_criteria.region_prepared.intersects(resto_criteria.region_geometry))
 
         # Verify that geometry criteria is erased when identifier criteria is specified.
         resto_criteria1 = RestoCriteria('dotcloud', **{'region': 'alpes.geojson'})
         resto_criteria1['identifier'] = 'alpes.geojson'
         self.assertFalse('geometry' in resto_criteria1)
+        self.assertIsNone(resto_criteria1.region_geometry)
+        self.assertIsNone(resto_criteria1.region_prepared)
 
     def test_n_retrieve_criterion(self) -> None:
         """
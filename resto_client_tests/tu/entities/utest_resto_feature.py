@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+.. admonition:: License
+
+   Copyright 2019 CNES
+
+   Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+   in compliance with the License. You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software distributed under the License
+   is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+   or implied. See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+import json
+import unittest
+
+from resto_client.entities.resto_feature import RestoFeature, CompactRestoFeature
+
+
+FEATURE_DESCR = {'type': 'Feature', 'id': 'uuid_f1',
+                 'geometry': {'type': 'Point', 'coordinates': [1., 43.]},
+                 'properties': {'productIdentifier': 'f1', 'productType': 'REFLECTANCE',
+                                'annexes': json.dumps([{'name': 'doc', 'url': 'http://a/doc'}]),
+                                'services': {'download': {'url': 'http://a/f1', 'size': '12',
+                                                          'checksum': 'md5:00'}},
+                                'keywords': [{'name': 'Europe'}],
+                                'license': 'unlicensed',
+                                'license_info': {'en': {'short_name': 'Free'}}}}
+
+
+class UTestCompactRestoFeature(unittest.TestCase):
+    """
+    Unit Tests of the CompactRestoFeature class
+    """
+
+    def test_n_accessors(self) -> None:
+        """
+        Unit test of the accessors of a compact feature, which must match those of a RestoFeature
+        """
+        compact_feature = CompactRestoFeature(FEATURE_DESCR)
+        feature = RestoFeature(json.loads(json.dumps(FEATURE_DESCR)))
+        self.assertFalse(hasattr(compact_feature, '__dict__'))
+        self.assertEqual(compact_feature.product_identifier, 'f1')
+        self.assertEqual(compact_feature.product_size, feature.product_size)
+        self.assertEqual(compact_feature.download_product_url, feature.download_product_url)
+        self.assertEqual(compact_feature.download_annexes_url, 'http://a/doc')
+        self.assertIs(compact_feature.download_annexes_service,
+                      compact_feature.download_annexes_service)
+        self.assertEqual(compact_feature.license.short_name, 'Free')
+        self.assertEqual(compact_feature.license, feature.license)
+        # The description used to build the compact feature must not be modified.
+        self.assertIn('license', FEATURE_DESCR['properties'])
+
+    def test_n_to_geojson(self) -> None:
+        """
+        Unit test of the GeoJSON rebuilt from a compact feature and of the conversions
+        """
+        compact_feature = CompactRestoFeature(FEATURE_DESCR)
+        self.assertEqual(compact_feature.to_geojson(), FEATURE_DESCR)
+        compact_feature.downloaded_files_paths['product'] = 'f1.zip'
+        feature = compact_feature.to_feature()
+        self.assertEqual(feature.downloaded_files_paths, {'product': 'f1.zip'})
+        converted_feature = CompactRestoFeature.from_feature(feature)
+        self.assertEqual(converted_feature.properties, compact_feature.properties)
+        self.assertEqual(converted_feature.license, compact_feature.license)
+        self.assertEqual(converted_feature.to_geojson(), FEATURE_DESCR)
+        self.assertEqual(converted_feature.downloaded_files_paths, {'product': 'f1.zip'})
+        self.assertIn('Metadata available for product f1', str(compact_feature))
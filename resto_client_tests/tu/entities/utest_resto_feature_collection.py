@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+.. admonition:: License
+
+   Copyright 2019 CNES
+
+   Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+   in compliance with the License. You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software distributed under the License
+   is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+   or implied. See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+import json
+from typing import Optional  # @NoMove
+import unittest
+
+from shapely.geometry import box, mapping
+from shapely.prepared import prep
+
+from resto_client.entities.resto_feature_collection import RestoFeatureCollection
+
+
+def make_page(features_ids: list, footprints: Optional[list]=None) -> RestoFeatureCollection:
+    """
+    :param features_ids: identifiers of the features in the page
+    :param footprints: GeoJSON geometries of the features, None by default
+    :returns: a feature collection holding minimal features with these identifiers
+    """
+    if footprints is None:
+        footprints = [None] * len(features_ids)
+    features = [{'type': 'Feature', 'id': 'uuid_' + feature_id, 'geometry': footprint,
+                 'properties': {'productIdentifier': feature_id}}
+                for feature_id, footprint in zip(features_ids, footprints)]
+    return RestoFeatureCollection({'type': 'FeatureCollection', 'features': features,
+                                   'properties': {'id': 'search', 'totalResults': 4}})
+
+
+class UTestRestoFeatureCollection(unittest.TestCase):
+    """
+    Unit Tests of the RestoFeatureCollection class
+    """
+
+    def test_n_get_feature(self) -> None:
+        """
+        Unit test of get_feature by identifier and by uuid
+        """
+        page = make_page(['f1', 'f2'])
+        self.assertEqual(page.get_feature('f2').id, 'uuid_f2')
+        self.assertIs(page.get_feature('uuid_f1'), page.get_feature('f1'))
+        self.assertIs(page.all_id, page.all_id)
+        self.assertNotIn('_features_index', json.loads(json.dumps(page)))
+
+    def test_n_merge(self) -> None:
+        """
+        Unit test of the merge of several pages, with duplicated features
+        """
+        merged_page = make_page(['f1', 'f2'])
+        self.assertEqual(merged_page.all_id, ['f1', 'f2'])
+        self.assertEqual(merged_page.merge(make_page(['f2', 'f3'])), 1)
+        self.assertEqual(merged_page.merge(make_page(['f4'])), 1)
+        self.assertEqual(merged_page.all_id, ['f1', 'f2', 'f3', 'f4'])
+        self.assertEqual(len(merged_page['features']), 4)
+        self.assertEqual(merged_page.get_feature('f4').id, 'uuid_f4')
+
+    def test_d_get_feature(self) -> None:
+        """
+        Unit test of get_feature with unknown or ambiguous identifiers
+        """
+        page = make_page(['f1', 'f1'])
+        with self.assertRaises(KeyError):
+            page.get_feature('f1')
+        with self.assertRaises(KeyError):
+            page.get_feature('f2')
+
+    def test_n_filter_by_region(self) -> None:
+        """
+        Unit test of the removal of the features not intersecting a region
+        """
+        page = make_page(['inside', 'outside', 'unknown'],
+                         [mapping(box(0., 0., 1., 1.)), mapping(box(2., 2., 3., 3.)), None])
+        self.assertEqual(page.filter_by_region(box(0.5, 0.5, 1.5, 1.5)), 1)
+        self.assertEqual(page.nb_discarded, 1)
+        self.assertEqual(page.all_id, ['inside', 'unknown'])
+        self.assertEqual(len(page['features']), 2)
+        with self.assertRaises(KeyError):
+            page.get_feature('outside')
+        # Prepared regions, as held by the zone registry, are used as they are.
+        self.assertEqual(page.filter_by_region(prep(box(1.5, 1.5, 2.5, 2.5))), 1)
+        self.assertEqual(page.all_id, ['unknown'])
+        self.assertEqual(page.nb_discarded, 2)
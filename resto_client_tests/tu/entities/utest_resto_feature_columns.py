@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+.. admonition:: License
+
+   Copyright 2019 CNES
+
+   Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+   in compliance with the License. You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software distributed under the License
+   is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+   or implied. See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import unittest
+
+from shapely.geometry import Point
+
+from resto_client.entities.resto_feature import RestoFeature, CompactRestoFeature
+from resto_client.entities.resto_feature_columns import (HAS_NUMPY, HAS_PYARROW,
+                                                         RestoFeatureColumns)
+
+if HAS_NUMPY:
+    import numpy
+if HAS_PYARROW:
+    import pyarrow.parquet
+
+
+def make_feature_descr(index: int) -> dict:
+    """
+    :param index: index of the feature
+    :returns: a minimal resto feature description
+    """
+    properties = {'productIdentifier': 'f{}'.format(index), 'platform': 'SENTINEL2A',
+                  'startDate': '2020-01-0{}T10:00:00.500Z'.format(index + 1),
+                  'completionDate': '2020-01-01T12:00:00+02:00',
+                  'cloudCover': None if index else '12.5'}
+    return {'type': 'Feature', 'id': 'uuid_{}'.format(index),
+            'geometry': {'type': 'Point', 'coordinates': [1., 43.]}, 'properties': properties}
+
+
+@unittest.skipIf(not HAS_NUMPY, 'numpy is not installed')
+class UTestRestoFeatureColumns(unittest.TestCase):
+    """
+    Unit Tests of the RestoFeatureColumns class
+    """
+
+    def test_n_numpy_records(self) -> None:
+        """
+        Unit test of the conversion of features into numpy records
+        """
+        features = iter([RestoFeature(make_feature_descr(0)),
+                         CompactRestoFeature(make_feature_descr(1))])
+        records = RestoFeatureColumns(features).to_numpy_records()
+        self.assertEqual(list(records['product_identifier']), ['f0', 'f1'])
+        self.assertEqual(records['start_date'][1], numpy.datetime64('2020-01-02T10:00:00.500'))
+        self.assertEqual(records['completion_date'][0], numpy.datetime64('2020-01-01T10:00'))
+        self.assertEqual(records['cloud_cover'][0], 12.5)
+        self.assertTrue(numpy.isnan(records['cloud_cover'][1]))
+        self.assertTrue(numpy.isnat(records['updated'][0]))
+        self.assertEqual(records['geometry'][0], Point(1., 43.).wkb)
+
+    @unittest.skipIf(not HAS_PYARROW, 'pyarrow is not installed')
+    def test_n_write_parquet(self) -> None:
+        """
+        Unit test of the Parquet writer, with several batches
+        """
+        features = (RestoFeature(make_feature_descr(index)) for index in range(5))
+        with TemporaryDirectory() as temp_dir:
+            parquet_path = Path(temp_dir) / 'features.parquet'
+            nb_features = RestoFeatureColumns.write_parquet(features, parquet_path, batch_size=2)
+            table = pyarrow.parquet.read_table(str(parquet_path))
+        self.assertEqual(nb_features, 5)
+        self.assertEqual(table.column('product_identifier').to_pylist(),
+                         ['f0', 'f1', 'f2', 'f3', 'f4'])
+        self.assertEqual(table.column('cloud_cover').null_count, 4)
+        self.assertEqual(str(table.schema.field('start_date').type), 'timestamp[ms, tz=UTC]')
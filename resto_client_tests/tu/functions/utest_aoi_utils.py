@@ -14,9 +14,32 @@
    or implied. See the License for the specific language governing permissions and
    limitations under the License.
 """
+import json
+import os
+from pathlib import Path
+from tempfile import TemporaryDirectory
 import unittest
 
-from resto_client.functions.aoi_utils import LowerList, list_all_geojson, str_region_choice
+from shapely.geometry import box, mapping
+
+from resto_client.functions.aoi_utils import (LowerList, list_all_geojson, str_region_choice,
+                                              ZoneRegistry, PATH_AOI)
+
+
+def write_zone(zone_path: Path, size: float, mtime: int) -> None:
+    """
+    Write a zone file made of a single square.
+
+    :param zone_path: path of the zone file
+    :param size: size of the square
+    :param mtime: modification time to set on the file, in seconds
+    """
+    zone = {'type': 'FeatureCollection',
+            'features': [{'type': 'Feature', 'properties': {},
+                          'geometry': mapping(box(0., 0., size, size))}]}
+    with open(zone_path, 'w') as zone_file:
+        json.dump(zone, zone_file)
+    os.utime(zone_path, (mtime, mtime))
 
 
 class UTestAOIUtils(unittest.TestCase):
@@ -62,3 +85,39 @@ class UTestAOIUtils(unittest.TestCase):
         test_lower_list = LowerList(['henry', 'damieN'])
         other_list = ['henry', 'damien']
         self.assertTrue(other_list not in test_lower_list)
+
+
+class UTestZoneRegistry(unittest.TestCase):
+    """
+    Unit Tests of the ZoneRegistry class
+    """
+
+    def test_n_user_directory(self) -> None:
+        """
+        Unit test of the zones found in a user directory, which take precedence
+        """
+        with TemporaryDirectory() as temp_dir:
+            user_dir = Path(temp_dir)
+            registry = ZoneRegistry([PATH_AOI, user_dir / 'zones'])
+            self.assertEqual(registry.find('Bretagne.geojson'), PATH_AOI / 'Bretagne.geojson')
+            (user_dir / 'zones').mkdir()
+            write_zone(user_dir / 'zones' / 'Bretagne.geojson', 1., 1000)
+            write_zone(user_dir / 'zones' / 'MyZone.geojson', 1., 1000)
+            self.assertEqual(registry.find('bretagne'), user_dir / 'zones' / 'Bretagne.geojson')
+            self.assertIn('myzone', registry.names())
+            self.assertIsNone(registry.find('unknown'))
+
+    def test_n_zone_cache(self) -> None:
+        """
+        Unit test of the zone geometries, loaded again only when the file changes
+        """
+        with TemporaryDirectory() as temp_dir:
+            zone_path = Path(temp_dir) / 'Square.geojson'
+            write_zone(zone_path, 1., 1000)
+            registry = ZoneRegistry([Path(temp_dir)])
+            zone = registry.get_zone(zone_path)
+            self.assertIs(registry.get_zone(Path(temp_dir) / 'square.geojson'), zone)
+            self.assertEqual(zone.union.area, 1.)
+            self.assertTrue(zone.prepared.contains(box(0.2, 0.2, 0.8, 0.8)))
+            write_zone(zone_path, 2., 2000)
+            self.assertEqual(registry.get_zone(zone_path).union.area, 4.)
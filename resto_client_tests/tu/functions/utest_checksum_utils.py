@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""
+.. admonition:: License
+
+   Copyright 2019 CNES
+
+   Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+   in compliance with the License. You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software distributed under the License
+   is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+   or implied. See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+import hashlib
+from pathlib import Path
+import tempfile
+import unittest
+
+from resto_client.functions.checksum_utils import parse_checksum, file_checksum
+
+
+class UTestChecksumUtils(unittest.TestCase):
+    """
+    Unit Tests of the checksum_utils module
+    """
+
+    def test_n_parse_checksum(self) -> None:
+        """
+        Unit test of parse_checksum in nominal cases
+        """
+        md5_digest = 'D41D8CD98F00B204E9800998ECF8427E'
+        self.assertEqual(parse_checksum('md5:' + md5_digest), ('md5', md5_digest.lower()))
+        self.assertEqual(parse_checksum('MD5=' + md5_digest), ('md5', md5_digest.lower()))
+        self.assertEqual(parse_checksum(md5_digest), ('md5', md5_digest.lower()))
+        self.assertEqual(parse_checksum('SHA-256:' + 'a' * 64), ('sha256', 'a' * 64))
+
+    def test_d_parse_checksum(self) -> None:
+        """
+        Unit test of parse_checksum in degraded cases
+        """
+        self.assertIsNone(parse_checksum(None))
+        self.assertIsNone(parse_checksum(''))
+        self.assertIsNone(parse_checksum('unknown:abcd'))
+        self.assertIsNone(parse_checksum('abcd'))
+        self.assertIsNone(parse_checksum('md5:not hexadecimal'))
+
+    def test_n_file_checksum(self) -> None:
+        """
+        Unit test of file_checksum in nominal cases
+        """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = Path(tmp_dir) / 'file.bin'
+            file_path.write_bytes(b'resto_client')
+            self.assertEqual(file_checksum(file_path, 'md5'),
+                             hashlib.md5(b'resto_client').hexdigest())
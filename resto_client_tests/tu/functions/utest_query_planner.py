@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""
+.. admonition:: License
+
+   Copyright 2019 CNES
+
+   Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+   in compliance with the License. You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software distributed under the License
+   is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+   or implied. See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+import unittest
+
+from shapely import wkt
+
+from resto_client.functions.query_planner import split_criteria, split_dates, split_geometry
+
+
+class UTestQueryPlanner(unittest.TestCase):
+    """
+    Unit Tests of the query_planner module
+    """
+
+    def test_n_split_dates(self) -> None:
+        """
+        Unit test of split_criteria splitting a time interval
+        """
+        criteria = {'startDate': '2020-01-01', 'completionDate': '2020-01-31', 'box': '0,0,1,1'}
+        first, second = split_criteria(criteria)
+        self.assertEqual((first['startDate'], first['completionDate']),
+                         ('2020-01-01', '2020-01-16'))
+        self.assertEqual((second['startDate'], second['completionDate']),
+                         ('2020-01-16', '2020-01-31'))
+        self.assertEqual(first['box'], '0,0,1,1')
+        self.assertIsNone(split_dates({'startDate': '2020-01-01', 'completionDate': '2020-01-01'}))
+        self.assertIsNone(split_dates({'startDate': '2020-01-01', 'completionDate': '2020-01-02'}))
+
+    def test_n_split_box(self) -> None:
+        """
+        Unit test of split_criteria splitting a box along its largest dimension
+        """
+        sub_criteria = split_criteria({'box': '0,10,4,12'})
+        self.assertEqual([crit['box'] for crit in sub_criteria],
+                         ['0.0,10.0,2.0,12.0', '2.0,10.0,4.0,12.0'])
+        self.assertIsNone(split_criteria({'box': '0,10,0.015,10.01'}))
+
+    def test_n_split_geometry(self) -> None:
+        """
+        Unit test of split_geometry
+        """
+        geometry = 'POLYGON((0 0, 2 0, 2 4, 0 4, 0 0))'
+        sub_criteria = split_geometry({'geometry': geometry})
+        areas = [wkt.loads(crit['geometry']).area for crit in sub_criteria]
+        self.assertEqual(areas, [4., 4.])
+        self.assertIsNone(split_criteria({'geometry': 'POINT(1 1)'}))
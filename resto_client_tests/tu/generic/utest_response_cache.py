@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+.. admonition:: License
+
+   Copyright 2019 CNES
+
+   Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+   in compliance with the License. You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software distributed under the License
+   is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+   or implied. See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import sqlite3
+import unittest
+
+from resto_client.generic.response_cache import JsonFileCache, SQLiteCache
+
+
+class UTestResponseCache(unittest.TestCase):
+    """
+    Unit Tests of the response caches
+    """
+
+    def setUp(self) -> None:
+        self.temp_dir = TemporaryDirectory()
+        self.cache_dir = Path(self.temp_dir.name)
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_n_sqlite_cache(self) -> None:
+        """
+        Unit test of SQLiteCache in nominal cases
+        """
+        cache = SQLiteCache(self.cache_dir / 'cache.sqlite')
+        cache.put('key_1', {'features': [1, 2, 3]}, 60)
+        cache.put('key_2', {'features': []}, 0)
+        self.assertEqual(cache.get('key_1'), {'features': [1, 2, 3]})
+        self.assertIsNone(cache.get('key_2'))
+        cache.delete('key_1')
+        self.assertIsNone(cache.get('key_1'))
+
+    def test_n_sqlite_cache_eviction(self) -> None:
+        """
+        Unit test of SQLiteCache removing the least recently used responses
+        """
+        cache = SQLiteCache(self.cache_dir / 'cache.sqlite', max_bytes=200)
+        for index in range(3):
+            cache.put('key_{}'.format(index), {'data': list(range(index * 10, index * 10 + 30))},
+                      60)
+            # Keep the first response as the most recently used
+            cache.get('key_0')
+        self.assertIsNotNone(cache.get('key_0'))
+        self.assertIsNone(cache.get('key_1'))
+        self.assertIsNotNone(cache.get('key_2'))
+
+    def test_n_sqlite_cache_revalidation(self) -> None:
+        """
+        Unit test of SQLiteCache keeping expired responses which can be revalidated
+        """
+        cache = SQLiteCache(self.cache_dir / 'cache.sqlite')
+        cache.put('key_1', {'id': 'collections'}, 0, etag='"abc"')
+        self.assertIsNone(cache.get('key_1'))
+        entry = cache.get_entry('key_1')
+        self.assertTrue(entry.expired)
+        self.assertEqual(entry.conditional_headers, {'If-None-Match': '"abc"'})
+        cache.refresh('key_1', 60)
+        self.assertEqual(cache.get('key_1'), {'id': 'collections'})
+
+    def test_n_sqlite_cache_schema_version(self) -> None:
+        """
+        Unit test of SQLiteCache recreating a database with an older schema
+        """
+        db_path = self.cache_dir / 'cache.sqlite'
+        connection = sqlite3.connect(str(db_path))
+        connection.execute('CREATE TABLE responses (key TEXT PRIMARY KEY, content BLOB)')
+        connection.commit()
+        connection.close()
+        cache = SQLiteCache(db_path)
+        cache.put('key_1', {'id': 'collection'}, 60, last_modified='Mon, 06 Jan 2020 10:00:00 GMT')
+        self.assertEqual(cache.get_entry('key_1').last_modified, 'Mon, 06 Jan 2020 10:00:00 GMT')
+
+    def test_n_json_file_cache(self) -> None:
+        """
+        Unit test of JsonFileCache in nominal cases
+        """
+        cache = JsonFileCache(self.cache_dir)
+        cache.put('key_1', {'id': 'collection'}, 60)
+        cache.put('key_2', {'id': 'expired'}, -1)
+        self.assertEqual(cache.get('key_1'), {'id': 'collection'})
+        self.assertIsNone(cache.get('key_2'))
+        self.assertEqual([path.name for path in self.cache_dir.iterdir()], ['key_1.json'])
+        cache.put('key_3', {'id': 'revalidable'}, -1, etag='"abc"')
+        self.assertTrue(cache.get_entry('key_3').expired)
+        cache.refresh('key_3', 60)
+        self.assertEqual(cache.get('key_3'), {'id': 'revalidable'})
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+.. admonition:: License
+
+   Copyright 2019 CNES
+
+   Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+   in compliance with the License. You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software distributed under the License
+   is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+   or implied. See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+import io
+import json
+import unittest
+from unittest.mock import MagicMock
+
+from resto_client.base_exceptions import IncomprehensibleResponse
+from resto_client.requests import collections_requests
+from resto_client.requests.collections_requests import SearchCollectionRequest
+
+
+FEATURE_COLLECTION = {'type': 'FeatureCollection',
+                      'properties': {'id': 'search_1', 'totalResults': 12, 'startIndex': 1},
+                      'features': [{'type': 'Feature', 'id': 'uuid_{}'.format(index),
+                                    'geometry': {'type': 'Point', 'coordinates': [1.5, 43.]},
+                                    'properties': {'productIdentifier': 'f{}'.format(index),
+                                                   'cloudCover': 12.5}}
+                                   for index in range(3)]}
+
+
+@unittest.skipIf(collections_requests.ijson is None, 'ijson is not installed')
+class UTestSearchCollectionRequest(unittest.TestCase):
+    """
+    Unit Tests of the streamed parsing of the SearchCollectionRequest responses
+    """
+
+    def setUp(self) -> None:
+        self.request = SearchCollectionRequest.__new__(SearchCollectionRequest)
+        self.request.feature_collection_properties = {}
+        self.request.get_server_name = MagicMock(return_value='test')
+        self.request.debug = False
+
+    def test_n_parse_features(self) -> None:
+        """
+        Unit test of _parse_features in nominal cases
+        """
+        stream = io.BytesIO(json.dumps(FEATURE_COLLECTION).encode('utf-8'))
+        features = list(self.request._parse_features(stream))
+        self.assertEqual([feature.product_identifier for feature in features], ['f0', 'f1', 'f2'])
+        self.assertEqual(features[1]['id'], 'uuid_1')
+        self.assertEqual(features[1].properties['cloudCover'], 12.5)
+        self.assertEqual(self.request.feature_collection_properties['totalResults'], 12)
+        # Other members and properties given after the features
+        document = {'features': FEATURE_COLLECTION['features'], 'type': 'FeatureCollection',
+                    'links': [{'rel': 'self'}], 'query': {'count': 3},
+                    'properties': {'totalResults': 3}}
+        stream = io.BytesIO(json.dumps(document).encode('utf-8'))
+        self.assertEqual(len(list(self.request._parse_features(stream))), 3)
+        self.assertEqual(self.request.feature_collection_properties, {'totalResults': 3})
+
+    def test_d_parse_features(self) -> None:
+        """
+        Unit test of _parse_features with invalid responses
+        """
+        for document in (b'{"type": "Feature", "properties": {}, "features": []}',
+                         b'{"type": "FeatureCollection", "features": [{"type": "Feat',
+                         b'{"type": "FeatureCollection", "features": []}',
+                         b'{"type": "FeatureCollection", "properties": [], "features": []}',
+                         b'{"type": "FeatureCollection", "properties": {}, "features": {}}'):
+            with self.assertRaises(IncomprehensibleResponse):
+                list(self.request._parse_features(io.BytesIO(document)))
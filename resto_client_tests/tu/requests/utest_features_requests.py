@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""
+.. admonition:: License
+
+   Copyright 2019 CNES
+
+   Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+   in compliance with the License. You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software distributed under the License
+   is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+   or implied. See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+import hashlib
+import io
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import unittest
+from unittest.mock import MagicMock
+
+from requests.structures import CaseInsensitiveDict
+from tqdm import tqdm
+
+from resto_client.requests.features_requests import (ChecksumMismatchError,
+                                                     DownloadQuicklookRequest)
+
+
+class UTestDownloadRequest(unittest.TestCase):
+    """
+    Unit Tests of the download requests, without any server
+    """
+
+    def test_d_checksum_mismatch_progress(self) -> None:
+        """
+        Unit test of a file not matching its checksum, withdrawn from the shared progress bar
+        """
+        content = b'corrupted content'
+        request = DownloadQuicklookRequest.__new__(DownloadQuicklookRequest)
+        request.get_url = MagicMock(return_value='https://server/f1.jpg')
+        request._request_result = MagicMock(headers=CaseInsensitiveDict(),
+                                            raw=io.BytesIO(content))
+        request.parent_service = MagicMock()
+        request.parent_service.parent_server.download_block_size = 4
+        with tqdm(total=100, initial=40, file=io.StringIO()) as progress_bar:
+            request._progress_bar = progress_bar
+            with TemporaryDirectory() as temp_dir:
+                file_path = Path(temp_dir) / 'f1.jpg'
+                with self.assertRaises(ChecksumMismatchError):
+                    request.download_file(file_path, len(content),
+                                          'md5:' + hashlib.md5(b'content').hexdigest())
+                self.assertEqual(list(Path(temp_dir).iterdir()), [])
+            # The bar is back to its state before the download, ready for a retry.
+            self.assertEqual(progress_bar.total, 100)
+            self.assertEqual(progress_bar.n, 40)
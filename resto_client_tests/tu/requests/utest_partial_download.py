@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+.. admonition:: License
+
+   Copyright 2019 CNES
+
+   Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+   in compliance with the License. You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software distributed under the License
+   is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+   or implied. See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+from pathlib import Path
+import tempfile
+import unittest
+
+from resto_client.requests.partial_download import PartialDownload
+
+
+class UTestPartialDownload(unittest.TestCase):
+    """
+    Unit Tests of the PartialDownload class
+    """
+
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.file_path = Path(self.tmp_dir.name) / 'product.zip'
+        self.partial = PartialDownload(self.file_path, 'https://server/product', 100)
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_n_resumable_offset(self) -> None:
+        """
+        Unit test of resumable_offset in nominal cases
+        """
+        self.partial.part_path.write_bytes(b'x' * 40)
+        self.partial.write_sidecar('"etag1"')
+        self.assertEqual(self.partial.part_path.name, 'product.zip.part')
+        self.assertEqual(self.partial.resumable_offset('"etag1"', 'bytes'), 40)
+
+    def test_d_resumable_offset(self) -> None:
+        """
+        Unit test of resumable_offset in degraded cases
+        """
+        # No part file yet
+        self.assertEqual(self.partial.resumable_offset('"etag1"', 'bytes'), 0)
+        self.partial.part_path.write_bytes(b'x' * 40)
+        self.partial.write_sidecar('"etag1"')
+        # Server does not support ranges, or file changed on server side
+        self.assertEqual(self.partial.resumable_offset('"etag1"', None), 0)
+        self.assertEqual(self.partial.resumable_offset('"etag2"', 'bytes'), 0)
+        # Part file written out of order
+        self.partial.write_sidecar('"etag1"', mode='segmented')
+        self.assertEqual(self.partial.resumable_offset('"etag1"', 'bytes'), 0)
+        # Another URL downloaded into the same file
+        other_partial = PartialDownload(self.file_path, 'https://server/other', 100)
+        self.assertEqual(other_partial.resumable_offset('"etag1"', 'bytes'), 0)
+
+    def test_n_complete(self) -> None:
+        """
+        Unit test of complete in nominal cases
+        """
+        self.partial.part_path.write_bytes(b'x' * 100)
+        self.partial.write_sidecar(None)
+        self.partial.complete()
+        self.assertEqual(list(Path(self.tmp_dir.name).iterdir()), [self.file_path])
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+.. admonition:: License
+
+   Copyright 2019 CNES
+
+   Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+   in compliance with the License. You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software distributed under the License
+   is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+   or implied. See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+from typing import Optional  # @NoMove
+import unittest
+from unittest.mock import MagicMock
+
+from resto_client.requests.collections_requests import SearchCollectionRequest
+
+
+def make_request(url: str, username: Optional[str]=None,
+                 authentication: str='OPPORTUNITY') -> SearchCollectionRequest:
+    """
+    :param url: the URL of the request
+    :param username: the account defined in the authentication service
+    :param authentication: the authentication type of the request
+    :returns: a search request whose cache key can be computed without any server
+    """
+    request = SearchCollectionRequest.__new__(SearchCollectionRequest)
+    request.parent_service = MagicMock()
+    request.parent_service.service_access.get_method.return_value = 'get'
+    request.parent_service.service_access.get_authentication.return_value = authentication
+    request.auth_service = MagicMock(username=username)
+    request.get_url = MagicMock(return_value=url)
+    return request
+
+
+class UTestRestoJsonRequest(unittest.TestCase):
+    """
+    Unit Tests of the RestoJsonRequest class
+    """
+
+    def test_n_cache_key(self) -> None:
+        """
+        Unit test of cache_key depending on the URL and the account
+        """
+        url_1 = 'https://resto/api/collections/S2/search.json?_rc=true&page=1&'
+        url_2 = 'https://resto/api/collections/S2/search.json?_rc=true&page=2&'
+        self.assertEqual(make_request(url_1).cache_key, make_request(url_1).cache_key)
+        self.assertNotEqual(make_request(url_1).cache_key, make_request(url_2).cache_key)
+        self.assertNotEqual(make_request(url_1).cache_key,
+                            make_request(url_1, username='alice').cache_key)
+        self.assertEqual(make_request(url_1, authentication='NEVER').cache_key,
+                         make_request(url_1, username='alice', authentication='NEVER').cache_key)
+
+    def test_n_search_caching_opt_in(self) -> None:
+        """
+        Unit test of the caching of the searches, disabled unless configured on the server
+        """
+        request = make_request('https://resto/api/collections/S2/search.json?')
+        request.parent_service.parent_server.search_caching_duration = 0
+        self.assertEqual(request.get_caching_duration(), 0)
+        request.parent_service.parent_server.search_caching_duration = 120
+        self.assertEqual(request.get_caching_duration(), 120)
+        request.use_cache = False
+        self.assertEqual(request.get_caching_duration(), 0)
+
+    def test_n_cached_response_decoded_once(self) -> None:
+        """
+        Unit test of the response put in the cache, without decoding its json content again
+        """
+        request = make_request('https://resto/api/collections/S2/search.json?')
+        request.parent_service.parent_server.search_caching_duration = 120
+        request.parent_service.parent_server.feature_index = None
+        response = MagicMock(status_code=200, headers={'etag': '"v1"'})
+        response.json.return_value = {'type': 'FeatureCollection', 'features': [],
+                                      'properties': {}}
+        request.resto_response_cls = MagicMock()
+        request.process_response(response)
+        request.set_cached_response()
+        response.json.assert_called_once_with()
+        response_cache = request.parent_service.parent_server.response_cache
+        self.assertIs(response_cache.put.call_args[0][1], response.json.return_value)
+
+    def test_n_cached_search_license(self) -> None:
+        """
+        Unit test of a search response put in the cache, which must keep the features licenses
+        """
+        request = make_request('https://resto/api/collections/S2/search.json?')
+        request.debug = False
+        request.parent_service.parent_server.search_caching_duration = 120
+        request.parent_service.parent_server.feature_index = None
+        feature = {'type': 'Feature', 'id': 'uuid_f1', 'geometry': None,
+                   'properties': {'productIdentifier': 'f1', 'license': 'lic42',
+                                  'license_info': {'en': {'short_name': 'Licence 42'}}}}
+        response = MagicMock(status_code=200, headers={})
+        response.json.return_value = {'type': 'FeatureCollection', 'features': [feature],
+                                      'properties': {}}
+        feature_collection = request.process_response(response)
+        self.assertEqual(feature_collection.resto_features[0].license.identifier, 'lic42')
+        request.set_cached_response()
+        cached_response = request.parent_service.parent_server.response_cache.put.call_args[0][1]
+        cached_properties = cached_response['features'][0]['properties']
+        self.assertEqual(cached_properties['license'], 'lic42')
+        self.assertEqual(cached_properties['license_info'], {'en': {'short_name': 'Licence 42'}})
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""
+.. admonition:: License
+
+   Copyright 2019 CNES
+
+   Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+   in compliance with the License. You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software distributed under the License
+   is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+   or implied. See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+import hashlib
+import io
+import unittest
+from unittest.mock import MagicMock
+
+from resto_client.requests.stream_writer import StreamWriter
+
+
+class UTestStreamWriter(unittest.TestCase):
+    """
+    Unit Tests of the StreamWriter class
+    """
+
+    def test_n_copy_raw(self) -> None:
+        """
+        Unit test of copy() when the response is read from its raw stream
+        """
+        content = bytes(range(256)) * 1000
+        response = MagicMock(headers={}, raw=io.BytesIO(content))
+        progress_bar = MagicMock()
+        output = io.BytesIO()
+        nb_bytes = StreamWriter(response, block_size=1000, progress_bar=progress_bar).copy(
+            output.write)
+        self.assertEqual(nb_bytes, len(content))
+        self.assertEqual(output.getvalue(), content)
+        total_progress = sum(call[0][0] for call in progress_bar.update.call_args_list)
+        self.assertEqual(total_progress, len(content))
+
+    def test_n_copy_encoded(self) -> None:
+        """
+        Unit test of copy() when the response has a content encoding
+        """
+        response = MagicMock(headers={'content-encoding': 'gzip'})
+        response.iter_content.return_value = iter([b'abc', b'def'])
+        output = io.BytesIO()
+        self.assertEqual(StreamWriter(response).copy(output.write), 6)
+        self.assertEqual(output.getvalue(), b'abcdef')
+
+    def test_n_copy_hashed(self) -> None:
+        """
+        Unit test of copy() when a hash object is updated while copying
+        """
+        content = bytes(range(256)) * 1000
+        response = MagicMock(headers={}, raw=io.BytesIO(content))
+        hasher = hashlib.new('md5')
+        StreamWriter(response, block_size=1000, hasher=hasher).copy(io.BytesIO().write)
+        self.assertEqual(hasher.hexdigest(), hashlib.md5(content).hexdigest())
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""
+.. admonition:: License
+
+   Copyright 2019 CNES
+
+   Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+   in compliance with the License. You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software distributed under the License
+   is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+   or implied. See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+import copy
+import unittest
+from unittest.mock import MagicMock
+import warnings
+
+from resto_client.responses.collections_description import CollectionsDescription
+from resto_client.responses.feature_collection_response import FeatureCollectionResponse
+
+
+class UTestRestoJsonResponse(unittest.TestCase):
+    """
+    Unit Tests of the identification and normalization of json responses
+    """
+
+    def test_n_feature_collection_response(self) -> None:
+        """
+        Unit test of FeatureCollectionResponse sharing the original response structures
+        """
+        response = {'type': 'FeatureCollection', 'properties': {'totalResults': 0},
+                    'features': [], 'unexpected': 1}
+        with warnings.catch_warnings(record=True) as raised_warnings:
+            warnings.simplefilter('always')
+            resto_response = FeatureCollectionResponse(MagicMock(debug=True), response)
+        self.assertEqual(len(raised_warnings), 1)
+        self.assertIn("{'unexpected': 1}", str(raised_warnings[0].message))
+        self.assertIs(resto_response._normalized_response['properties'], response['properties'])
+        self.assertIsNot(resto_response._normalized_response, response)
+
+    def test_n_collections_description(self) -> None:
+        """
+        Unit test of CollectionsDescription normalization leaving the original response unchanged
+        """
+        response = {'collections': [{'name': 'S2', 'osDescription': {'en': {'ShortName': 'S2'}}}],
+                    'synthesis': {'name': '*', 'osDescription': None,
+                                  'statistics': {'count': 0,
+                                                 'facets': {'collection': {'S2': 3, 'L8': 2}}}}}
+        original_response = copy.deepcopy(response)
+        request = MagicMock(debug=False, get_protocol=MagicMock(return_value='theia_version'))
+        normalized_response = CollectionsDescription(request, response)._normalized_response
+        self.assertEqual(response, original_response)
+        self.assertEqual(normalized_response['synthesis']['statistics']['count'], 5)
+        self.assertEqual(normalized_response['collections'][0]['osDescription'],
+                         {'ShortName': 'S2'})
@@ -0,0 +1,342 @@
+# -*- coding: utf-8 -*-
+"""
+.. admonition:: License
+
+   Copyright 2019 CNES
+
+   Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+   in compliance with the License. You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software distributed under the License
+   is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+   or implied. See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+import asyncio
+import hashlib
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any, Dict, List, Optional  # @NoMove
+import unittest
+from unittest.mock import MagicMock
+
+from requests.auth import HTTPBasicAuth
+from requests.structures import CaseInsensitiveDict
+
+from resto_client.base_exceptions import RestoNetworkError
+from resto_client.requests.collections_requests import SearchCollectionRequest
+from resto_client.requests.features_requests import (ChecksumMismatchError,
+                                                     DownloadProductRequest)
+from resto_client.requests.partial_download import PartialDownload
+from resto_client.requests.stream_writer import StreamWriter
+from resto_client.services import async_resto_server
+from resto_client.services.async_resto_server import AsyncRestoServer, ResponseAdapter
+
+
+class FakeContent():
+    """
+    Object looking like the content of an aiohttp response
+    """
+
+    def __init__(self, body: bytes) -> None:
+        """
+        :param body: the body of the response
+        """
+        self.body = body
+
+    async def iter_chunked(self, block_size: int) -> Any:
+        """
+        :param block_size: size of the blocks to return
+        :returns: an asynchronous iterator over the blocks of the body
+        """
+        for start in range(0, len(self.body), block_size):
+            await asyncio.sleep(0)
+            yield self.body[start:start + block_size]
+
+
+class FakeResponse():
+    """
+    Object looking like an aiohttp response
+    """
+
+    def __init__(self, status: int, body: bytes, headers: Optional[Dict[str, str]]=None) -> None:
+        """
+        :param status: the HTTP status of the response
+        :param body: the body of the response
+        :param headers: the headers of the response
+        """
+        self.status = status
+        self.headers = CaseInsensitiveDict(headers or {})
+        self.url = 'https://server/request'
+        self.content = FakeContent(body)
+        self.released = False
+
+    async def read(self) -> bytes:
+        """
+        :returns: the body of the response
+        """
+        return self.content.body
+
+    def release(self) -> None:
+        """
+        Release the response
+        """
+        self.released = True
+
+
+class FakeSession():
+    """
+    Object looking like an aiohttp session, answering each URL with a given response
+    """
+
+    def __init__(self, responses: Dict[str, Any]) -> None:
+        """
+        :param responses: for each URL, a function building the response from the headers.
+        """
+        self.responses = responses
+        self.requests: List[Dict[str, str]] = []
+        self.auths: List[Any] = []
+
+    async def request(self, _method: str, url: str, headers: Dict[str, str], auth: Any=None,
+                      **_kwargs: Any) -> FakeResponse:
+        """
+        :param _method: the HTTP method
+        :param url: the URL of the request
+        :param headers: the headers of the request
+        :param auth: the basic HTTP authorization of the request
+        :returns: the response to the request
+        """
+        self.requests.append(dict(headers))
+        self.auths.append(auth)
+        await asyncio.sleep(0)
+        return self.responses[url](headers)
+
+    async def close(self) -> None:
+        """
+        Close the session
+        """
+
+
+def make_async_server(session: FakeSession) -> AsyncRestoServer:
+    """
+    :param session: the session to use for sending the requests
+    :returns: an AsyncRestoServer without any real server, using the session
+    """
+    server = AsyncRestoServer.__new__(AsyncRestoServer)
+    server._server = MagicMock(download_block_size=4)
+    server._server.authentication_service.token_is_available = True
+    server._http_session = session
+    return server
+
+
+def make_request(url: str, request_class: type=SearchCollectionRequest) -> MagicMock:
+    """
+    :param url: the URL of the request
+    :param request_class: the class of the request to mimic
+    :returns: an object looking like a request of that class
+    """
+    request = MagicMock(spec=request_class, authentication_type='NEVER',
+                        request_headers={}, request_action='searching')
+    request.get_method.return_value = 'get'
+    request.get_url.return_value = url
+    request.get_authentication_arguments.return_value = (None, None)
+    request.update_headers.side_effect = request.request_headers.update
+    if issubclass(request_class, SearchCollectionRequest):
+        request.get_cached_entry.return_value = None
+    return request
+
+
+class UTestResponseAdapter(unittest.TestCase):
+    """
+    Unit Tests of the ResponseAdapter class
+    """
+
+    def test_n_response_adapter(self) -> None:
+        """
+        Unit test of ResponseAdapter in nominal cases
+        """
+        response = ResponseAdapter(200, {'Content-Type': 'application/json'},
+                                   b'{"features": []}', 'https://server/search.json')
+        self.assertEqual(response.headers['content-type'], 'application/json')
+        self.assertEqual(response.json(), {'features': []})
+        self.assertEqual(response.text, '{"features": []}')
+
+    def test_n_response_adapter_stream(self) -> None:
+        """
+        Unit test of ResponseAdapter used as a streamed response by StreamWriter
+        """
+        content = bytes(range(256)) * 10
+        response = ResponseAdapter(200, {'Content-Encoding': 'gzip'}, content,
+                                   'https://server/product.zip')
+        self.assertNotIn('content-encoding', response.headers)
+        received = bytearray()
+        nb_bytes = StreamWriter(response, block_size=100).copy(received.extend)
+        self.assertEqual(nb_bytes, len(content))
+        self.assertEqual(bytes(received), content)
+
+
+@unittest.skipIf(not async_resto_server.HAS_AIOHTTP, 'aiohttp is not installed')
+class UTestAsyncRestoServer(unittest.TestCase):
+    """
+    Unit Tests of the AsyncRestoServer class, with a fake aiohttp session
+    """
+
+    def setUp(self) -> None:
+        self.temp_dir = TemporaryDirectory()
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+
+    def tearDown(self) -> None:
+        self.loop.close()
+        asyncio.set_event_loop(None)
+        self.temp_dir.cleanup()
+
+    def run_async(self, coroutine: Any) -> Any:
+        """
+        :param coroutine: the coroutine to run
+        :returns: the result of the coroutine
+        """
+        return self.loop.run_until_complete(coroutine)
+
+    def download(self, server: AsyncRestoServer, products: Dict[str, bytes],
+                 checksums: Dict[str, str]) -> List[Any]:
+        """
+        Download several products concurrently.
+
+        :param server: the server to use
+        :param products: the content of the products, indexed by their URL
+        :param checksums: the checksums of the products, indexed by their URL
+        :returns: the paths of the downloaded files or the exceptions raised
+        """
+        download_dir = Path(self.temp_dir.name)
+        features = []
+        for url in products:
+            feature = MagicMock(product_mimetype='application/zip',
+                                product_size=len(products[url]),
+                                product_checksum=checksums[url],
+                                downloaded_files_paths={}, downloaded_files_verified={})
+            features.append(feature)
+        requests = {id(feature): make_request(url, DownloadProductRequest)
+                    for feature, url in zip(features, products)}
+        for feature, url in zip(features, products):
+            file_path = download_dir / url.split('/')[-1]
+            requests[id(feature)].get_file_infos.return_value = (None, file_path, None, None)
+        resto_service = server._server.resto_service
+        resto_service.DOWNLOAD_REQUEST_CLASSES = {
+            'product': lambda _service, feature, **_kwargs: requests[id(feature)]}
+
+        async def download_all() -> List[Any]:
+            return await asyncio.gather(*[server.download_feature_file(feature, 'product',
+                                                                       download_dir)
+                                          for feature in features], return_exceptions=True)
+        return self.run_async(download_all())
+
+    def test_n_run_search(self) -> None:
+        """
+        Unit test of a search request sent with aiohttp, then processed and cached
+        """
+        session = FakeSession({'https://server/search': lambda _headers: FakeResponse(
+            200, b'{"features": []}', {'Content-Type': 'application/json'})})
+        server = make_async_server(session)
+        request = make_request('https://server/search')
+        request.process_response.side_effect = lambda response: response.json()
+        self.assertEqual(self.run_async(server._run(request)), {'features': []})
+        request.set_cached_response.assert_called_once_with()
+        self.assertEqual(len(session.requests), 1)
+
+    def test_n_run_basic_auth(self) -> None:
+        """
+        Unit test of a request authorized by the UTF-8 encoded credentials of an account
+        """
+        session = FakeSession({'https://server/search': lambda _headers: FakeResponse(
+            200, b'{"features": []}', {'Content-Type': 'application/json'})})
+        server = make_async_server(session)
+        request = make_request('https://server/search')
+        request.get_authentication_arguments.return_value = (
+            HTTPBasicAuth('user'.encode('utf-8'), 'pässword'.encode('utf-8')), None)
+        request.process_response.side_effect = lambda response: response.json()
+        self.run_async(server._run(request))
+        self.assertEqual(session.auths[0].login, 'user')
+        self.assertEqual(session.auths[0].password, 'pässword')
+        self.assertEqual(session.auths[0].encoding, 'utf-8')
+
+    def test_n_run_cache_hit(self) -> None:
+        """
+        Unit test of a search request answered from the cache, without sending it
+        """
+        session = FakeSession({})
+        server = make_async_server(session)
+        request = make_request('https://server/search')
+        request.get_cached_entry.return_value = MagicMock(expired=False, response={'cached': 1})
+        request.process_json_result.side_effect = lambda json_result: json_result
+        self.assertEqual(self.run_async(server._run(request)), {'cached': 1})
+        self.assertEqual(session.requests, [])
+        request.process_response.assert_not_called()
+
+    def test_n_concurrent_download(self) -> None:
+        """
+        Unit test of products downloaded concurrently and checked against their checksums
+        """
+        products = {'https://server/p{}.zip'.format(index): bytes(range(index, index + 50))
+                    for index in range(3)}
+        checksums = {url: 'md5:' + hashlib.md5(content).hexdigest()
+                     for url, content in products.items()}
+        headers = {'Content-Type': 'application/zip'}
+        session = FakeSession({url: lambda _headers, content=content: FakeResponse(200, content,
+                                                                                   headers)
+                               for url, content in products.items()})
+        results = self.download(make_async_server(session), products, checksums)
+        for result, content in zip(results, products.values()):
+            self.assertEqual(result.read_bytes(), content)
+        self.assertEqual(list(Path(self.temp_dir.name).glob('*.part*')), [])
+
+    def test_n_resumed_download(self) -> None:
+        """
+        Unit test of a product download resumed with a Range request
+        """
+        url = 'https://server/p.zip'
+        content = bytes(range(100))
+        file_path = Path(self.temp_dir.name) / 'p.zip'
+        partial_download = PartialDownload(file_path, url, len(content))
+        partial_download.part_path.write_bytes(content[:30])
+        partial_download.write_sidecar('"v1"')
+
+        def respond(headers: Dict[str, str]) -> FakeResponse:
+            response_headers = {'Content-Type': 'application/zip', 'ETag': '"v1"',
+                                'Accept-Ranges': 'bytes'}
+            if 'Range' in headers:
+                return FakeResponse(206, content[30:], response_headers)
+            return FakeResponse(200, content, response_headers)
+        session = FakeSession({url: respond})
+        results = self.download(make_async_server(session), {url: content},
+                                {url: 'md5:' + hashlib.md5(content).hexdigest()})
+        self.assertEqual(results[0].read_bytes(), content)
+        self.assertEqual(session.requests[1]['Range'], 'bytes=30-')
+
+    def test_d_checksum_mismatch(self) -> None:
+        """
+        Unit test of a downloaded product which does not match its checksum
+        """
+        url = 'https://server/p.zip'
+        session = FakeSession({url: lambda _headers: FakeResponse(
+            200, b'corrupted', {'Content-Type': 'application/zip'})})
+        results = self.download(make_async_server(session), {url: b'corrupted'},
+                                {url: 'md5:' + hashlib.md5(b'expected').hexdigest()})
+        self.assertIsInstance(results[0], ChecksumMismatchError)
+        self.assertEqual(list(Path(self.temp_dir.name).iterdir()), [])
+
+    def test_d_truncated_download(self) -> None:
+        """
+        Unit test of a product whose download stops before its end
+        """
+        url = 'https://server/p.zip'
+        content = bytes(range(100))
+        session = FakeSession({url: lambda _headers: FakeResponse(
+            200, content[:60], {'Content-Type': 'application/zip'})})
+        results = self.download(make_async_server(session), {url: content},
+                                {url: 'md5:' + hashlib.md5(content).hexdigest()})
+        self.assertIsInstance(results[0], RestoNetworkError)
+        partial_download = PartialDownload(Path(self.temp_dir.name) / 'p.zip', url, len(content))
+        self.assertEqual(partial_download.part_path.read_bytes(), content[:60])
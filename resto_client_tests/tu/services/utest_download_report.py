@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+.. admonition:: License
+
+   Copyright 2019 CNES
+
+   Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+   in compliance with the License. You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software distributed under the License
+   is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+   or implied. See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+from pathlib import Path
+import unittest
+
+from resto_client.base_exceptions import RestoClientUserError
+from resto_client.services.download_report import DownloadReport
+
+
+class UTestDownloadReport(unittest.TestCase):
+    """
+    Unit Tests of the DownloadReport class
+    """
+
+    def test_n_download_report(self) -> None:
+        """
+        Unit test of DownloadReport in nominal cases
+        """
+        report = DownloadReport('quicklook')
+        report['feat_1'] = Path('feat_1_ql.jpg')
+        report['feat_2'] = RestoClientUserError('There is no quicklook')
+        self.assertEqual(report.succeeded, {'feat_1': Path('feat_1_ql.jpg')})
+        self.assertEqual(list(report.failed.keys()), ['feat_2'])
+        self.assertIn('FAILED: There is no quicklook', str(report))
+        with self.assertRaises(RestoClientUserError):
+            report.raise_first_error()
+
+    def test_n_download_report_no_error(self) -> None:
+        """
+        Unit test of DownloadReport when all downloads succeeded
+        """
+        report = DownloadReport('product')
+        report['feat_1'] = Path('feat_1.zip')
+        self.assertEqual(report.failed, {})
+        report.raise_first_error()
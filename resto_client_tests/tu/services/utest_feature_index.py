@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""
+.. admonition:: License
+
+   Copyright 2019 CNES
+
+   Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+   in compliance with the License. You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software distributed under the License
+   is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+   or implied. See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import unittest
+
+from resto_client.entities.resto_feature import RestoFeature
+from resto_client.services.feature_index import FeatureIndex
+
+
+def make_feature(feature_id: str, start_date: str, platform: str, cloud_cover: float,
+                 lon: float) -> RestoFeature:
+    """
+    :param feature_id: identifier of the feature
+    :param start_date: acquisition date of the feature
+    :param platform: acquisition platform of the feature
+    :param cloud_cover: cloud cover of the feature
+    :param lon: longitude of the point where the feature is located
+    :returns: a minimal resto feature
+    """
+    properties = {'productIdentifier': feature_id, 'startDate': start_date,
+                  'completionDate': start_date, 'platform': platform,
+                  'productType': 'REFLECTANCE', 'cloudCover': cloud_cover}
+    return RestoFeature({'type': 'Feature', 'id': 'uuid_' + feature_id,
+                         'geometry': {'type': 'Point', 'coordinates': [lon, 43.]},
+                         'properties': properties})
+
+
+class UTestFeatureIndex(unittest.TestCase):
+    """
+    Unit Tests of the FeatureIndex class
+    """
+
+    def setUp(self) -> None:
+        self.temp_dir = TemporaryDirectory()
+        self.index = FeatureIndex(Path(self.temp_dir.name) / 'index.sqlite')
+        self.index.record_features('S2', [
+            make_feature('f1', '2020-01-01T10:00:00Z', 'SENTINEL2A', 10., 1.),
+            make_feature('f2', '2020-01-02T10:00:00Z', 'SENTINEL2B', 50., 1.),
+            make_feature('f3', '2020-01-03T10:00:00Z', 'SENTINEL2A', 20., 5.),
+            make_feature('f4', '2020-01-05T10:00:00Z', 'SENTINEL2A', 20., 1.)])
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_n_search_covered(self) -> None:
+        """
+        Unit test of searches covered by several completed searches
+        """
+        self.index.record_coverage('S2', {'startDate': '2020-01-01',
+                                          'completionDate': '2020-01-02', 'maxRecords': 500})
+        self.index.record_coverage('S2', {'startDate': '2020-01-03',
+                                          'completionDate': '2020-01-06'})
+        features = self.index.search('S2', {'startDate': '2020-01-01',
+                                            'completionDate': '2020-01-03'})
+        self.assertEqual([feature.product_identifier for feature in features], ['f3', 'f2', 'f1'])
+        features = self.index.search('S2', {'startDate': '2020-01-01',
+                                            'completionDate': '2020-01-06',
+                                            'platform': 'SENTINEL2A', 'cloudCover': '[0,30[',
+                                            'box': '0,40,2,45'})
+        self.assertEqual([feature.product_identifier for feature in features], ['f4', 'f1'])
+        self.assertEqual(features[0]['id'], 'uuid_f4')
+
+    def test_n_search_license(self) -> None:
+        """
+        Unit test of the license of the features found in the index, which must be preserved
+        """
+        licensed = make_feature('f5', '2020-01-04T10:00:00Z', 'SENTINEL2A', 20., 1.)
+        licensed = RestoFeature({'type': 'Feature', 'id': licensed['id'],
+                                 'geometry': licensed['geometry'],
+                                 'properties': dict(licensed.properties, license='lic42',
+                                                    license_info={'en': {'short_name': 'L42'}})})
+        self.index.record_features('S2', [licensed])
+        self.index.record_coverage('S2', {'startDate': '2020-01-04',
+                                          'completionDate': '2020-01-04'})
+        features = self.index.search('S2', {'startDate': '2020-01-04',
+                                            'completionDate': '2020-01-04'})
+        self.assertEqual([feature.product_identifier for feature in features], ['f5'])
+        self.assertEqual(features[0].license, licensed.license)
+        self.assertEqual(features[0].license.identifier, 'lic42')
+
+    def test_n_search_box(self) -> None:
+        """
+        Unit test of the box criterion, evaluated on the footprints and not on their bounding box
+        """
+        triangle = make_feature('f5', '2020-01-04T10:00:00Z', 'SENTINEL2A', 20., 0.)
+        triangle['geometry'] = {'type': 'Polygon',
+                                'coordinates': [[[0., 40.], [10., 40.], [10., 50.], [0., 40.]]]}
+        self.index.record_features('S2', [triangle])
+        self.index.record_coverage('S2', {'startDate': '2020-01-01',
+                                          'completionDate': '2020-01-06'})
+        # The box intersects the bounding box of the triangle, but not the triangle itself.
+        features = self.index.search('S2', {'startDate': '2020-01-01',
+                                            'completionDate': '2020-01-06', 'box': '0,43,1.5,48'})
+        self.assertEqual([feature.product_identifier for feature in features], ['f4', 'f2', 'f1'])
+        features = self.index.search('S2', {'startDate': '2020-01-01',
+                                            'completionDate': '2020-01-06', 'box': '8,44,9,45'})
+        self.assertEqual([feature.product_identifier for feature in features], ['f5'])
+
+    def test_n_search_not_covered(self) -> None:
+        """
+        Unit test of searches which cannot be answered from the index
+        """
+        self.index.record_coverage('S2', {'startDate': '2020-01-01',
+                                          'completionDate': '2020-01-02', 'platform': 'SENTINEL2A'})
+        self.index.record_coverage('S2', {'startDate': '2020-01-04',
+                                          'completionDate': '2020-01-06'})
+        # Gap on 2020-01-03
+        self.assertIsNone(self.index.search('S2', {'startDate': '2020-01-02',
+                                                   'completionDate': '2020-01-05'}))
+        # Coverage restricted to another platform
+        self.assertIsNone(self.index.search('S2', {'startDate': '2020-01-01',
+                                                   'completionDate': '2020-01-02',
+                                                   'platform': 'SENTINEL2B'}))
+        # Criterion which cannot be evaluated locally
+        self.assertIsNone(self.index.search('S2', {'startDate': '2020-01-04',
+                                                   'completionDate': '2020-01-05',
+                                                   'orbitNumber': 12}))
+        self.assertIsNone(self.index.search('L8', {'startDate': '2020-01-04'}))
+        self.assertTrue(self.index.covers('S2', {'startDate': '2020-01-01',
+                                                 'completionDate': '2020-01-02',
+                                                 'platform': 'SENTINEL2A'}))
+        self.index.max_age = -1
+        self.assertFalse(self.index.covers('S2', {'startDate': '2020-01-04',
+                                                  'completionDate': '2020-01-05'}))
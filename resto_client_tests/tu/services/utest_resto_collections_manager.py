@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""
+.. admonition:: License
+
+   Copyright 2019 CNES
+
+   Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+   in compliance with the License. You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software distributed under the License
+   is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+   or implied. See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+import unittest
+from unittest.mock import MagicMock
+
+from resto_client.services.resto_collections_manager import RestoCollectionsManager
+
+
+class UTestRestoCollectionsManager(unittest.TestCase):
+    """
+    Unit Tests of the RestoCollectionsManager class
+    """
+
+    def setUp(self) -> None:
+        self.collections = MagicMock(default_collection='S2')
+        self.collections.normalize_name.side_effect = lambda name: name.upper()
+        self.loader = MagicMock(return_value=self.collections)
+
+    def test_n_lazy_loading(self) -> None:
+        """
+        Unit test of the collections being loaded when first needed
+        """
+        collections_mgr = RestoCollectionsManager(collections_loader=self.loader)
+        collections_mgr.current_collection = None
+        self.loader.assert_not_called()
+        self.assertEqual(collections_mgr.ensure_collection(), 'S2')
+        self.assertEqual(collections_mgr.ensure_collection('s1'), 'S1')
+        self.loader.assert_called_once_with()
+
+    def test_n_unchecked_collection(self) -> None:
+        """
+        Unit test of set_unchecked_collection() avoiding loading the collections
+        """
+        collections_mgr = RestoCollectionsManager(collections_loader=self.loader)
+        collections_mgr.set_unchecked_collection('private')
+        self.assertEqual(collections_mgr.ensure_collection(), 'private')
+        self.loader.assert_not_called()
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+.. admonition:: License
+
+   Copyright 2019 CNES
+
+   Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+   in compliance with the License. You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software distributed under the License
+   is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+   or implied. See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import List  # @NoMove
+import unittest
+from unittest.mock import MagicMock
+
+from resto_client.base_exceptions import RestoClientUserError
+from resto_client.entities.resto_feature import RestoFeature
+from resto_client.services.resto_server import RestoServer
+
+
+def make_feature(feature_id: str, product_identifier: str) -> RestoFeature:
+    """
+    :param feature_id: the uuid of the feature
+    :param product_identifier: the product identifier of the feature
+    :returns: a minimal resto feature
+    """
+    return RestoFeature({'type': 'Feature', 'id': feature_id, 'geometry': None,
+                         'properties': {'productIdentifier': product_identifier}})
+
+
+class UTestRestoServer(unittest.TestCase):
+    """
+    Unit Tests of the RestoServer class, without any server
+    """
+
+    def setUp(self) -> None:
+        self.temp_dir = TemporaryDirectory()
+        self.server = RestoServer.__new__(RestoServer)
+        self.server._server_name = 'server'
+        self.server.download_workers = 2
+        self.server._resto_service = MagicMock()
+        self.downloaded: List[str] = []
+
+        def download_feature_file(feature: RestoFeature, file_type: str, download_dir: Path,
+                                  **_kwargs: object) -> None:
+            self.downloaded.append(feature.id)
+            feature.downloaded_files_paths[file_type] = download_dir / feature.product_identifier
+        self.server._resto_service.download_feature_file.side_effect = download_feature_file
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_n_download_features_files(self) -> None:
+        """
+        Unit test of the download of several features, one of them being given twice
+        """
+        features = [make_feature('uuid_f1', 'f1'), make_feature('uuid_f2', 'f2'),
+                    make_feature('uuid_f1', 'f1')]
+        report = self.server.download_features_files(features, 'quicklook',
+                                                     Path(self.temp_dir.name))
+        self.assertEqual(sorted(self.downloaded), ['uuid_f1', 'uuid_f2'])
+        self.assertEqual(list(report), ['f1', 'f2'])
+        self.assertEqual(report['f2'], Path(self.temp_dir.name) / 'server' / 'f2')
+
+    def test_d_download_features_files_failure(self) -> None:
+        """
+        Unit test of the download of several features, one of them failing unexpectedly
+        """
+        download_feature_file = self.server._resto_service.download_feature_file.side_effect
+
+        def failing_download(feature: RestoFeature, file_type: str, download_dir: Path,
+                             **kwargs: object) -> None:
+            if feature.id == 'uuid_f1':
+                raise KeyError('productIdentifier')
+            download_feature_file(feature, file_type, download_dir, **kwargs)
+        self.server._resto_service.download_feature_file.side_effect = failing_download
+        features = [make_feature('uuid_f1', 'f1'), make_feature('uuid_f2', 'f2')]
+        report = self.server.download_features_files(features, 'quicklook',
+                                                     Path(self.temp_dir.name))
+        self.assertIsInstance(report['f1'], KeyError)
+        self.assertEqual(report['f2'], Path(self.temp_dir.name) / 'server' / 'f2')
+
+    def test_d_download_features_files_conflict(self) -> None:
+        """
+        Unit test of the download of different features having the same product identifier
+        """
+        features = [make_feature('uuid_f1', 'f1'), make_feature('uuid_f1_bis', 'f1')]
+        with self.assertRaises(RestoClientUserError):
+            self.server.download_features_files(features, 'quicklook', Path(self.temp_dir.name))
+        self.assertEqual(self.downloaded, [])
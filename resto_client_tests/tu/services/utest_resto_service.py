@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+"""
+.. admonition:: License
+
+   Copyright 2019 CNES
+
+   Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+   in compliance with the License. You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software distributed under the License
+   is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+   or implied. See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any, List  # @NoMove
+import unittest
+from unittest.mock import MagicMock, patch
+
+from resto_client.entities.resto_feature import RestoFeature
+from resto_client.services.resto_service import RestoService, MAX_SUB_QUERIES
+from resto_client.settings.dict_settings import DictSettingsJson
+
+
+def fake_page(features: List[str], total_results: int) -> MagicMock:
+    """
+    :param features: the features of the page
+    :param total_results: the total number of results of the search
+    :returns: an object looking like a RestoFeatureCollection
+    """
+    return MagicMock(resto_features=features, total_results=total_results)
+
+
+def fake_request(page: MagicMock) -> MagicMock:
+    """
+    :param page: the page returned by the request
+    :returns: an object looking like a SearchCollectionRequest
+    """
+    return MagicMock(run=MagicMock(return_value=page),
+                     iter_features=lambda: iter(page.resto_features),
+                     feature_collection_properties={'totalResults': page.total_results})
+
+
+class UTestRestoService(unittest.TestCase):
+    """
+    Unit Tests of the RestoService class, without any server.
+    """
+
+    def setUp(self) -> None:
+        self.service = RestoService.__new__(RestoService)
+        self.service._collections_mgr = MagicMock()
+        self.service.get_protocol = MagicMock(return_value='dotcloud')
+        self.service.parent_server = MagicMock(feature_index=None)
+        self.requested: List[Any] = []
+
+    def search_patch(self, pages: List[MagicMock]) -> Any:
+        """
+        :param pages: the pages returned by successive searches
+        :returns: a patch of SearchCollectionRequest recording the requested criteria
+        """
+        def search_request(_service: RestoService, _collection: str, criteria: dict) -> MagicMock:
+            self.requested.append(dict(criteria))
+            return fake_request(pages[criteria.get('page', 1) - 1])
+        return patch('resto_client.services.resto_service.SearchCollectionRequest',
+                     side_effect=search_request)
+
+    def test_n_iter_search_pages(self) -> None:
+        """
+        Unit test of iter_search_by_criteria walking pages up to totalResults
+        """
+        pages = [fake_page(['f1', 'f2'], 5), fake_page(['f3', 'f4'], 5), fake_page(['f5'], 5)]
+        with patch('resto_client.services.resto_service.RestoCriteria', new=lambda _p, **k: k):
+            with self.search_patch(pages):
+                features = list(self.service.iter_search_by_criteria({'maxRecords': 2}))
+        self.assertEqual(features, ['f1', 'f2', 'f3', 'f4', 'f5'])
+        self.assertEqual([crit['page'] for crit in self.requested], [1, 2, 3])
+
+    def test_n_iter_search_index(self) -> None:
+        """
+        Unit test of iter_search_by_criteria starting at an index and stopping at totalResults
+        """
+        pages = [fake_page(['f3', 'f4'], 4)]
+        with patch('resto_client.services.resto_service.RestoCriteria', new=lambda _p, **k: k):
+            with self.search_patch(pages):
+                features = list(self.service.iter_search_by_criteria({'index': 3}))
+        self.assertEqual(features, ['f3', 'f4'])
+        self.assertEqual(self.requested, [{'index': 3}])
+
+    def test_n_harvest_pages(self) -> None:
+        """
+        Unit test of harvest_by_criteria returning features in order from concurrent pages
+        """
+        pages = [fake_page(['f{}_{}'.format(page, feat) for feat in range(3)], 20)
+                 for page in range(7)]
+        pages[-1] = fake_page(['f6_0', 'f6_1'], 20)
+        with patch('resto_client.services.resto_service.RestoCriteria', new=lambda _p, **k: k):
+            with self.search_patch(pages):
+                features = list(self.service.harvest_by_criteria({}, nb_workers=3))
+        self.assertEqual(features, [feat for page in pages for feat in page.resto_features])
+        self.assertEqual(sorted(crit['page'] for crit in self.requested), list(range(1, 8)))
+
+    def test_n_harvest_without_total(self) -> None:
+        """
+        Unit test of harvest_by_criteria with a server which does not provide totalResults
+        """
+        pages = [fake_page(['f1', 'f2'], None), fake_page(['f3', 'f4'], None),
+                 fake_page(['f5'], None)]
+        self.service._record_coverage = MagicMock()
+        with patch('resto_client.services.resto_service.RestoCriteria', new=lambda _p, **k: k):
+            with self.search_patch(pages):
+                features = list(self.service.harvest_by_criteria({}, nb_workers=3))
+        self.assertEqual(features, ['f1', 'f2', 'f3', 'f4', 'f5'])
+        self.assertEqual([crit['page'] for crit in self.requested], [1, 2, 3])
+        self.service._record_coverage.assert_called_once_with({}, self.service._collections_mgr
+                                                              .ensure_collection.return_value, 1)
+
+    def test_n_split_search(self) -> None:
+        """
+        Unit test of split_search_by_criteria splitting a time interval and removing duplicates
+        """
+        results = {('2020-01-01', '2020-01-04'): ['f1', 'f2', 'f3', 'f4'],
+                   ('2020-01-01', '2020-01-02'): ['f1', 'f2'],
+                   ('2020-01-02', '2020-01-04'): ['f2', 'f3', 'f4']}
+
+        def search_page(criteria: dict, *_args: Any) -> MagicMock:
+            features = results[(criteria['startDate'], criteria['completionDate'])]
+            return fake_page([{'id': feature} for feature in features], len(features))
+        self.service._search_page = MagicMock(side_effect=search_page)
+        self.service._build_search_request = MagicMock(
+            side_effect=lambda *args: fake_request(search_page(*args)))
+        criteria = {'startDate': '2020-01-01', 'completionDate': '2020-01-04'}
+        features = self.service.split_search_by_criteria(criteria, max_results=3, nb_workers=2)
+        self.assertEqual([feature['id'] for feature in features], ['f1', 'f2', 'f3', 'f4'])
+
+    def test_n_split_search_bounded(self) -> None:
+        """
+        Unit test of split_search_by_criteria running a bounded number of sub-queries in advance
+        """
+        planned_criteria = [{'startDate': '2020-01-{:02}'.format(day)} for day in range(1, 11)]
+        self.service.plan_search = MagicMock(return_value=planned_criteria)
+        self.service.iter_search_by_criteria = MagicMock(
+            side_effect=lambda criteria, _c: iter([{'id': criteria['startDate']}]))
+        features = self.service.split_search_by_criteria({}, nb_workers=2)
+        self.assertEqual(next(features)['id'], '2020-01-01')
+        self.assertLessEqual(self.service.iter_search_by_criteria.call_count, 2)
+        self.assertEqual([feature['id'] for feature in features],
+                         [criteria['startDate'] for criteria in planned_criteria[1:]])
+
+    def test_d_plan_search_unsplittable(self) -> None:
+        """
+        Unit test of plan_search when sub-queries always return too many results
+        """
+        self.service._search_page = MagicMock(return_value=fake_page([], 1000))
+        criteria = {'startDate': '2020-01-01', 'completionDate': '2020-01-02',
+                    'box': '0,0,0.04,0.04'}
+        with self.assertWarns(UserWarning):
+            planned_criteria = self.service.plan_search(criteria, 'S2', max_results=10)
+        # The box is split down to tiles of at least MIN_TILE_SIZE degrees.
+        self.assertEqual(len(planned_criteria), 16)
+        self.assertEqual(self.service._search_page.call_count, 31)
+        # Counting concurrently gives the same tiles, in the same order.
+        with self.assertWarns(UserWarning):
+            self.assertEqual(self.service.plan_search(criteria, 'S2', max_results=10,
+                                                      nb_workers=4), planned_criteria)
+
+        # Splits also stop when MAX_SUB_QUERIES is reached.
+        self.service._search_page.reset_mock()
+        criteria['box'] = '0,0,90,90'
+        with self.assertWarns(UserWarning):
+            planned_criteria = self.service.plan_search(criteria, 'S2', max_results=10)
+        self.assertEqual(len(planned_criteria), MAX_SUB_QUERIES)
+        self.assertEqual(self.service._search_page.call_count, 2 * MAX_SUB_QUERIES - 1)
+
+    def test_n_features_by_ids(self) -> None:
+        """
+        Unit test of get_features_by_ids resolving identifiers by batches with a fallback
+        """
+        found = {feature_id: MagicMock(product_identifier=feature_id)
+                 for feature_id in ('f1', 'f3', 'other')}
+        self.service.get_feature_by_id = MagicMock(side_effect=lambda feature_id, _c: feature_id)
+        with patch('resto_client.services.resto_service.RestoCriteria', new=lambda _p, **k: k):
+            with self.search_patch([fake_page(list(found.values()), 3)]):
+                features = self.service.get_features_by_ids(['f3', 'f1', 'f2', 'f3'])
+        self.assertEqual(features, [found['f3'], found['f1'], 'f2', found['f3']])
+        self.assertEqual(self.requested, [{'identifiers': 'f3,f1,f2', 'maxRecords': '3'}])
+        self.assertEqual(self.service.get_feature_by_id.call_count, 1)
+
+    def test_n_local_search(self) -> None:
+        """
+        Unit test of local_search answering from the feature index or from the server
+        """
+        feature = {'type': 'RestoFeature', 'id': 'uuid_f1', 'geometry': None,
+                   'properties': {'productIdentifier': 'f1'}}
+        self.service.parent_server.feature_index = MagicMock(search=MagicMock(return_value=None))
+        self.service.harvest_by_criteria = MagicMock(return_value=iter([feature]))
+        feature_collection = self.service.local_search({'startDate': '2020-01-01'})
+        self.assertEqual(feature_collection.all_id, ['f1'])
+        self.assertTrue(feature_collection.identifier.startswith('server_'))
+        self.service.parent_server.feature_index.search.return_value = [feature]
+        feature_collection = self.service.local_search({'startDate': '2020-01-01'})
+        self.assertEqual(feature_collection.all_id, ['f1'])
+        self.assertTrue(feature_collection.identifier.startswith('local_'))
+        self.assertEqual(self.service.harvest_by_criteria.call_count, 1)
+
+    def test_n_sync(self) -> None:
+        """
+        Unit test of sync_by_criteria resuming after an interruption and using its watermark
+        """
+        def feature(feature_id: str, updated: str) -> RestoFeature:
+            return RestoFeature({'type': 'Feature', 'id': 'uuid_' + feature_id, 'geometry': None,
+                                 'properties': {'productIdentifier': feature_id,
+                                                'updated': updated}})
+        pages = [fake_page([feature('f1', '2020-01-03T10:00:00Z'),
+                            feature('f2', '2020-01-01T10:00:00Z')], 3),
+                 fake_page([feature('f3', '2020-01-02T10:00:00Z')], 3)]
+        self.service._collections_mgr.ensure_collection.return_value = 'S2'
+        with TemporaryDirectory() as temp_dir:
+            state_path = Path(temp_dir) / 'sync_state.json'
+            with patch('resto_client.services.resto_service.RestoCriteria', new=lambda _p, **k: k):
+                with self.search_patch(pages):
+                    synced = self.service.sync_by_criteria({'platform': 'S2'},
+                                                           DictSettingsJson(state_path))
+                    # Interruption while processing the second page
+                    self.assertEqual([next(synced).product_identifier for _ in range(3)],
+                                     ['f1', 'f2', 'f3'])
+                    del synced
+                    synced = self.service.sync_by_criteria({'platform': 'S2'},
+                                                           DictSettingsJson(state_path))
+                    self.assertEqual([feat.product_identifier for feat in synced], ['f3'])
+                    self.assertEqual([crit['page'] for crit in self.requested], [1, 2, 2])
+
+                    # Next synchronization only requests the features updated since the watermark
+                    pages[:] = [fake_page([feature('f1', '2020-01-03T10:00:00Z'),
+                                           feature('f4', '2020-01-03T12:00:00Z')], 2)]
+                    self.requested.clear()
+                    synced = self.service.sync_by_criteria({'platform': 'S2'},
+                                                           DictSettingsJson(state_path))
+                    self.assertEqual([feat.product_identifier for feat in synced], ['f4'])
+
+                    # Another page size does not reset the watermark. Features updated at the
+                    # watermark itself are retrieved, unless they already were.
+                    pages[:] = [fake_page([feature('f4', '2020-01-03T12:00:00Z'),
+                                           feature('f5', '2020-01-03T12:00:00Z')], 2)]
+                    self.requested.clear()
+                    synced = self.service.sync_by_criteria({'platform': 'S2', 'maxRecords': 10},
+                                                           DictSettingsJson(state_path))
+                    self.assertEqual([feat.product_identifier for feat in synced], ['f5'])
+            sync_state = DictSettingsJson(state_path)
+        self.assertEqual(self.requested, [{'platform': 'S2', 'maxRecords': 10,
+                                           'updatedFrom': '2020-01-03', 'page': 1}])
+        self.assertEqual(sync_state,
+                         {'S2:{"platform": "S2"}': {'watermark': '2020-01-03T12:00:00Z',
+                                                    'watermark_ids': ['uuid_f4', 'uuid_f5']}})